@@ -1,5 +1,188 @@
+"""
+In-process pipeline runner.
+
+WHAT: Run preprocess -> validate -> train -> drift -> evaluate in ONE Python process
+WHY: `dvc repro` starts a fresh interpreter per stage; each one re-imports
+     mlflow/sklearn/pandas and re-reads the processed CSV from disk.
+     Here the DataFrame, the split and the fitted model are handed over
+     in memory.
+WHEN: Local iteration on the full pipeline
+WHEN NOT: When you need DVC to decide which stages are stale (use dvc repro)
+ALTERNATIVE: uv run dvc repro
+
+Every stage still writes its DVC outs and metrics files, so afterwards
+`uv run dvc commit` records the results in dvc.lock as if `dvc repro` ran.
+
+Usage:
+    uv run python main.py run
+    uv run python main.py run --stages train evaluate
+    uv run python main.py run --compare   # also time each stage as a separate run
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR    = Path(__file__).resolve().parent
+SCRIPTS_DIR = ROOT_DIR / 'scripts'
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+STAGES = ['preprocess', 'validate', 'train', 'drift', 'evaluate']
+
+
+def run_in_process(stages: list) -> dict:
+    """
+    Run the requested stages in this interpreter.
+
+    Returns {stage: seconds} including a 'total' entry.
+    """
+    start = time.perf_counter()
+    timings = {}
+
+    from common import load_params
+    from stage_profiler import profile_stage
+    params = load_params()
+    profiling = params.get('profiling')
+
+    data = None
+    train_result = None
+
+    if 'preprocess' in stages:
+        from preprocess import preprocess_data, INPUT_PATH, OUTPUT_PATH
+        t0 = time.perf_counter()
+        with profile_stage('preprocess', profiling):
+            data = preprocess_data(INPUT_PATH, OUTPUT_PATH)
+        timings['preprocess'] = time.perf_counter() - t0
+
+    if 'validate' in stages:
+        from validate import run_validation
+        t0 = time.perf_counter()
+        report = run_validation(params)
+        timings['validate'] = time.perf_counter() - t0
+        if not report['passed']:
+            sys.exit("❌ Validation failed; not training on this data")
+
+    if 'train' in stages:
+        from train import train
+        t0 = time.perf_counter()
+        with profile_stage('train', profiling):
+            train_result = train(params, data=data)
+        timings['train'] = time.perf_counter() - t0
+
+    if 'drift' in stages:
+        from drift import run_drift
+        t0 = time.perf_counter()
+        drift = run_drift(params, run_id=train_result['run_id'] if train_result else None)
+        timings['drift'] = time.perf_counter() - t0
+        # Same gate as dvc.yaml: evaluate (promotion) never runs on drifted data
+        if params['drift'].get('fail_on_drift') and drift['drifted_columns']:
+            sys.exit("❌ Drift detected (drift.fail_on_drift); not evaluating or promoting")
+
+    if 'evaluate' in stages:
+        from evaluate import evaluate
+        t0 = time.perf_counter()
+        with profile_stage('evaluate', profiling):
+            if train_result is not None:
+                evaluate(
+                    params,
+                    model=train_result['model'],
+                    X_test=train_result['X_test'],
+                    y_test=train_result['y_test'],
+                    run_id=train_result['run_id'],
+                )
+            else:
+                evaluate(params)
+        timings['evaluate'] = time.perf_counter() - t0
+
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+
+def clear_caches():
+    """
+    Delete the derived-data caches the stages fill, so each --compare pass
+    starts cold: the features, fingerprint, md5, dev subsample and CV fold
+    caches. Outputs DVC tracks (data/profiles, the feature store) are kept.
+    """
+    import shutil
+    from cross_validate import FOLD_CACHE_DIR
+    from dev_profile import SUBSAMPLE_CACHE_DIR
+    from features import CACHE_DIR as FEATURE_CACHE_DIR
+    from fingerprint import CACHE_PATH as FINGERPRINT_CACHE
+    from profile_data import MD5_CACHE
+
+    for path in (FEATURE_CACHE_DIR, FOLD_CACHE_DIR, SUBSAMPLE_CACHE_DIR):
+        shutil.rmtree(ROOT_DIR / path, ignore_errors=True)
+    for path in (FINGERPRINT_CACHE, MD5_CACHE):
+        (ROOT_DIR / path).unlink(missing_ok=True)
+
+
+def run_as_subprocesses(stages: list) -> dict:
+    """
+    Run each stage as its own interpreter, like `dvc repro` does.
+
+    Timing only: the model is not registered and promotion is skipped
+    (common.NO_REGISTRY_ENV_VAR), so --compare cannot move @champion.
+    Returns {stage: seconds} including a 'total' entry.
+    """
+    import os
+    from common import NO_REGISTRY_ENV_VAR
+
+    env = {**os.environ, NO_REGISTRY_ENV_VAR: '1'}
+    timings = {}
+    for stage in stages:
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, str(SCRIPTS_DIR / f'{stage}.py')],
+                       cwd=ROOT_DIR, env=env, check=True)
+        timings[stage] = time.perf_counter() - t0
+    timings['total'] = sum(timings.values())
+    return timings
+
+
+def print_report(in_process: dict, separate: dict = None):
+    print(f"\n{'='*55}")
+    print("PIPELINE TIMING")
+    print(f"{'='*55}")
+    if separate is None:
+        for stage, seconds in in_process.items():
+            print(f"  {stage:<12} {seconds:>8.2f}s")
+    else:
+        print(f"  {'Stage':<12} {'Separate':>10} {'In-process':>12}")
+        for stage in in_process:
+            print(f"  {stage:<12} {separate.get(stage, 0):>9.2f}s {in_process[stage]:>11.2f}s")
+        saved = separate['total'] - in_process['total']
+        pct = 100 * saved / separate['total'] if separate['total'] else 0.0
+        print(f"\n  Time saved: {saved:.2f}s ({pct:.1f}%)")
+    print(f"{'='*55}")
+    print("Record the outputs in dvc.lock with: uv run dvc commit")
+
+
 def main():
-    print("Hello from dataversioncontrol!")
+    parser = argparse.ArgumentParser(description="Customer churn pipeline runner")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run pipeline stages in one process')
+    run_parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES,
+                            help='Stages to run (always executed in pipeline order)')
+    run_parser.add_argument('--compare', action='store_true',
+                            help='First run each stage as a separate interpreter and '
+                                 'report the time saved (runs the pipeline twice from cold '
+                                 'caches; the first pass neither registers nor promotes)')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        stages = [s for s in STAGES if s in args.stages]
+        separate = None
+        if args.compare:
+            # Both passes start cold, or the second one is timed on warm caches
+            clear_caches()
+            separate = run_as_subprocesses(stages)
+            clear_caches()
+        in_process = run_in_process(stages)
+        print_report(in_process, separate)
 
 
 if __name__ == "__main__":
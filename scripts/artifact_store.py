@@ -0,0 +1,174 @@
+"""
+Content-addressed store for logged models.
+
+WHAT: `store.log_model(model)` hashes the pickled model (plus its
+      signature) and uploads it as an MLflow model directory under
+      cas/<digest[:2]>/<digest>/ — only if that digest is not stored
+      yet. The run references the blob by tags (model_digest, model_uri);
+      registration points the model version's source at the blob
+WHY: mlflow.sklearn.log_model uploads a full copy per run. Re-running a
+     sweep or a tagged training script stores byte-identical models again,
+     so the artifact store grows with every rerun and the uploads are waste
+WHEN: Scripts that log a model on every run (compare_experiments.py,
+      train_tagged.py, train_with_artifacts.py, register_model.py)
+WHEN NOT: When the run's own artifact directory must contain the model
+          (runs:/<run_id>/model URIs) — load from model_uri or models:/
+ALTERNATIVE: MLflow autolog / log_model (one full upload per run)
+
+The store lives next to the experiments (the run artifact URI minus
+<experiment>/<run>/artifacts, plus /cas), so it works with every MLflow
+artifact backend; CHURN_ARTIFACT_STORE overrides the location.
+
+A blob counts as stored once its MLmodel file exists; MLmodel is uploaded
+last, so an interrupted upload is retried by the next run.
+
+Bytes and upload seconds per digest are kept in .cache/artifact_store.json;
+a dedup hit counts them as saved. print_summary() reports the totals.
+"""
+
+import json
+import os
+from pathlib import Path
+
+ENV_VAR     = 'CHURN_ARTIFACT_STORE'
+LEDGER_PATH = Path('.cache/artifact_store.json')
+
+
+def model_digest(model, signature=None) -> str:
+    """blake2b of the pickled model and its signature."""
+    import hashlib
+    import pickle
+
+    digest = hashlib.blake2b(pickle.dumps(model, protocol=5), digest_size=20)
+    if signature is not None:
+        digest.update(json.dumps(signature.to_dict(), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def store_root(run_artifact_uri: str) -> str:
+    """<artifact root>/cas for a run artifact URI <root>/<exp>/<run>/artifacts."""
+    if os.environ.get(ENV_VAR):
+        return os.environ[ENV_VAR].rstrip('/')
+    return run_artifact_uri.rstrip('/').rsplit('/', 3)[0] + '/cas'
+
+
+def _dir_size(path: str) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+
+class ArtifactStore:
+    def __init__(self, root_uri: str = None, ledger_path: Path = LEDGER_PATH):
+        self.root_uri = root_uri
+        self.ledger_path = Path(ledger_path)
+        self.stored = {'count': 0, 'bytes': 0, 'seconds': 0.0}
+        self.saved = {'count': 0, 'bytes': 0, 'seconds': 0.0}
+
+    def _load_ledger(self) -> dict:
+        if self.ledger_path.exists():
+            with open(self.ledger_path) as f:
+                return json.load(f)
+        return {}
+
+    def _save_ledger(self, ledger: dict):
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.ledger_path, 'w') as f:
+            json.dump(ledger, f, indent=1)
+
+    def _upload(self, repo, model, signature, rel_path: str) -> tuple:
+        """Save the MLflow model locally and upload it, MLmodel last. Returns (bytes, seconds)."""
+        import tempfile
+        import time
+        import mlflow.sklearn
+
+        with tempfile.TemporaryDirectory(prefix='churn-cas-') as tmp:
+            local = os.path.join(tmp, 'model')
+            mlflow.sklearn.save_model(model, local, signature=signature)
+            size = _dir_size(local)
+
+            start = time.perf_counter()
+            for entry in sorted(os.listdir(local)):
+                path = os.path.join(local, entry)
+                if entry == 'MLmodel':
+                    continue
+                if os.path.isdir(path):
+                    repo.log_artifacts(path, f"{rel_path}/{entry}")
+                else:
+                    repo.log_artifact(path, rel_path)
+            repo.log_artifact(os.path.join(local, 'MLmodel'), rel_path)
+            return size, time.perf_counter() - start
+
+    def log_model(self, model, signature=None, registered_model_name: str = None) -> dict:
+        """
+        Store `model` once and reference it from the active run.
+
+        Returns {'digest', 'uri', 'deduplicated', 'bytes', 'seconds', 'version'}
+        where seconds is the upload time, or the upload time saved on a hit.
+        """
+        import pickle
+        import mlflow
+        from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+
+        digest = model_digest(model, signature)
+        root = self.root_uri or store_root(mlflow.get_artifact_uri())
+        rel_path = f"{digest[:2]}/{digest}"
+        uri = f"{root}/{rel_path}"
+        repo = get_artifact_repository(root)
+
+        ledger = self._load_ledger()
+        deduplicated = any(os.path.basename(f.path) == 'MLmodel'
+                           for f in repo.list_artifacts(rel_path))
+        if deduplicated:
+            # Stored from another machine: the pickle size stands in for the bytes
+            entry = ledger.get(digest) or {'bytes': len(pickle.dumps(model, protocol=5))}
+            size, seconds = entry['bytes'], entry.get('upload_s', 0.0)
+            totals = self.saved
+        else:
+            size, seconds = self._upload(repo, model, signature, rel_path)
+            ledger[digest] = {'bytes': size, 'upload_s': round(seconds, 3)}
+            self._save_ledger(ledger)
+            totals = self.stored
+        totals['count'] += 1
+        totals['bytes'] += size
+        totals['seconds'] += seconds
+
+        mlflow.set_tags({
+            'model_digest': digest,
+            'model_uri': uri,
+            'model_dedup': 'hit' if deduplicated else 'stored',
+        })
+        mlflow.log_metrics({
+            'model_bytes': size,
+            'model_upload_s': 0.0 if deduplicated else round(seconds, 3),
+        })
+
+        version = None
+        if registered_model_name:
+            version = self.register(registered_model_name, uri, digest)
+
+        return {'digest': digest, 'uri': uri, 'deduplicated': deduplicated,
+                'bytes': size, 'seconds': seconds, 'version': version}
+
+    def register(self, name: str, uri: str, digest: str) -> str:
+        """New version of `name` whose source is the stored blob; returns the version."""
+        import mlflow
+        from mlflow import MlflowClient
+        from mlflow.exceptions import MlflowException
+
+        client = MlflowClient()
+        try:
+            client.create_registered_model(name)
+        except MlflowException:
+            pass  # already exists
+        version = client.create_model_version(
+            name, source=uri, run_id=mlflow.active_run().info.run_id,
+            tags={'model_digest': digest},
+        )
+        return version.version
+
+    def print_summary(self):
+        stored, saved = self.stored, self.saved
+        print(f"\n📦 Artifact store: {stored['count']} model(s) uploaded "
+              f"({stored['bytes'] / 1024**2:.1f} MB, {stored['seconds']:.1f}s)")
+        if saved['count']:
+            print(f"   Deduplicated {saved['count']} model(s): saved "
+                  f"{saved['bytes'] / 1024**2:.1f} MB and ~{saved['seconds']:.1f}s of uploads")
@@ -0,0 +1,195 @@
+"""
+Streaming bulk scoring of customer files.
+
+WHAT: Score an arbitrarily large raw customer CSV with the @champion
+      model and write churn probabilities to Parquet
+WHY: load_and_predict.py scores five rows from a fully loaded frame;
+     monthly scoring runs cover millions of customers
+WHEN: Scoring a raw export (same columns as data/raw/customers.csv;
+      the churn column is optional and ignored)
+WHEN NOT: Online / single-customer requests — the pool start-up and
+          model load dominate for small inputs
+ALTERNATIVE: pd.read_csv the whole file and predict_proba once
+             (memory grows with the file)
+
+How it works:
+  1. The parent reads the CSV in `--chunksize` row chunks.
+  2. Every worker process loads the model ONCE (pool initializer) and
+     turns each raw chunk into features with preprocess.clean_data —
+     saved category vocabulary and fill values, no feature cache, no
+     de-duplication — then apply_schema, exactly like the training data.
+  3. At most 2 chunks per worker are in flight. Results are collected in
+     submission order and appended to one Parquet file, so output row i
+     is input row i and memory stays bounded whatever the file size.
+
+Missing numerics are filled with the training medians saved by
+preprocess.py (data/processed/fill_values.json), so a row's features never
+depend on the chunk it lands in; integer columns are rounded before the
+schema cast. Output columns: customer_id, churn_probability.
+
+Usage:
+    uv run python scripts/batch_score.py data/raw/customers.csv
+    uv run python scripts/batch_score.py big.csv --output scores.parquet --workers 8
+    uv run python scripts/batch_score.py big.csv --model-path models/random_forest.pkl
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+from categorical import VOCAB_PATH
+from common import load_params
+from preprocess import FILL_VALUES_PATH
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Worker-process globals, set once per process by _load_worker()
+_MODEL = None
+_VOCAB = None
+_FILL_VALUES = None
+
+
+def _load_worker(model_uri: str, model_path: str, vocab_path: str, fill_values_path: str):
+    """Process-pool initializer: load the model, vocabulary and fill values once per worker."""
+    import pickle
+    from categorical import load_vocabulary
+    from preprocess import load_fill_values
+
+    global _MODEL, _VOCAB, _FILL_VALUES
+    if model_path:
+        with open(model_path, 'rb') as f:
+            _MODEL = pickle.load(f)
+    else:
+        import mlflow.sklearn
+        _MODEL = mlflow.sklearn.load_model(model_uri)
+
+    # One process per core already: keep each model single-threaded
+    if hasattr(_MODEL, 'n_jobs'):
+        _MODEL.n_jobs = 1
+    _VOCAB = load_vocabulary(vocab_path)
+    _FILL_VALUES = load_fill_values(fill_values_path)
+
+
+def prepare_chunk(raw, vocab: dict, fill_values: dict):
+    """Raw rows -> model features, in input order."""
+    import numpy as np
+    from preprocess import clean_data
+    from schema import FEATURE_SCHEMA, apply_schema
+
+    feature_schema = {c: t for c, t in FEATURE_SCHEMA.items() if c != 'churn'}
+    raw = raw.drop(columns=['churn'], errors='ignore')
+
+    # clean_data reports every step; that is noise once per chunk
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = clean_data(raw, vocab, use_feature_cache=False, drop_duplicates=False,
+                        fill_values=fill_values)
+    df = df[list(feature_schema)]
+
+    int_cols = [c for c, t in feature_schema.items()
+                if np.dtype(t).kind in 'iu' and df[c].dtype.kind == 'f']
+    if int_cols:
+        df = df.assign(**{c: df[c].round() for c in int_cols})
+    return apply_schema(df, feature_schema)
+
+
+def _score_chunk(raw):
+    import numpy as np
+    import pandas as pd
+
+    X = prepare_chunk(raw, _VOCAB, _FILL_VALUES)
+    return pd.DataFrame({
+        'customer_id': X['customer_id'].to_numpy(),
+        'churn_probability': _MODEL.predict_proba(X)[:, 1].astype(np.float32),
+    })
+
+
+def batch_score(input_path: str, output_path: str, model_uri: str = None,
+                model_path: str = None, vocab_path: str = VOCAB_PATH,
+                fill_values_path: str = FILL_VALUES_PATH,
+                chunksize: int = DEFAULT_CHUNKSIZE, n_workers: int = None) -> dict:
+    """
+    Stream `input_path` through the model into `output_path` (Parquet).
+
+    Returns {'rows', 'chunks', 'seconds', 'rows_per_second'}.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from concurrent.futures import ProcessPoolExecutor
+
+    n_workers = n_workers or os.cpu_count() or 1
+    max_in_flight = 2 * n_workers
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    rows = chunks = 0
+    writer = None
+    pending = deque()
+
+    def write_next():
+        nonlocal writer, rows, chunks
+        table = pa.Table.from_pandas(pending.popleft().result(), preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, table.schema)
+        writer.write_table(table)
+        rows += table.num_rows
+        chunks += 1
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_load_worker,
+                                 initargs=(model_uri, model_path, vocab_path,
+                                           fill_values_path)) as pool:
+            for raw in pd.read_csv(input_path, chunksize=chunksize):
+                pending.append(pool.submit(_score_chunk, raw))
+                if len(pending) >= max_in_flight:
+                    write_next()
+            while pending:
+                write_next()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': round(seconds, 2),
+        'rows_per_second': round(rows / seconds, 1) if seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large customer CSV in chunks")
+    parser.add_argument('input', help='Raw customer CSV')
+    parser.add_argument('--output', help='Parquet file (default: <input>.scores.parquet)')
+    parser.add_argument('--model-path', help='Score a local pickle instead of the registry @champion')
+    parser.add_argument('--vocab', default=VOCAB_PATH)
+    parser.add_argument('--fill-values', default=FILL_VALUES_PATH)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    output = args.output or str(Path(args.input).with_suffix('.scores.parquet'))
+    model_uri = f"models:/{load_params()['mlflow']['model_registry_name']}@champion"
+
+    print(f"📦 Scoring {args.input} with {args.model_path or model_uri}")
+    result = batch_score(args.input, output, model_uri=model_uri, model_path=args.model_path,
+                         vocab_path=args.vocab, fill_values_path=args.fill_values,
+                         chunksize=args.chunksize, n_workers=args.workers)
+
+    print(f"\n{'='*55}")
+    print("BATCH SCORING COMPLETE")
+    print(f"{'='*55}")
+    print(f"  Rows:        {result['rows']:,} in {result['chunks']} chunks")
+    print(f"  Time:        {result['seconds']:.1f}s")
+    print(f"  Throughput:  {result['rows_per_second']:,.0f} rows/sec")
+    print(f"  Output:      {output}")
+    print(f"{'='*55}")
+
+
+if __name__ == "__main__":
+    main()
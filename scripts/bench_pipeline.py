@@ -0,0 +1,201 @@
+"""
+Pipeline benchmark suite.
+
+WHAT: For several synthetic dataset sizes, time preprocess, train,
+      evaluate and scoring — wall time, CPU time and peak RSS per stage —
+      plus scoring latency at several batch sizes
+WHY: `dvc metrics diff` already shows AUC changes between commits; with
+     metrics/bench.json tracked the same way it shows cost regressions too
+WHEN: The `bench` DVC stage (reruns when pipeline code or bench params
+      change), or by hand before merging a performance-sensitive change
+WHEN NOT: Comparing model engines on accuracy (benchmark_engines.py)
+ALTERNATIVE: Time `dvc repro` by hand (one size, no memory numbers)
+
+Each stage runs in a fresh spawned interpreter, so peak RSS is that
+stage's own high-water mark and no stage benefits from another's imports
+or warmed caches. Stages hand data over through files in a temporary
+directory, like the real pipeline. Nothing is logged to MLflow and no
+pipeline output (data, vocabulary, model) is touched.
+
+Raw rows come from generate_data.generate_customers; the stages use the
+same clean_data / apply_schema / engines code as the pipeline, with
+n_estimators capped by bench.n_estimators.
+
+Usage:
+    uv run python scripts/bench_pipeline.py
+    uv run python scripts/bench_pipeline.py --sizes 10000 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from common import load_params
+
+OUTPUT_PATH = 'metrics/bench.json'
+
+
+# ── Stages (run inside the spawned child) ──────────────────────────────────────
+
+def _stage_preprocess(workdir: str, params: dict):
+    import pandas as pd
+    from categorical import fit_vocabulary
+    from preprocess import clean_data
+    from schema import apply_schema
+
+    raw = pd.read_csv(os.path.join(workdir, 'raw.csv'))
+    df = apply_schema(clean_data(raw, fit_vocabulary(raw), use_feature_cache=False))
+    df.to_csv(os.path.join(workdir, 'processed.csv'), index=False)
+
+
+def _stage_train(workdir: str, params: dict):
+    import pickle
+    from common import split_data
+    from engines import get_engine
+    from schema import read_processed
+
+    data = read_processed(os.path.join(workdir, 'processed.csv'))
+    X_train, _, y_train, _ = split_data(data, params['data'])
+    engine = get_engine(params['model']).fit(X_train, y_train)
+    with open(os.path.join(workdir, 'model.pkl'), 'wb') as f:
+        pickle.dump(engine.model, f, protocol=5)
+
+
+def _stage_evaluate(workdir: str, params: dict):
+    import pickle
+    from common import compute_metrics, split_data
+    from engines import get_engine
+    from schema import read_processed
+
+    data = read_processed(os.path.join(workdir, 'processed.csv'))
+    _, X_test, _, y_test = split_data(data, params['data'])
+    with open(os.path.join(workdir, 'model.pkl'), 'rb') as f:
+        engine = get_engine(params['model'], model=pickle.load(f))
+    return compute_metrics(y_test, engine.predict(X_test), engine.predict_proba(X_test))
+
+
+def _stage_score(workdir: str, params: dict):
+    """Median scoring latency per batch size (model loaded once, like a server)."""
+    import pickle
+    import numpy as np
+    from schema import read_processed
+
+    with open(os.path.join(workdir, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    X = read_processed(os.path.join(workdir, 'processed.csv')).drop(
+        columns=[params['data']['target_column']])
+
+    latency = {}
+    for batch in params['bench']['batch_sizes']:
+        batch = min(batch, len(X))
+        sample = X.iloc[:batch]
+        model.predict_proba(sample)                 # warm-up
+        timings = []
+        for _ in range(params['bench'].get('latency_repeats', 5)):
+            t0 = time.perf_counter()
+            model.predict_proba(sample)
+            timings.append(time.perf_counter() - t0)
+        seconds = float(np.median(timings))
+        latency[f'batch_{batch}'] = {
+            'ms_per_batch': round(seconds * 1000, 3),
+            'us_per_row': round(seconds / batch * 1e6, 3),
+        }
+    return latency
+
+
+STAGES = {
+    'preprocess': _stage_preprocess,
+    'train': _stage_train,
+    'evaluate': _stage_evaluate,
+    'score': _stage_score,
+}
+
+
+def _measure(stage: str, workdir: str, params: dict) -> dict:
+    """Child-process entry point: run one stage and report its own cost."""
+    import contextlib
+    import io
+    import resource
+    from memory import peak_rss_mb
+
+    wall0 = time.perf_counter()
+    cpu0 = resource.getrusage(resource.RUSAGE_SELF)
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = STAGES[stage](workdir, params)
+    cpu1 = resource.getrusage(resource.RUSAGE_SELF)
+
+    return {
+        'wall_s': round(time.perf_counter() - wall0, 3),
+        'cpu_s': round((cpu1.ru_utime - cpu0.ru_utime) + (cpu1.ru_stime - cpu0.ru_stime), 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'output': output,
+    }
+
+
+def run_stage(stage: str, workdir: str, params: dict) -> dict:
+    """Run one stage in a freshly spawned interpreter."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_measure, stage, workdir, params).result()
+
+
+def bench_size(n_rows: int, params: dict) -> dict:
+    from generate_data import generate_customers
+
+    with tempfile.TemporaryDirectory(prefix='churn-bench-') as workdir:
+        generate_customers(n_rows).to_csv(os.path.join(workdir, 'raw.csv'), index=False)
+        return {stage: run_stage(stage, workdir, params) for stage in STAGES}
+
+
+def main():
+    params = load_params()
+    bench_params = params['bench']
+
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages")
+    parser.add_argument('--sizes', type=int, nargs='+', default=bench_params['sizes'])
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    params['model'] = {**params['model'],
+                       'n_estimators': min(params['model']['n_estimators'],
+                                           bench_params['n_estimators'])}
+
+    print("=" * 72)
+    print("PIPELINE BENCHMARK")
+    print("=" * 72)
+    print(f"\n{'Rows':>12} {'Stage':<12} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak RSS (MB)':>15}")
+    print("-" * 72)
+
+    results = {}
+    for n_rows in args.sizes:
+        stages = bench_size(n_rows, params)
+        for stage, r in stages.items():
+            print(f"{n_rows:>12,} {stage:<12} {r['wall_s']:>10.2f} {r['cpu_s']:>10.2f} "
+                  f"{r['peak_rss_mb']:>15.1f}")
+
+        latency = stages['score'].pop('output')
+        auc = stages['evaluate'].pop('output')['roc_auc']
+        for r in stages.values():
+            r.pop('output', None)
+        results[f'rows_{n_rows}'] = {**stages, 'scoring_latency': latency, 'roc_auc': auc}
+
+        for batch, lat in latency.items():
+            print(f"{'':>12} {batch:<12} {lat['ms_per_batch']:>10.3f} ms  "
+                  f"{lat['us_per_row']:>10.3f} µs/row")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print("=" * 72)
+    print(f"💾 Saved results to: {args.output}")
+    print("Compare with the last commit: uv run dvc metrics diff")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark model engines as data grows.
+
+WHAT: For each dataset size and engine, measure fit time, pickled model
+      size and ROC AUC on a held-out split
+WHY: Pick the engine from numbers, not guesses — exact-split forests and
+     histogram boosting scale very differently with row count
+WHEN: Before switching `model.engine` in params.yaml
+WHEN NOT: Tuning hyperparameters (use compare_experiments.py)
+ALTERNATIVE: Time `dvc repro` by hand for each engine
+
+Synthetic rows come from generate_data.generate_customers and go through
+the same cleaning, categorical encoding, feature registry and schema as
+preprocess.py. Note the synthetic churn label is random, so AUC hovers
+around 0.5 — compare it across engines, not against production numbers.
+
+Usage:
+    uv run python scripts/benchmark_engines.py
+    uv run python scripts/benchmark_engines.py --sizes 10000 100000 --n-estimators 200
+"""
+
+import argparse
+import json
+import pickle
+import time
+from pathlib import Path
+
+from common import load_params, split_data
+from engines import ENGINES, get_engine
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+OUTPUT_PATH   = 'metrics/engine_benchmark.json'
+
+
+def make_dataset(n_rows: int, seed: int = 42):
+    """Synthetic processed dataset of `n_rows` rows."""
+    from categorical import CATEGORICAL_COLUMNS
+    from generate_data import generate_customers
+    from preprocess import clean_data
+    from schema import apply_schema
+
+    raw = generate_customers(n_rows, seed=seed)
+    # Fixed vocabulary so every size encodes categories the same way
+    vocab = {col: sorted(raw[col].unique()) for col in CATEGORICAL_COLUMNS}
+    return apply_schema(clean_data(raw, vocab, use_feature_cache=False))
+
+
+def benchmark_engine(engine_name: str, model_params: dict, data, data_params: dict) -> dict:
+    from sklearn.metrics import roc_auc_score
+
+    engine = get_engine({**model_params, 'engine': engine_name})
+    X_train, X_test, y_train, y_test = split_data(data, data_params)
+
+    start = time.perf_counter()
+    engine.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    return {
+        'engine': engine_name,
+        'rows': len(data),
+        'fit_seconds': round(fit_seconds, 3),
+        'model_mb': round(len(pickle.dumps(engine.model, protocol=5)) / 1024**2, 3),
+        'roc_auc': round(float(roc_auc_score(y_test, engine.predict_proba(X_test))), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model engines")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument('--n-estimators', type=int, default=None,
+                        help='Override model.n_estimators for the forest engine')
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    params = load_params()
+    model_params = dict(params['model'])
+    if args.n_estimators is not None:
+        model_params['n_estimators'] = args.n_estimators
+
+    print("=" * 70)
+    print("MODEL ENGINE BENCHMARK")
+    print("=" * 70)
+    print(f"\n{'Engine':<24} {'Rows':>12} {'Fit (s)':>10} {'Size (MB)':>10} {'ROC AUC':>9}")
+    print("-" * 70)
+
+    results = []
+    for n_rows in args.sizes:
+        data = make_dataset(n_rows)
+        for engine_name in args.engines:
+            r = benchmark_engine(engine_name, model_params, data, params['data'])
+            results.append(r)
+            print(f"{r['engine']:<24} {r['rows']:>12,} {r['fit_seconds']:>10.2f} "
+                  f"{r['model_mb']:>10.2f} {r['roc_auc']:>9.4f}")
+        del data
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print("=" * 70)
+    print(f"💾 Saved results to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compact categorical encoding with a persisted vocabulary.
+
+WHAT: Map each string category to a small integer code (int8)
+WHY: Keeps contract_type / payment_method as features instead of dropping
+     them, without the wide dense frame pd.get_dummies produces
+WHEN: Fitted in preprocess.py; reused at scoring time via the saved vocab
+WHEN NOT: High-cardinality ids (use hashing or target encoding instead)
+ALTERNATIVE: One-hot encoding (one column per category)
+
+Codes follow the vocabulary order (sorted categories). Categories not in
+the vocabulary — and missing values — are encoded as UNKNOWN_CODE (-1),
+so a scoring request with a new payment method still gets a prediction.
+"""
+
+import json
+from pathlib import Path
+
+CATEGORICAL_COLUMNS = ['contract_type', 'payment_method']
+VOCAB_PATH   = 'data/processed/category_vocab.json'
+UNKNOWN_CODE = -1
+
+
+def fit_vocabulary(df, columns: list = CATEGORICAL_COLUMNS) -> dict:
+    """Collect the sorted distinct (non-null) categories of each column."""
+    return {
+        col: sorted(str(v) for v in df[col].dropna().unique())
+        for col in columns
+    }
+
+
+def encode_categories(df, vocab: dict):
+    """
+    Replace category strings with integer codes (in place) and return df.
+
+    Unseen categories get UNKNOWN_CODE and are reported.
+    """
+    import numpy as np
+    import pandas as pd
+
+    for col, categories in vocab.items():
+        if len(categories) >= np.iinfo(np.int8).max:
+            raise ValueError(f"Column '{col}' has too many categories for int8 codes")
+
+        codes = pd.Categorical(df[col].astype('string'), categories=categories).codes
+        unseen = int(((codes == UNKNOWN_CODE) & df[col].notna().to_numpy()).sum())
+        if unseen:
+            print(f"   ⚠️  {col}: {unseen} values not in vocabulary → code {UNKNOWN_CODE}")
+        df[col] = codes.astype(np.int8)
+
+    return df
+
+
+def decode_categories(df, vocab: dict):
+    """Inverse of encode_categories (unknown codes become NaN)."""
+    import pandas as pd
+
+    for col, categories in vocab.items():
+        df[col] = pd.Categorical.from_codes(df[col].astype('int16'), categories=categories)
+    return df
+
+
+def save_vocabulary(vocab: dict, path: str = VOCAB_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(vocab, f, indent=2)
+
+
+def load_vocabulary(path: str = VOCAB_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
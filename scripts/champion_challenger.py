@@ -7,8 +7,12 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import roc_auc_score
 from mlflow import MlflowClient
+from fingerprint import fingerprint
+from schema import read_processed
 
-data = pd.read_csv("data/processed/customers_cleaned.csv")
+DATA_PATH = "data/processed/customers_cleaned.csv"
+data = read_processed(DATA_PATH)
+data_fingerprint = fingerprint(DATA_PATH)
 X = data.drop("churn", axis=1)
 y = data["churn"]
 X_train, X_test, y_train, y_test = train_test_split(
@@ -29,7 +33,8 @@ with mlflow.start_run(run_name="GB-challenger-v2") as run:
         {
         "model_type": "gradient_boosting",
         "purpose": "challenger",
-        "challenger_to": "v1"
+        "challenger_to": "v1",
+        "data_fingerprint": data_fingerprint,
         }
     )
     params = {
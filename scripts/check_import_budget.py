@@ -0,0 +1,128 @@
+"""
+Import-time budget check for the pipeline stage modules.
+
+WHAT: Import each stage module in a fresh interpreter and compare its
+      cold import time against the baseline in metrics/import_budget.json
+WHY: Stage modules defer mlflow/matplotlib/sklearn/pandas imports to the
+     functions that use them. A stray top-level import silently brings
+     back seconds of startup cost — this catches it.
+WHEN: Before committing changes to the stage scripts
+WHEN NOT: Measuring end-to-end stage runtime (use the benchmarks)
+ALTERNATIVE: python -X importtime by hand
+
+Usage:
+    uv run python scripts/check_import_budget.py            # check
+    uv run python scripts/check_import_budget.py --record   # re-record baseline
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR   = Path(__file__).resolve().parent
+BASELINE_PATH = 'metrics/import_budget.json'
+
+STAGE_MODULES = ['preprocess', 'validate', 'train', 'drift', 'evaluate']
+
+# Importing a stage module must never pull these in.
+HEAVY_MODULES = ['mlflow', 'matplotlib', 'sklearn', 'pandas']
+
+PROBE = """
+import sys
+sys.path.insert(0, {scripts_dir!r})
+import {module}
+print(','.join(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def measure_import(module: str, repeats: int = 5) -> tuple:
+    """
+    Cold-import a module `repeats` times.
+
+    Returns (best cumulative import time in microseconds, heavy modules loaded).
+    Uses -X importtime so interpreter startup noise is excluded.
+    """
+    best_us = None
+    heavy_loaded = []
+    probe = PROBE.format(scripts_dir=str(SCRIPTS_DIR), module=module, heavy=HEAVY_MODULES)
+
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', probe],
+            capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative_us = int(parts[1].strip())
+                best_us = cumulative_us if best_us is None else min(best_us, cumulative_us)
+        heavy_loaded = [m for m in result.stdout.strip().split(',') if m]
+
+    return best_us, heavy_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--record', action='store_true',
+                        help='Overwrite the baseline with the current measurements')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='Allowed relative slowdown (default: value stored in baseline)')
+    args = parser.parse_args()
+
+    baseline = {}
+    if Path(BASELINE_PATH).exists():
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    tolerance = args.tolerance if args.tolerance is not None else baseline.get('tolerance', 1.0)
+    slack_us  = baseline.get('slack_us', 20000)
+
+    measured = {}
+    failures = []
+
+    print("=" * 60)
+    print("STAGE IMPORT-TIME BUDGET")
+    print("=" * 60)
+    print(f"\n{'Module':<12} {'Import (ms)':>12} {'Budget (ms)':>12}  Status")
+    print("-" * 60)
+
+    for module in STAGE_MODULES:
+        import_us, heavy_loaded = measure_import(module, args.repeats)
+        measured[module] = import_us
+
+        base_us = baseline.get('modules', {}).get(module)
+        budget_us = None if base_us is None else base_us * (1 + tolerance) + slack_us
+
+        status = "✅"
+        if heavy_loaded:
+            status = f"❌ imports {', '.join(heavy_loaded)} at module level"
+            failures.append(module)
+        elif budget_us is not None and not args.record and import_us > budget_us:
+            status = "❌ over budget"
+            failures.append(module)
+
+        budget_str = "-" if budget_us is None else f"{budget_us / 1000:.1f}"
+        print(f"{module:<12} {import_us / 1000:>12.1f} {budget_str:>12}  {status}")
+
+    if args.record:
+        Path(BASELINE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump({
+                'tolerance': tolerance,
+                'slack_us': slack_us,
+                'modules': measured,
+            }, f, indent=2)
+        print(f"\n💾 Recorded baseline to: {BASELINE_PATH}")
+
+    print("=" * 60)
+    if failures:
+        print(f"Import budget regression in: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Shared helpers for the pipeline stage scripts.
+
+WHAT: params loading, processed-data loading and the train/test split
+WHY: train.py and evaluate.py must agree on the exact same split, and
+     every stage reads the same params.yaml
+WHEN: Imported by preprocess.py, train.py, evaluate.py and main.py
+WHEN NOT: Ad-hoc experiment scripts that hard-code their own settings
+ALTERNATIVE: Copy/paste the split into every stage (drifts over time)
+
+Heavy libraries (pandas, sklearn, yaml) are imported inside the functions
+that need them so that importing a stage module stays cheap.
+"""
+
+PARAMS_PATH = 'params.yaml'
+
+# Set (to anything but 0/false) to train and evaluate without touching the
+# model registry: no new version, no champion/challenger. main.py --compare
+# sets it for its timing-only subprocess pass.
+NO_REGISTRY_ENV_VAR = 'CHURN_NO_REGISTRY'
+
+# Split membership is a function of this column, see split_data; train.py
+# tags runs with SPLIT_METHOD so an incremental run can tell whether the
+# champion was split the same way
+ID_COLUMN    = 'customer_id'
+SPLIT_METHOD = 'customer_id_hash'
+
+
+def load_params(path: str = PARAMS_PATH) -> dict:
+    """
+    Load pipeline parameters.
+
+    WHAT: Read params.yaml into a dict
+    WHY: DVC watches this file and re-runs stages when it changes
+    """
+    import yaml
+
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def registry_disabled() -> bool:
+    import os
+
+    return os.environ.get(NO_REGISTRY_ENV_VAR, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+def load_processed_data(data_params: dict):
+    """Read the processed dataset produced by the preprocess stage."""
+    from schema import read_processed
+
+    return read_processed(data_params['data_path'])
+
+
+def split_data(data, data_params: dict):
+    """
+    Split processed data into train and test sets.
+
+    WHAT: A customer is a test row when a seeded hash of its customer_id
+          falls below test_size (both from params.yaml)
+    WHY: train.py and evaluate.py must score the exact same test rows, and
+         a customer must stay on its side when the table grows: an
+         incremental run extends the champion's forest, so a re-drawn
+         split would score it on rows its trees were fitted on
+    WHEN NOT: Tiny tables — the test share is test_size only on average
+              (and so is its class balance: the hash ignores the label)
+    ALTERNATIVE: train_test_split(stratify=y) — exact shares, but every
+                 row can change sides once the row count changes
+    Returns (X_train, X_test, y_train, y_test).
+    """
+    target = data_params['target_column']
+    X = data.drop(target, axis=1)
+    y = data[target]
+
+    is_test = stable_unit_hash(X[ID_COLUMN].to_numpy(), data_params['random_state']) \
+        < data_params['test_size']
+    return X[~is_test], X[is_test], y[~is_test], y[is_test]
+
+
+def stable_unit_hash(ids, seed: int):
+    """Map integer ids to [0, 1) with splitmix64: same id and seed, same value, on any machine."""
+    import numpy as np
+
+    mask = (1 << 64) - 1
+    x = ids.astype(np.uint64) + np.uint64((seed * 0x9E3779B97F4A7C15) & mask)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)) / float(1 << 53)
+
+
+def compute_metrics(y_true, y_pred, y_prob) -> dict:
+    """Classification metrics logged by train.py and the cross-validation folds."""
+    from sklearn.metrics import (
+        accuracy_score, recall_score, precision_score,
+        roc_auc_score, f1_score
+    )
+
+    return {
+        "accuracy":  round(accuracy_score(y_true, y_pred), 4),
+        "precision": round(precision_score(y_true, y_pred), 4),
+        "recall":    round(recall_score(y_true, y_pred), 4),
+        "f1":        round(f1_score(y_true, y_pred), 4),
+        "roc_auc":   round(roc_auc_score(y_true, y_prob), 4),
+    }
+
+
+def frame_digest(*frames) -> str:
+    """
+    Content hash of one or more DataFrames / Series.
+
+    WHAT: Vectorised per-row hashes folded into one digest
+    WHY: Cache keys that change exactly when the data changes
+    """
+    import hashlib
+    import pandas as pd
+
+    h = hashlib.blake2b(digest_size=16)
+    for frame in frames:
+        h.update(repr(list(getattr(frame, 'columns', [frame.name]))).encode())
+        h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return h.hexdigest()
@@ -1,3 +1,4 @@
+import argparse
 import mlflow
 import mlflow.sklearn
 import pandas as pd
@@ -12,26 +13,14 @@ from sklearn.metrics import (
     precision_score
 )
 from pathlib import Path
+from artifact_store import ArtifactStore
+from fingerprint import fingerprint
+from schema import read_processed
+from cross_validate import cross_validate, log_cv_results
+from telemetry import Telemetry
 
 DATA_PATH = Path("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv")
 
-df = pd.read_csv(DATA_PATH)
-
-print("data loaded successfully")
-
-target_col = "churn"
-X = df.drop(columns=[target_col])
-y = df[target_col]
-
-# Handle non-numeric columns
-X = pd.get_dummies(X, drop_first=True)
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-print("No problems so far")
-
 # --- Define experiment configurations to test ---
 # WHAT: A list of hyperparameter combinations to try
 # WHY: Systematic > random guessing. You can justify your final choice.
@@ -48,62 +37,134 @@ configs = [
     {"n_estimators": 300, "max_depth": 10,   "min_samples_leaf": 2, "run_name" : "rf_300_leaves_10_depth"},
 ]
 
-mlflow.set_experiment("churn-model-experiment-latest")
 
-print(f"\nRunning {len(configs)} experiments...")
+def main():
+    parser = argparse.ArgumentParser(description="Random forest hyperparameter sweep")
+    parser.add_argument("--cv-folds", type=int, default=0,
+                        help="Also run stratified k-fold CV per config (e.g. 5)")
+    cv_folds = parser.parse_args().cv_folds
+
+    df = read_processed(DATA_PATH)
+    data_fingerprint = fingerprint(DATA_PATH)
+
+    print("data loaded successfully")
+
+    target_col = "churn"
+    X = df.drop(columns=[target_col])
+    y = df[target_col]
+
+    # Categorical columns arrive as int8 codes from preprocess.py (categorical.py),
+    # so no one-hot expansion is needed here.
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    print("No problems so far")
+
+    mlflow.set_experiment("churn-model-experiment-latest")
+
+    print(f"\nRunning {len(configs)} experiments...")
 
-results = []
+    results = []
+    # Identical models from a repeated sweep are uploaded only once
+    store = ArtifactStore()
 
-for exp in configs:
-    run_name = exp.pop("run_name")
-    params = {**exp, "class_weight": "balanced", "random_state": 42}
+    for exp in configs:
+        exp = dict(exp)
+        run_name = exp.pop("run_name")
+        params = {**exp, "class_weight": "balanced", "random_state": 42}
 
-    with mlflow.start_run(run_name=run_name):
-        mlflow.log_params(params)
+        with mlflow.start_run(run_name=run_name) as run:
+            tel = Telemetry('sweep')
+            mlflow.log_params(params)
 
-        model = RandomForestClassifier(
-            **params,
-            n_jobs=-1
-            )
+            model = RandomForestClassifier(
+                **params,
+                n_jobs=-1
+                )
         
-        model.fit(X_train, y_train)
+            with tel.span('fit'):
+                model.fit(X_train, y_train)
         
-        # Evaluate
-        preds = model.predict(X_test)
-        proba = model.predict_proba(X_test)[:, 1]
+            # Evaluate
+            with tel.span('predict'):
+                preds = model.predict(X_test)
+                proba = model.predict_proba(X_test)[:, 1]
         
-        metrics = {
-            "accuracy":  accuracy_score(y_test, preds),
-            "roc_auc":   roc_auc_score(y_test, proba),
-            "recall":    recall_score(y_test, preds),
-            "precision": precision_score(y_test, preds),
-            "f1":        f1_score(y_test, preds),
-        }
-
-        # Logg all the metrics
-        mlflow.log_metrics(metrics)
-
-        # Add a tag, tags are searchable labels, not numeric metrics
-        mlflow.set_tag("model_type", "random_forest")
-        mlflow.set_tag("dataset", "telco-churn")
-
-        mlflow.sklearn.log_model(model, "model")
-
-        results.append({"run": run_name, **metrics})
-        # print(f"[{i+1:2d}/10] {run_name}")
-        print(f"        accuracy={metrics['accuracy']:.4f}  roc_auc={metrics['roc_auc']:.4f}  recall={metrics['recall']:.4f}")
-
-# --- Print local summary ---
-print("\n" + "=" * 60)
-print("EXPERIMENT SUMMARY")
-print("=" * 60)
-
-results_df = pd.DataFrame(results).sort_values("roc_auc", ascending=False)
-print(results_df[["run", "accuracy", "roc_auc", "recall", "f1"]].to_string(index=False))
-
-best = results_df.iloc[0]
-print(f"\n🏆 Best by ROC AUC: {best['run']}")
-print(f"   ROC AUC:  {best['roc_auc']:.4f}")
-print(f"   Recall:   {best['recall']:.4f}")
-print(f"   Accuracy: {best['accuracy']:.4f}")
-print("\nOpen MLflow UI to compare visually: uv run mlflow ui")
\ No newline at end of file
+            metrics = {
+                "accuracy":  accuracy_score(y_test, preds),
+                "roc_auc":   roc_auc_score(y_test, proba),
+                "recall":    recall_score(y_test, preds),
+                "precision": precision_score(y_test, preds),
+                "f1":        f1_score(y_test, preds),
+            }
+
+            # Logg all the metrics
+            mlflow.log_metrics(metrics)
+
+            # Add a tag, tags are searchable labels, not numeric metrics
+            mlflow.set_tag("model_type", "random_forest")
+            mlflow.set_tag("dataset", "telco-churn")
+            mlflow.set_tag("data_fingerprint", data_fingerprint)
+
+            # Optional k-fold CV on the full data, logged in one batched write
+            if cv_folds > 1:
+                cv_results = cross_validate(X, y, {
+                    "engine": "random_forest",
+                    "n_estimators": params["n_estimators"],
+                    "max_depth": params["max_depth"],
+                    "min_sample_split": 2,
+                    "min_sample_leaf": params["min_samples_leaf"],
+                    "class_weight": params["class_weight"],
+                    "random_state": params["random_state"],
+                }, n_folds=cv_folds)
+                log_cv_results(cv_results, run.info.run_id)
+                metrics["cv_roc_auc_mean"] = cv_results["mean"]["roc_auc"]
+                metrics["cv_roc_auc_std"] = cv_results["std"]["roc_auc"]
+
+            with tel.span('log_model'):
+                store.log_model(model)
+
+            # Cost of this config: fit + predict seconds (excludes MLflow I/O)
+            spans = tel.totals()
+            metrics["cost_s"] = round(spans["fit"] + spans["predict"], 3)
+            mlflow.log_metrics(tel.metrics())
+            mlflow.log_metric("cost_s", metrics["cost_s"])
+
+            results.append({"run": run_name, **metrics})
+            # print(f"[{i+1:2d}/10] {run_name}")
+            print(f"        accuracy={metrics['accuracy']:.4f}  roc_auc={metrics['roc_auc']:.4f}  recall={metrics['recall']:.4f}")
+
+    # --- Print local summary ---
+    print("\n" + "=" * 60)
+    print("EXPERIMENT SUMMARY")
+    print("=" * 60)
+
+    # With CV, rank by the mean over folds instead of one split
+    rank_by = "cv_roc_auc_mean" if cv_folds > 1 else "roc_auc"
+    results_df = pd.DataFrame(results).sort_values(rank_by, ascending=False)
+    columns = ["run", "accuracy", "roc_auc", "recall", "f1", "cost_s"]
+    if cv_folds > 1:
+        columns += ["cv_roc_auc_mean", "cv_roc_auc_std"]
+    print(results_df[columns].to_string(index=False))
+
+    best = results_df.iloc[0]
+    print(f"\n🏆 Best by ROC AUC: {best['run']}")
+    print(f"   ROC AUC:  {best['roc_auc']:.4f}")
+    print(f"   Recall:   {best['recall']:.4f}")
+    print(f"   Accuracy: {best['accuracy']:.4f}")
+    print(f"   Cost:     {best['cost_s']:.2f}s")
+
+    # Cheapest config whose AUC is within the promotion threshold of the best
+    near_best = results_df[results_df[rank_by] >= results_df[rank_by].max() - 0.005]
+    cheapest = near_best.sort_values("cost_s").iloc[0]
+    print(f"\n⚡ Cheapest within 0.005 ROC AUC of the best: {cheapest['run']}")
+    print(f"   ROC AUC:  {cheapest[rank_by]:.4f}")
+    print(f"   Cost:     {cheapest['cost_s']:.2f}s ({best['cost_s'] / cheapest['cost_s']:.1f}x cheaper)")
+    store.print_summary()
+    print("\nOpen MLflow UI to compare visually: uv run mlflow ui")
+
+
+if __name__ == "__main__":
+    main()
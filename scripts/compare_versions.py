@@ -1,91 +1,158 @@
-import pandas as pd
-import subprocess
-import tempfile
+"""
+Compare dataset versions straight from the DVC cache.
+
+WHAT: Stats for the data file at any number of git revisions, side by side
+WHY: Checking out each version (git checkout + dvc checkout + copy) mutates
+     the working tree and moves the full data twice per comparison
+WHEN: Investigating what changed between data versions
+WHEN NOT: The version was never pulled — `uv run dvc fetch` it first
+          (fetch fills the cache without touching the workspace)
+ALTERNATIVE: dvc get --rev <rev> (downloads a full copy per version)
+
+How it works:
+  1. `<rev>:<file>.dvc` for every revision is read in one
+     `git cat-file --batch` call (git_objects.py) -> md5 per revision.
+  2. md5 -> object in the local cache:
+        .dvc/cache/files/md5/ab/cdef...   (DVC 3)
+        .dvc/cache/ab/cdef...             (DVC 2)
+  3. Stats come from the version's profile (profile_data.py) in
+     data/profiles/<md5>.json. A version without one is streamed from the
+     cache in chunks — one worker process per version, bounded memory —
+     and its profile saved for next time.
+
+The working tree is never modified.
+
+Usage:
+    uv run python scripts/compare_versions.py                 # HEAD~1 vs HEAD
+    uv run python scripts/compare_versions.py v1.0 v2.0 HEAD
+"""
+
+import argparse
 import os
-def get_dvc_file_for_commit(commit_hash, dvc_file):
+from pathlib import Path
+
+from git_objects import parse_dvc_entry, read_objects
+from profile_data import load_profile, profile_csv, save_profile, summarize
+
+DVC_FILE      = 'data/raw/customers.csv.dvc'
+DVC_CACHE_DIR = '.dvc/cache'
+
+
+def cache_path_for_md5(md5: str, cache_dir: str = DVC_CACHE_DIR, required: bool = True) -> Path:
+    """Location of a cached object (DVC 3 layout first, then DVC 2); None if absent and not required."""
+    for path in (Path(cache_dir) / 'files' / 'md5' / md5[:2] / md5[2:],
+                 Path(cache_dir) / md5[:2] / md5[2:]):
+        if path.exists():
+            return path
+    if not required:
+        return None
+    raise FileNotFoundError(
+        f"md5 {md5} is not in the local DVC cache ({cache_dir}). "
+        f"Run `uv run dvc fetch` for that revision first."
+    )
+
+
+def resolve_versions(revisions: list, dvc_file: str = DVC_FILE,
+                     cache_dir: str = DVC_CACHE_DIR) -> list:
     """
-    Get data file for specific Git commit.
-    
-    WHAT: Checkout old .dvc file, pull corresponding data
-    WHY: Compare data across versions
-    WHEN: Need historical data
-    WHEN NOT: Current version only
-    ALTERNATIVE: Manual git checkout
+    [{'rev', 'md5', 'size', 'path'}] for each revision, in order.
+
+    'path' is the cache object, or None when it is not in the local cache
+    (fine as long as the version already has a profile).
     """
-    # Checkout .dvc file from commit
-    subprocess.run(['git', 'checkout', commit_hash, dvc_file], 
-                   capture_output=True, check=True)
-    
-    # Get data for that .dvc file
-    subprocess.run(['uv', 'run', 'dvc', 'checkout', dvc_file], 
-                   capture_output=True, check=True)
-
-def compare_datasets(v1_path, v2_path):
+    specs = [f'{rev}:{dvc_file}' for rev in revisions]
+    contents = read_objects(specs)
+
+    versions = []
+    for rev, spec in zip(revisions, specs):
+        if contents[spec] is None:
+            raise ValueError(f"{dvc_file} does not exist at revision '{rev}'")
+        entry = parse_dvc_entry(contents[spec])
+        path = cache_path_for_md5(entry['md5'], cache_dir, required=False)
+        versions.append({
+            'rev': rev,
+            'md5': entry['md5'],
+            'size': entry['size'],
+            'path': str(path) if path else None,
+        })
+    return versions
+
+
+def compare_revisions(revisions: list, dvc_file: str = DVC_FILE,
+                      cache_dir: str = DVC_CACHE_DIR, n_workers: int = None) -> list:
     """
-    Compare two dataset versions.
-    
-    WHAT: Load both versions and show differences
-    WHY: Understand data changes
-    WHEN: Investigating version differences
-    WHEN NOT: N/A
-    ALTERNATIVE: Manual comparison
+    Resolve every revision and summarise it from its profile.
+
+    Versions without a profile yet are profiled from the cache (one
+    streaming pass each, concurrently) and the profile is saved, so the
+    next comparison reads no data at all. Identical versions count once.
     """
-    df_v1 = pd.read_csv(v1_path)
-    df_v2 = pd.read_csv(v2_path)
-    
-    print("="*60)
-    print("DATASET VERSION COMPARISON")
-    print("="*60)
-    
-    print(f"\n📊 V1 (older):")
-    print(f"   Records: {len(df_v1):,}")
-    print(f"   Columns: {len(df_v1.columns)}")
-    print(f"   Churn rate: {df_v1['churn'].mean():.1%}")
-    print(f"   Age range: {df_v1['age'].min()}-{df_v1['age'].max()}")
-    
-    print(f"\n📊 V2 (newer):")
-    print(f"   Records: {len(df_v2):,}")
-    print(f"   Columns: {len(df_v2.columns)}")
-    print(f"   Churn rate: {df_v2['churn'].mean():.1%}")
-    print(f"   Age range: {df_v2['age'].min()}-{df_v2['age'].max()}")
-    
-    print(f"\n📈 Changes:")
-    print(f"   Records: {len(df_v2) - len(df_v1):+,}")
-    print(f"   Churn rate: {(df_v2['churn'].mean() - df_v1['churn'].mean()) * 100:+.1f} percentage points")
-    
-    # Check for column changes
-    v1_cols = set(df_v1.columns)
-    v2_cols = set(df_v2.columns)
-    
-    if v1_cols == v2_cols:
-        print(f"   Schema: Unchanged ✅")
-    else:
-        added = v2_cols - v1_cols
-        removed = v1_cols - v2_cols
+    from concurrent.futures import ProcessPoolExecutor
+
+    versions = resolve_versions(revisions, dvc_file, cache_dir)
+    profiles = {v['md5']: load_profile(v['md5']) for v in versions}
+    todo = {v['md5']: v['path'] for v in versions if profiles[v['md5']] is None}
+    for md5, path in todo.items():
+        if path is None:
+            cache_path_for_md5(md5, cache_dir)      # raises with the `dvc fetch` hint
+
+    if todo:
+        n_workers = min(len(todo), n_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for md5, profile in zip(todo, pool.map(profile_csv, todo.values())):
+                save_profile(profile, md5)
+                profiles[md5] = profile
+
+    return [{**v, **summarize(profiles[v['md5']])} for v in versions]
+
+
+def print_comparison(versions: list, dvc_file: str = DVC_FILE):
+    width = 14
+    print("="*(28 + width * len(versions)))
+    print(f"DATASET VERSION COMPARISON: {dvc_file[:-len('.dvc')]}")
+    print("="*(28 + width * len(versions)))
+
+    def row(label, values):
+        print(f"   {label:<24}" + "".join(f"{v:>{width}}" for v in values))
+
+    row("", [v['rev'][:width - 2] for v in versions])
+    row("md5", [v['md5'][:8] for v in versions])
+    row("Records", [f"{v['records']:,}" for v in versions])
+    row("Columns", [len(v['columns']) for v in versions])
+    row("Churn rate", [f"{v['churn_rate']:.1%}" for v in versions])
+    row("Age range", [f"{v['age_min']}-{v['age_max']}" for v in versions])
+
+    base = versions[0]
+    print(f"\n📈 Changes vs {base['rev']}:")
+    for v in versions[1:]:
+        print(f"   {v['rev']}:")
+        print(f"      Records: {v['records'] - base['records']:+,}")
+        print(f"      Churn rate: {(v['churn_rate'] - base['churn_rate']) * 100:+.1f} percentage points")
+
+        added = set(v['columns']) - set(base['columns'])
+        removed = set(base['columns']) - set(v['columns'])
+        if not added and not removed:
+            print(f"      Schema: Unchanged ✅")
         if added:
-            print(f"   Columns added: {added}")
+            print(f"      Columns added: {added}")
         if removed:
-            print(f"   Columns removed: {removed}")
-    
-    print("="*60)
+            print(f"      Columns removed: {removed}")
+
+    print("="*(28 + width * len(versions)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare data versions from the DVC cache")
+    parser.add_argument('revisions', nargs='*', default=['HEAD~1', 'HEAD'],
+                        help='Git revisions to compare (oldest first)')
+    parser.add_argument('--file', default=DVC_FILE, help='.dvc file to compare')
+    parser.add_argument('--cache-dir', default=DVC_CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    versions = compare_revisions(args.revisions, args.file, args.cache_dir, args.workers)
+    print_comparison(versions, args.file)
+
 
 if __name__ == "__main__":
-    print("\n🔄 Fetching v1 data...")
-    
-    # Get v1 (second-to-last commit)
-    get_dvc_file_for_commit('HEAD~1', 'data/raw/customers.csv.dvc')
-    
-    # Copy v1 to temp location
-    import shutil
-    shutil.copy('data/raw/customers.csv', '/tmp/customers_v1.csv')
-    
-    print("🔄 Fetching v2 data...")
-    
-    # Get v2 (latest)
-    get_dvc_file_for_commit('HEAD', 'data/raw/customers.csv.dvc')
-    
-    # Compare
-    compare_datasets('/tmp/customers_v1.csv', 'data/raw/customers.csv')
-    
-    # Cleanup
-    os.remove('/tmp/customers_v1.csv')
\ No newline at end of file
+    main()
@@ -0,0 +1,289 @@
+"""
+Compress a trained random forest to a size / latency budget.
+
+WHAT: Greedily pick the subset of trees whose averaged prediction keeps
+      ROC AUC within `auc_tolerance` of the full forest, while staying
+      under `target_size_mb` and `target_latency_us` (per scored row)
+WHY: The production forest has 3150 depth-16 trees; most of them add
+     almost nothing to AUC but all of them cost memory and latency
+WHEN: After train.py, before serving — the result is registered under
+      its own name, <model_registry_name>-compressed, so evaluate.py's
+      champion/challenger never sees it; serve it from there or alias it
+      explicitly by version
+WHEN NOT: hist_gradient_boosting models (stages depend on each other,
+          trees cannot be dropped independently)
+ALTERNATIVE: Retrain with fewer / shallower trees (loses the fitted forest)
+
+How it works:
+  1. The held-out test split is halved (stratified): one half guides the
+     selection, the other half reports unbiased AUC for both models.
+  2. Each tree's probabilities on the selection half are computed once.
+  3. Trees are ranked by individual AUC; the top `candidate_pool` trees
+     are candidates. Each step adds the candidate that maximises the
+     AUC of the running average, until AUC is within tolerance.
+  4. The linear cap is only an estimate, so the selection's pickled size
+     and per-row latency are then measured. While either is over its
+     target, the last-added trees are dropped (the cap is scaled by the
+     overshoot) and both are measured again. A forest still over budget at
+     one tree is reported as such and not registered.
+  5. Tree depth is not reduced post hoc — lower model.max_depth and
+     retrain if depth is the bottleneck.
+
+Usage:
+    uv run python scripts/compress_model.py
+    uv run python scripts/compress_model.py --target-size-mb 10 --no-register
+"""
+
+import argparse
+import copy
+import pickle
+import sys
+import time
+
+from common import load_params, load_processed_data, split_data
+from engines import get_engine
+from fingerprint import fingerprint
+
+MODEL_PATH  = 'models/random_forest.pkl'
+RUN_ID_PATH = 'metrics/mlflow_run_id.txt'
+NAME_SUFFIX = '-compressed'
+
+
+def model_size_mb(model) -> float:
+    return len(pickle.dumps(model, protocol=5)) / 1024**2
+
+
+def measure_latency_us(model, X, repeats: int = 3) -> float:
+    """Best-of-`repeats` amortised single-threaded scoring latency per row."""
+    model = copy.copy(model)
+    model.n_jobs = 1
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        best = min(best, time.perf_counter() - start)
+    return best / len(X) * 1e6
+
+
+def batch_auc(scores, y_true):
+    """
+    ROC AUC for every row of `scores` at once (Mann-Whitney U with tied ranks).
+
+    scores: (n_candidates, n_samples), y_true: (n_samples,) of 0/1
+    """
+    import numpy as np
+    from scipy.stats import rankdata
+
+    y_true = np.asarray(y_true).astype(bool)
+    n_pos = y_true.sum()
+    n_neg = len(y_true) - n_pos
+    ranks = rankdata(scores, axis=1)
+    return (ranks[:, y_true].sum(axis=1) - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+
+def select_trees(tree_probas, y_val, full_auc: float, auc_tolerance: float,
+                 max_trees: int, candidate_pool: int) -> tuple:
+    """
+    Greedy forward selection of trees.
+
+    Returns (selected tree indices, AUC of the selection on y_val).
+    """
+    import numpy as np
+
+    individual_auc = batch_auc(tree_probas, y_val)
+    pool = list(np.argsort(individual_auc)[::-1][:candidate_pool])
+
+    selected = []
+    running_sum = np.zeros(tree_probas.shape[1])
+    best_auc = 0.0
+
+    while pool and len(selected) < max_trees:
+        candidate_scores = (running_sum + tree_probas[pool]) / (len(selected) + 1)
+        aucs = batch_auc(candidate_scores, y_val)
+        best = int(np.argmax(aucs))
+
+        tree_idx = pool.pop(best)
+        selected.append(int(tree_idx))
+        running_sum += tree_probas[tree_idx]
+        best_auc = float(aucs[best])
+
+        if best_auc >= full_auc - auc_tolerance:
+            break
+
+    return selected, best_auc
+
+
+def subset_forest(model, tree_indices: list):
+    """Shallow copy of a fitted forest holding only the chosen trees."""
+    compressed = copy.copy(model)
+    compressed.estimators_ = [model.estimators_[i] for i in tree_indices]
+    compressed.n_estimators = len(tree_indices)
+    return compressed
+
+
+def compress(params: dict, model=None, register: bool = True) -> dict:
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    comp_params = params['compression']
+
+    if model is None:
+        with open(MODEL_PATH, 'rb') as f:
+            model = pickle.load(f)
+    if not isinstance(model, RandomForestClassifier):
+        raise ValueError(f"Forest compression needs a RandomForestClassifier, got {type(model).__name__}")
+
+    data = load_processed_data(params['data'])
+    _, X_test, _, y_test = split_data(data, params['data'])
+    X_val, X_hold, y_val, y_hold = train_test_split(
+        X_test, y_test, test_size=0.5,
+        random_state=params['data']['random_state'], stratify=y_test
+    )
+
+    # Per-tree positive-class probabilities, computed once
+    X_val_arr = X_val.to_numpy(dtype=np.float32)
+    tree_probas = np.vstack([t.predict_proba(X_val_arr)[:, 1] for t in model.estimators_])
+
+    full_val_auc  = float(roc_auc_score(y_val, tree_probas.mean(axis=0)))
+    full_size     = model_size_mb(model)
+    full_latency  = measure_latency_us(model, X_hold)
+
+    # Size and latency scale ~linearly with tree count: turn budgets into a tree cap
+    n_full = len(model.estimators_)
+    max_trees = n_full
+    if comp_params.get('target_size_mb'):
+        max_trees = min(max_trees, int(comp_params['target_size_mb'] / full_size * n_full))
+    if comp_params.get('target_latency_us'):
+        max_trees = min(max_trees, int(comp_params['target_latency_us'] / full_latency * n_full))
+    max_trees = max(1, max_trees)
+
+    print(f"\n🌲 Full forest: {n_full} trees, {full_size:.1f} MB, {full_latency:.1f} µs/row")
+    print(f"   Selection AUC: {full_val_auc:.4f}, tree budget: {max_trees}")
+
+    selected, selected_auc = select_trees(
+        tree_probas, y_val, full_val_auc,
+        auc_tolerance=comp_params['auc_tolerance'],
+        max_trees=max_trees,
+        candidate_pool=comp_params['candidate_pool'],
+    )
+
+    # Measure the selection against the budgets; drop the last-added trees while over
+    size_target = comp_params.get('target_size_mb')
+    latency_target = comp_params.get('target_latency_us')
+    while True:
+        compressed = subset_forest(model, selected)
+        size, latency = model_size_mb(compressed), measure_latency_us(compressed, X_hold)
+        overshoot = max(size / size_target if size_target else 0.0,
+                        latency / latency_target if latency_target else 0.0)
+        if overshoot <= 1 or len(selected) == 1:
+            break
+        n_keep = max(1, min(len(selected) - 1, int(len(selected) / overshoot)))
+        print(f"   {len(selected)} trees measure {size:.1f} MB, {latency:.1f} µs/row "
+              f"— over budget, pruning to {n_keep}")
+        selected = selected[:n_keep]
+        selected_auc = float(roc_auc_score(y_val, tree_probas[selected].mean(axis=0)))
+
+    result = {
+        'n_trees_full': n_full,
+        'n_trees_compressed': len(selected),
+        'full_size_mb': round(full_size, 3),
+        'compressed_size_mb': round(size, 3),
+        'full_latency_us': round(full_latency, 2),
+        'compressed_latency_us': round(latency, 2),
+        'full_val_auc': round(full_val_auc, 4),
+        'compressed_val_auc': round(selected_auc, 4),
+        'full_holdout_auc': round(float(roc_auc_score(y_hold, model.predict_proba(X_hold)[:, 1])), 4),
+        'compressed_holdout_auc': round(float(roc_auc_score(y_hold, compressed.predict_proba(X_hold)[:, 1])), 4),
+    }
+    result['within_tolerance'] = (
+        result['compressed_val_auc'] >= result['full_val_auc'] - comp_params['auc_tolerance']
+    )
+    result['within_budget'] = overshoot <= 1
+
+    print(f"\n{'='*55}")
+    print("FOREST COMPRESSION")
+    print(f"{'='*55}")
+    print(f"  {'':<14} {'Full':>10} {'Compressed':>12}")
+    print(f"  {'Trees':<14} {result['n_trees_full']:>10} {result['n_trees_compressed']:>12}")
+    print(f"  {'Size (MB)':<14} {result['full_size_mb']:>10.2f} {result['compressed_size_mb']:>12.2f}")
+    print(f"  {'µs / row':<14} {result['full_latency_us']:>10.2f} {result['compressed_latency_us']:>12.2f}")
+    print(f"  {'Holdout AUC':<14} {result['full_holdout_auc']:>10.4f} {result['compressed_holdout_auc']:>12.4f}")
+    print(f"{'='*55}")
+
+    if not result['within_budget']:
+        print(f"❌ One tree still measures {size:.1f} MB / {latency:.1f} µs per row, over "
+              f"target_size_mb={size_target} / target_latency_us={latency_target} — not registering")
+        return result
+    if not result['within_tolerance']:
+        print(f"❌ {len(selected)} trees within the size/latency budget cannot keep AUC within "
+              f"{comp_params['auc_tolerance']} — not registering")
+        return result
+
+    if register:
+        register_compressed(params, compressed, X_val, result)
+    return result
+
+
+def register_compressed(params: dict, compressed, X_sample, result: dict):
+    """Log the compressed forest as its own run and a version of <registry name>-compressed."""
+    import mlflow
+
+    mlflow_params = params['mlflow']
+    engine = get_engine(params['model'], model=compressed)
+
+    try:
+        with open(RUN_ID_PATH) as f:
+            source_run_id = f.read().strip()
+    except FileNotFoundError:
+        source_run_id = "unknown"
+
+    mlflow.set_experiment(mlflow_params['experiment_name'])
+    with mlflow.start_run(run_name="compressed-forest") as run:
+        mlflow.set_tags({
+            "model_type": engine.model_type,
+            "purpose": "compressed",
+            "compressed_from_run": source_run_id,
+            "data_fingerprint": fingerprint(params['data']['data_path']),
+        })
+        mlflow.log_params({
+            **{f"compression_{k}": v for k, v in params['compression'].items()},
+            "n_trees_full": result['n_trees_full'],
+            "n_trees_compressed": result['n_trees_compressed'],
+        })
+        mlflow.log_metrics({
+            k: float(v) for k, v in result.items()
+            if k not in ('n_trees_full', 'n_trees_compressed', 'within_tolerance', 'within_budget')
+        })
+        mlflow.log_metric('roc_auc', result['compressed_holdout_auc'])
+        # A separate registered model: a version under the main name would be
+        # picked up by evaluate.py's promotion with the full forest's AUC
+        name = mlflow_params['model_registry_name'] + NAME_SUFFIX
+        engine.log_model(X_sample, registered_model_name=name)
+        print(f"\n✅ Registered compressed forest as '{name}' (run {run.info.run_id})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress the trained forest")
+    parser.add_argument('--target-size-mb', type=float)
+    parser.add_argument('--target-latency-us', type=float)
+    parser.add_argument('--auc-tolerance', type=float)
+    parser.add_argument('--no-register', action='store_true')
+    args = parser.parse_args()
+
+    params = load_params()
+    overrides = {
+        'target_size_mb': args.target_size_mb,
+        'target_latency_us': args.target_latency_us,
+        'auc_tolerance': args.auc_tolerance,
+    }
+    params['compression'].update({k: v for k, v in overrides.items() if v is not None})
+
+    result = compress(params, register=not args.no_register)
+    if not (result['within_tolerance'] and result['within_budget']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Parallel stratified k-fold cross-validation.
+
+WHAT: Score a model configuration on k stratified folds, one fold per
+      worker process, and log per-fold + aggregate metrics to MLflow in a
+      single batched write
+WHY: A single 80/20 split puts the 0.005 promotion margin inside the
+     noise; the spread across folds shows how big that noise really is
+WHEN: cv.folds > 1 in params.yaml (train.py) or --cv-folds in the sweep
+WHEN NOT: Quick smoke runs — k folds cost k fits
+ALTERNATIVE: sklearn.model_selection.cross_validate (pickles X to every
+             worker and cannot reuse fold assignments between runs)
+
+Data sharing: X (float32) and y are written once as .npy files in a
+temporary directory — /dev/shm when available — with the rows grouped by
+fold, and every worker opens them with mmap_mode='r'. A fold's test rows
+are then one contiguous slice: predicting on it reads the shared pages
+directly, no copy.
+
+Real memory cost: the training part of a fold is the rows before and
+after that slice, which sklearn needs as one array, so each busy worker
+holds a private copy of (k-1)/k of X (as it would inside sklearn's own
+cross_validate) on top of the one shared copy. Peak ≈ X + n_workers *
+(k-1)/k * X, not a single X.
+
+Fold assignments are cached per data hash in .cache/folds/, so repeated
+runs on the same data (e.g. a hyperparameter sweep) reuse them.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from common import compute_metrics, frame_digest
+
+FOLD_CACHE_DIR = Path('.cache/folds')
+
+# Worker-process globals, set once per process by _attach()
+_X = None
+_Y = None
+_OFFSETS = None
+
+
+def fold_assignments(y, n_folds: int, random_state: int, data_hash: str,
+                     cache_dir: Path = FOLD_CACHE_DIR):
+    """
+    Fold id (0..k-1) for every row, stratified by y.
+
+    Stored as one int8 per row and cached by (data hash, k, seed).
+    """
+    import numpy as np
+    from sklearn.model_selection import StratifiedKFold
+
+    cache_path = Path(cache_dir) / f"{data_hash}_k{n_folds}_s{random_state}.npy"
+    if cache_path.exists():
+        return np.load(cache_path)
+
+    folds = np.empty(len(y), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    for fold_id, (_, test_idx) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        folds[test_idx] = fold_id
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(cache_path, folds)
+    return folds
+
+
+def _attach(shared_dir: str):
+    """Process-pool initializer: memory-map the shared arrays once per worker."""
+    import numpy as np
+
+    global _X, _Y, _OFFSETS
+    _X = np.load(os.path.join(shared_dir, 'X.npy'), mmap_mode='r')
+    _Y = np.load(os.path.join(shared_dir, 'y.npy'), mmap_mode='r')
+    _OFFSETS = np.load(os.path.join(shared_dir, 'offsets.npy'))
+
+
+def _run_fold(fold_id: int, model_params: dict) -> dict:
+    from engines import get_engine
+
+    import numpy as np
+
+    # Rows are grouped by fold: the test fold is a view of the shared pages,
+    # the training rows (everything around it) one private copy
+    lo, hi = int(_OFFSETS[fold_id]), int(_OFFSETS[fold_id + 1])
+    X_train = np.concatenate((_X[:lo], _X[hi:]))
+    y_train = np.concatenate((_Y[:lo], _Y[hi:]))
+
+    start = time.perf_counter()
+    engine = get_engine(model_params).fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    del X_train, y_train
+
+    X_test, y_test = _X[lo:hi], _Y[lo:hi]
+    metrics = compute_metrics(y_test, engine.predict(X_test), engine.predict_proba(X_test))
+    metrics['fit_seconds'] = round(fit_seconds, 3)
+    return metrics
+
+
+def cross_validate(X, y, model_params: dict, n_folds: int = 5,
+                   n_workers: int = None, random_state: int = 42) -> dict:
+    """
+    Run k-fold CV for one model configuration.
+
+    Returns {'folds': [metrics per fold], 'mean': {...}, 'std': {...}}.
+    """
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    n_cpus = os.cpu_count() or 1
+    n_workers = min(n_folds, n_workers or n_cpus)
+    # Split the cores between concurrent folds instead of oversubscribing
+    fold_params = {**model_params, 'n_jobs': max(1, n_cpus // n_workers)}
+
+    data_hash = frame_digest(X, y)
+    folds = fold_assignments(y, n_folds, random_state, data_hash)
+
+    shm_root = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(prefix='churn-cv-', dir=shm_root) as shared_dir:
+        # Group rows by fold; fold f is rows offsets[f]:offsets[f + 1]
+        order = np.argsort(folds, kind='stable')
+        offsets = np.searchsorted(folds[order], np.arange(n_folds + 1))
+        np.save(os.path.join(shared_dir, 'X.npy'), np.asarray(X, dtype=np.float32)[order])
+        np.save(os.path.join(shared_dir, 'y.npy'), np.asarray(y)[order])
+        np.save(os.path.join(shared_dir, 'offsets.npy'), offsets)
+
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach,
+                                 initargs=(shared_dir,)) as pool:
+            fold_metrics = list(pool.map(_run_fold, range(n_folds),
+                                         [fold_params] * n_folds))
+
+    keys = fold_metrics[0].keys()
+    return {
+        'folds': fold_metrics,
+        'mean': {k: round(float(np.mean([m[k] for m in fold_metrics])), 4) for k in keys},
+        'std':  {k: round(float(np.std([m[k] for m in fold_metrics])), 4) for k in keys},
+    }
+
+
+def log_cv_results(results: dict, run_id: str, prefix: str = 'cv_'):
+    """
+    Log per-fold metrics (as steps) and mean/std in ONE MLflow request.
+
+    WHY: One log_batch call instead of k * n_metrics log_metric round-trips
+    """
+    from mlflow import MlflowClient
+    from mlflow.entities import Metric
+
+    timestamp = int(time.time() * 1000)
+    metrics = []
+    for fold_id, fold in enumerate(results['folds']):
+        metrics += [Metric(f"{prefix}{k}", float(v), timestamp, fold_id) for k, v in fold.items()]
+    for stat in ('mean', 'std'):
+        metrics += [Metric(f"{prefix}{k}_{stat}", float(v), timestamp, 0)
+                    for k, v in results[stat].items()]
+
+    MlflowClient().log_batch(run_id, metrics=metrics)
+
+
+def print_cv_results(results: dict):
+    print(f"\n📊 {len(results['folds'])}-fold cross-validation")
+    for fold_id, fold in enumerate(results['folds']):
+        print(f"   fold {fold_id}: roc_auc={fold['roc_auc']:.4f}  f1={fold['f1']:.4f}  "
+              f"fit={fold['fit_seconds']:.1f}s")
+    print(f"   mean roc_auc: {results['mean']['roc_auc']:.4f} ± {results['std']['roc_auc']:.4f}")
@@ -0,0 +1,87 @@
+"""
+Fast-iteration `dev` profile for the pipeline.
+
+WHAT: With dev.enabled, train.py and evaluate.py work on a stratified
+      subsample (dev.fraction of the processed rows) and a capped model
+      (dev.max_estimators trees / iterations, depth <= dev.max_depth)
+WHY: Checking a code change against 3150 full-depth trees on every row
+     takes minutes; the dev profile answers "does it run, is it sane" in
+     seconds
+WHEN: uv run dvc exp run -S dev.enabled=true   (or set it in params.yaml
+      for a local session)
+WHEN NOT: Anything that is compared with, or could replace, the champion —
+          dev runs are tagged profile=dev, never registered and never promoted
+ALTERNATIVE: Lower model.n_estimators by hand (easy to commit by accident,
+             and the run competes in promotion)
+
+The subsample keeps the class ratio of the target. Its row positions are
+cached per (data fingerprint, fraction, seed) in .cache/subsample/, so
+train and evaluate pick the same rows without coordination and repeated
+dev runs on unchanged data skip the sampling.
+"""
+
+from pathlib import Path
+
+SUBSAMPLE_CACHE_DIR = Path('.cache/subsample')
+
+
+def dev_enabled(params: dict) -> bool:
+    return bool((params.get('dev') or {}).get('enabled'))
+
+
+def subsample_indices(y, fraction: float, random_state: int, data_hash: str,
+                      cache_dir: Path = SUBSAMPLE_CACHE_DIR):
+    """
+    Sorted row positions of a stratified `fraction` of y.
+
+    Cached by (data hash, fraction, seed).
+    """
+    import numpy as np
+
+    cache_path = Path(cache_dir) / f"{data_hash}_f{fraction}_s{random_state}.npy"
+    if cache_path.exists():
+        return np.load(cache_path)
+
+    y = np.asarray(y)
+    rng = np.random.default_rng(random_state)
+    keep = []
+    for cls in np.unique(y):
+        positions = np.flatnonzero(y == cls)
+        n = max(1, round(len(positions) * fraction))
+        keep.append(rng.choice(positions, size=n, replace=False))
+    indices = np.sort(np.concatenate(keep)).astype(np.int64)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(cache_path, indices)
+    return indices
+
+
+def subsample(data, target: str, dev_params: dict, data_hash: str):
+    """The dev rows of the processed DataFrame (original index kept)."""
+    indices = subsample_indices(
+        data[target].to_numpy(),
+        fraction=dev_params['fraction'],
+        random_state=dev_params.get('random_state', 42),
+        data_hash=data_hash,
+    )
+    return data.iloc[indices]
+
+
+def dev_model_params(model_params: dict, dev_params: dict) -> dict:
+    """model params with the tree count and depth capped for both engines."""
+    max_estimators = dev_params['max_estimators']
+    max_depth = dev_params['max_depth']
+
+    capped = {
+        **model_params,
+        'n_estimators': min(model_params['n_estimators'], max_estimators),
+        'max_depth': min(model_params.get('max_depth') or max_depth, max_depth),
+    }
+    hgb = model_params.get('hist_gradient_boosting')
+    if hgb:
+        capped['hist_gradient_boosting'] = {
+            **hgb,
+            'max_iter': min(hgb.get('max_iter', 300), max_estimators),
+            'max_depth': min(hgb.get('max_depth') or max_depth, max_depth),
+        }
+    return capped
@@ -0,0 +1,217 @@
+"""
+Distribution drift between data versions, from their profiles.
+
+WHAT: Per-column PSI (population stability index) and KS statistic
+      between a reference data version and the current data file
+WHY: A new version (e.g. update_data_v2.py's 25% churn batch) can shift
+     feature distributions enough to invalidate the champion without any
+     code change — this makes the shift visible and, optionally, fatal
+WHEN: The `drift` DVC stage after train, or by hand before retraining.
+      evaluate depends on metrics/drift.json, so with fail_on_drift a
+      drifted version stops `dvc repro` before any promotion
+WHEN NOT: Columns expected to move (customer_id grows with every new
+          customer — listed under drift.ignore in params.yaml)
+ALTERNATIVE: Load both versions and run scipy.stats.ks_2samp per column
+             (needs both files in memory)
+
+Both versions are summarised by their profiles (profile_data.py /
+sketches.py), each built in one streaming pass, so file size never
+matters and a version is only ever read once.
+
+  PSI: the reference's deciles define 10 bins; both sketches' buckets are
+       folded into them. sum((cur - ref) * ln(cur / ref)), smoothed with
+       EPSILON. Rule of thumb: < 0.1 stable, 0.1-0.25 moderate, > 0.25 major.
+       Categorical columns use one bin per category.
+  KS:  max |CDF_ref - CDF_cur| over the sketch buckets (numeric only);
+       bucket resolution is the sketch's relative accuracy.
+
+Results go to metrics/drift.json and, in one log_batch call, to the MLflow
+training run (metrics/mlflow_run_id.txt).
+
+Usage:
+    uv run python scripts/drift.py                         # HEAD's version vs the workspace file
+    uv run python scripts/drift.py --reference HEAD~1 --fail-on-drift
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+from common import load_params
+
+DATA_PATH        = 'data/raw/customers.csv'
+RUN_ID_PATH      = 'metrics/mlflow_run_id.txt'
+DRIFT_PATH       = 'metrics/drift.json'
+PSI_BINS         = 10
+EPSILON          = 1e-4
+
+
+def _psi(ref_counts: list, cur_counts: list) -> float:
+    ref_total, cur_total = sum(ref_counts) or 1, sum(cur_counts) or 1
+    psi = 0.0
+    for r, c in zip(ref_counts, cur_counts):
+        r = max(r / ref_total, EPSILON)
+        c = max(c / cur_total, EPSILON)
+        psi += (c - r) * math.log(c / r)
+    return psi
+
+
+def numeric_drift(ref, cur, n_bins: int = PSI_BINS) -> dict:
+    """PSI on reference-decile bins and KS on the sketch buckets of two NumericSketches."""
+    import bisect
+
+    edges = sorted({ref.quantile(i / n_bins) for i in range(1, n_bins)})
+
+    def fold(sketch):
+        counts = [0] * (len(edges) + 1)
+        for value, n in sketch.bins():
+            counts[bisect.bisect_left(edges, value)] += n
+        return counts
+
+    ref_bins, cur_bins = dict(ref.bins()), dict(cur.bins())
+    ks, ref_cdf, cur_cdf = 0.0, 0.0, 0.0
+    for value in sorted(set(ref_bins) | set(cur_bins)):
+        ref_cdf += ref_bins.get(value, 0) / (ref.count or 1)
+        cur_cdf += cur_bins.get(value, 0) / (cur.count or 1)
+        ks = max(ks, abs(ref_cdf - cur_cdf))
+
+    return {'psi': _psi(fold(ref), fold(cur)), 'ks': ks}
+
+
+def categorical_drift(ref, cur) -> dict:
+    values = sorted(set(ref.values) | set(cur.values))
+    return {
+        'psi': _psi([ref.values.get(v, 0) for v in values], [cur.values.get(v, 0) for v in values]),
+        'ks': None,
+    }
+
+
+def compare_profiles(ref_profile: dict, cur_profile: dict, psi_threshold: float,
+                     ks_threshold: float, ignore: list = ()) -> dict:
+    """Drift per column shared by both profiles, plus an overall verdict."""
+    from sketches import sketch_from_dict
+
+    columns = {}
+    for col, ref_data in ref_profile['columns'].items():
+        cur_data = cur_profile['columns'].get(col)
+        if col in ignore or cur_data is None or ref_data['kind'] != cur_data['kind']:
+            continue
+
+        ref, cur = sketch_from_dict(ref_data), sketch_from_dict(cur_data)
+        stats = numeric_drift(ref, cur) if ref.kind == 'numeric' else categorical_drift(ref, cur)
+        stats['psi'] = round(stats['psi'], 4)
+        stats['ks'] = round(stats['ks'], 4) if stats['ks'] is not None else None
+        stats['drifted'] = bool(
+            stats['psi'] > psi_threshold
+            or (stats['ks'] is not None and stats['ks'] > ks_threshold)
+        )
+        columns[col] = stats
+
+    return {
+        'columns': columns,
+        'drifted_columns': [c for c, s in columns.items() if s['drifted']],
+        'max_psi': max((s['psi'] for s in columns.values()), default=0.0),
+        'max_ks': max((s['ks'] for s in columns.values() if s['ks'] is not None), default=0.0),
+    }
+
+
+def log_drift(result: dict, run_id: str):
+    """Per-column PSI / KS and the maxima in ONE MLflow request, plus a status tag."""
+    import time
+    from mlflow import MlflowClient
+    from mlflow.entities import Metric, RunTag
+
+    timestamp = int(time.time() * 1000)
+    metrics = [Metric('drift_max_psi', result['max_psi'], timestamp, 0),
+               Metric('drift_max_ks', result['max_ks'], timestamp, 0)]
+    for col, stats in result['columns'].items():
+        metrics.append(Metric(f'drift_psi_{col}', stats['psi'], timestamp, 0))
+        if stats['ks'] is not None:
+            metrics.append(Metric(f'drift_ks_{col}', stats['ks'], timestamp, 0))
+
+    status = 'drifted' if result['drifted_columns'] else 'stable'
+    MlflowClient().log_batch(run_id, metrics=metrics, tags=[
+        RunTag('drift_status', status),
+        RunTag('drift_reference_md5', result['reference_md5']),
+    ])
+
+
+def print_drift(result: dict, psi_threshold: float, ks_threshold: float):
+    print(f"\n{'='*60}")
+    print(f"DATA DRIFT: {result['reference_md5'][:8]} → {result['current_md5'][:8]}")
+    print(f"{'='*60}")
+    print(f"  {'Column':<28} {'PSI':>8} {'KS':>8}")
+    for col, s in result['columns'].items():
+        ks = f"{s['ks']:.4f}" if s['ks'] is not None else '-'
+        print(f"  {col:<28} {s['psi']:>8.4f} {ks:>8}  {'⚠️' if s['drifted'] else ''}")
+    print(f"{'='*60}")
+    if result['drifted_columns']:
+        print(f"⚠️  Drift above PSI {psi_threshold} / KS {ks_threshold}: {result['drifted_columns']}")
+    else:
+        print("✅ No column drifted beyond the thresholds")
+
+
+def run_drift(params: dict, reference: str = None, data_path: str = DATA_PATH,
+              log: bool = True, run_id: str = None) -> dict:
+    """
+    Compare the data against the reference version, save and log the result
+    (the stage body, shared with main.py).
+
+    run_id defaults to metrics/mlflow_run_id.txt; returns the drift result.
+    """
+    from compare_versions import cache_path_for_md5, resolve_versions
+    from profile_data import ensure_profile, file_md5, load_profile
+
+    drift_params = params['drift']
+    reference = resolve_versions([reference or drift_params['reference']], f'{data_path}.dvc')[0]
+    current_md5 = file_md5(data_path)
+
+    ref_profile = load_profile(reference['md5']) or ensure_profile(
+        reference['md5'], reference['path'] or str(cache_path_for_md5(reference['md5']))
+    )
+    cur_profile = ensure_profile(current_md5, data_path)
+
+    result = compare_profiles(
+        ref_profile, cur_profile,
+        psi_threshold=drift_params['psi_threshold'],
+        ks_threshold=drift_params['ks_threshold'],
+        ignore=drift_params.get('ignore') or [],
+    )
+    result = {'reference_md5': reference['md5'], 'current_md5': current_md5, **result}
+    print_drift(result, drift_params['psi_threshold'], drift_params['ks_threshold'])
+
+    Path(DRIFT_PATH).parent.mkdir(exist_ok=True)
+    with open(DRIFT_PATH, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    if log and run_id is None and Path(RUN_ID_PATH).exists():
+        with open(RUN_ID_PATH) as f:
+            run_id = f.read().strip()
+    if log and run_id:
+        log_drift(result, run_id)
+        print(f"📝 Logged drift metrics to run {run_id}")
+    return result
+
+
+def main():
+    params = load_params()
+    drift_params = params['drift']
+
+    parser = argparse.ArgumentParser(description="Drift between two data versions")
+    parser.add_argument('--reference', default=drift_params['reference'],
+                        help='Git revision of the reference data version')
+    parser.add_argument('--data', default=DATA_PATH, help='Current data file')
+    parser.add_argument('--fail-on-drift', action='store_true',
+                        default=drift_params.get('fail_on_drift', False))
+    parser.add_argument('--no-log', action='store_true', help='Do not log to the MLflow run')
+    args = parser.parse_args()
+
+    result = run_drift(params, args.reference, args.data, log=not args.no_log)
+    if args.fail_on_drift and result['drifted_columns']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Pluggable model engines.
+
+WHAT: A small registry of model engines selected by `model.engine` in
+      params.yaml. Every engine exposes the same contract:
+          build() / fit(X, y) / predict(X) / predict_proba(X)
+          feature_importances(columns) / log_params() / log_model(...)
+WHY: train.py and evaluate.py stay the same whatever model is used, and
+     a histogram-binned engine is available when exact-split forests get
+     too slow for the data size
+WHEN: Adding a new model family — subclass Engine and @register_engine it
+WHEN NOT: One-off experiments (compare_experiments.py builds models directly)
+ALTERNATIVE: if/else on the model name inside train.py
+
+Engines:
+    random_forest           RandomForestClassifier, exact splits (default)
+    hist_gradient_boosting  HistGradientBoostingClassifier, features binned
+                            into <=255 buckets; fit cost grows ~linearly
+                            with rows instead of n log n per split
+"""
+
+ENGINES = {}
+
+
+def register_engine(cls):
+    ENGINES[cls.name] = cls
+    return cls
+
+
+def get_engine(model_params: dict, model=None):
+    """
+    Instantiate the engine named by model_params['engine'].
+
+    WHEN: pass `model` to wrap an already fitted estimator (e.g. the
+          pickle loaded by evaluate.py). The engine is then the one that
+          built it, found from the estimator's class: params.yaml may have
+          been edited since the model was trained
+    """
+    if model is not None:
+        name = engine_for_model(model)
+    else:
+        name = model_params.get('engine', 'random_forest')
+    if name not in ENGINES:
+        raise ValueError(f"Unknown model engine '{name}'. Available: {sorted(ENGINES)}")
+    engine = ENGINES[name](model_params)
+    engine.model = model
+    return engine
+
+
+def engine_for_model(model) -> str:
+    """Name of the engine whose estimator class `model` is."""
+    estimator = type(model).__name__
+    for name, cls in ENGINES.items():
+        if cls.estimator == estimator:
+            return name
+    raise ValueError(f"No engine builds a {estimator}. Available: {sorted(ENGINES)}")
+
+
+class Engine:
+    name = None
+    model_type = None       # value of the mlflow "model_type" tag
+    estimator = None        # class name of the fitted model, see engine_for_model
+
+    def __init__(self, model_params: dict):
+        self.model_params = model_params
+        self.model = None
+
+    def build(self):
+        """Return an unfitted sklearn-compatible estimator."""
+        raise NotImplementedError
+
+    def fit(self, X, y):
+        self.model = self.build()
+        self.model.fit(X, y)
+        return self
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        """Probability of the positive class."""
+        return self.model.predict_proba(X)[:, 1]
+
+    def feature_importances(self, columns) -> dict:
+        """{column: importance}, or {} when the engine has no native importances."""
+        importances = getattr(self.model, 'feature_importances_', None)
+        if importances is None:
+            return {}
+        return dict(zip(columns, (float(v) for v in importances)))
+
+    def extend(self, base_model, X, y, n_new_trees: int, retire_oldest: int = 0):
+        """Grow a fitted model with more estimators trained on (X, y)."""
+        raise NotImplementedError(f"Engine '{self.name}' does not support incremental training")
+
+    def log_params(self) -> dict:
+        """Flat dict of hyperparameters for mlflow.log_params."""
+        flat = {k: v for k, v in self.model_params.items() if not isinstance(v, dict)}
+        return {**flat, 'engine': self.name}
+
+    def signature(self, X_sample):
+        """Input schema + output schema; MLflow validates inputs at serving time."""
+        from mlflow.models.signature import infer_signature
+
+        return infer_signature(model_input=X_sample,
+                               model_output=self.model.predict(X_sample))
+
+    def log_model(self, X_sample, registered_model_name: str = None, signature=None):
+        """Log the fitted model with its signature to the active MLflow run."""
+        import mlflow.sklearn
+
+        if signature is None:
+            signature = self.signature(X_sample)
+        return mlflow.sklearn.log_model(
+            sk_model=self.model,
+            name="model",
+            signature=signature,
+            input_example=X_sample.head(3),
+            registered_model_name=registered_model_name
+        )
+
+
+@register_engine
+class RandomForestEngine(Engine):
+    name = 'random_forest'
+    model_type = 'random_forest'
+    estimator = 'RandomForestClassifier'
+
+    def build(self):
+        from sklearn.ensemble import RandomForestClassifier
+
+        p = self.model_params
+        return RandomForestClassifier(
+            n_estimators=p['n_estimators'],
+            max_depth=p['max_depth'],
+            min_samples_split=p['min_sample_split'],
+            min_samples_leaf=p['min_sample_leaf'],
+            class_weight=p['class_weight'],
+            random_state=p['random_state'],
+            # Set by memory.plan_training when model.memory_budget is used
+            max_samples=p.get('max_samples'),
+            n_jobs=p.get('n_jobs', -1)
+        )
+
+    def extend(self, base_model, X, y, n_new_trees: int, retire_oldest: int = 0):
+        """
+        Add `n_new_trees` trees fitted on (X, y) to a fitted forest.
+
+        WHAT: warm_start keeps the existing trees and only fits the new ones
+        WHY: Refitting thousands of trees for a small data batch is wasted work
+        retire_oldest drops that many of the oldest trees afterwards, so the
+        ensemble slowly forgets old data instead of growing forever.
+        """
+        import copy
+        from sklearn.ensemble import RandomForestClassifier
+
+        if not isinstance(base_model, RandomForestClassifier):
+            raise ValueError(f"Cannot extend a {type(base_model).__name__} with forest trees")
+
+        # Checked before fitting: retiring every tree would register an empty forest
+        n_total = len(base_model.estimators_) + n_new_trees
+        if not 0 <= retire_oldest < n_total:
+            raise ValueError(
+                f"retire_oldest={retire_oldest} must be in [0, {n_total}): the forest has "
+                f"{len(base_model.estimators_)} trees plus {n_new_trees} new ones, "
+                f"and at least one has to remain"
+            )
+
+        model = copy.copy(base_model)
+        model.estimators_ = list(base_model.estimators_)
+        model.set_params(
+            warm_start=True,
+            n_estimators=len(model.estimators_) + n_new_trees,
+            n_jobs=self.model_params.get('n_jobs', -1),
+        )
+        model.fit(X, y)
+
+        if retire_oldest:
+            model.estimators_ = model.estimators_[retire_oldest:]
+        # n_estimators follows the trees that remain
+        model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+        self.model = model
+        return self
+
+
+@register_engine
+class HistGradientBoostingEngine(Engine):
+    name = 'hist_gradient_boosting'
+    model_type = 'hist_gradient_boosting'
+    estimator = 'HistGradientBoostingClassifier'
+
+    def _engine_params(self) -> dict:
+        return self.model_params.get('hist_gradient_boosting', {})
+
+    def build(self):
+        from sklearn.ensemble import HistGradientBoostingClassifier
+
+        p = self._engine_params()
+        return HistGradientBoostingClassifier(
+            max_iter=p.get('max_iter', 300),
+            learning_rate=p.get('learning_rate', 0.05),
+            max_leaf_nodes=p.get('max_leaf_nodes', 31),
+            max_depth=p.get('max_depth'),
+            min_samples_leaf=p.get('min_samples_leaf', 20),
+            max_bins=p.get('max_bins', 255),
+            l2_regularization=p.get('l2_regularization', 0.0),
+            early_stopping=p.get('early_stopping', 'auto'),
+            class_weight=self.model_params.get('class_weight'),
+            random_state=self.model_params.get('random_state'),
+        )
+
+    def log_params(self) -> dict:
+        return {
+            'engine': self.name,
+            'class_weight': self.model_params.get('class_weight'),
+            'random_state': self.model_params.get('random_state'),
+            **{f"hgb_{k}": v for k, v in self._engine_params().items()},
+        }
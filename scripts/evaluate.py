@@ -1,69 +1,45 @@
-import mlflow
-import pandas as pd
-import numpy as np
 import pickle
 import json
-import yaml
-import matplotlib.pyplot as plt
 import os
 from pathlib import Path
-from sklearn.metrics import (
-    roc_auc_score, accuracy_score, recall_score,
-    f1_score, ConfusionMatrixDisplay, RocCurveDisplay,
-    classification_report
-)
-from mlflow import MlflowClient
-
-# load parameters
-with open('params.yaml') as f:
-    params = yaml.safe_load(f)
-
-mlflow_params = params['mlflow']
-data_params   = params['data']
-
-# load model and data
-with open('models/random_forest.pkl','rb') as f:
-    model = pickle.load(f)
-
-data = pd.read_csv(data_params['data_path'])
-target = data_params["target_column"]
-X = data.drop(target, axis=1)
-y = data[target]
-print("I work hete")
-
-from sklearn.model_selection import train_test_split
-_, X_test, _, y_test = train_test_split(
-    X, y,
-    test_size=data_params["test_size"],
-    random_state=data_params["random_state"],
-    stratify=y
-)
-
-run_id_path = "metrics/mlflow_run_id.txt"
-if not os.path.exists(run_id_path):
-    raise RuntimeError(
-        "metrics/mlflow_run_id.txt not found. "
-        "Run train.py before evaluate.py."
-    )
-with open(run_id_path) as f:
-    run_id = f.read().strip()
-
-print(f"resuming mlflow run : {run_id}")
-
-# mlflow.start_run with existing run_id resumes the existing run
-# Appends to the existing one instead of creating a new one
-with mlflow.start_run(run_id=run_id):
-    
-    y_pred = model.predict(X_test)
-    y_prob = model.predict_proba(X_test)[:, 1]
-
-    eval_metrics = {
-        "eval_roc_auc":   round(roc_auc_score(y_test, y_prob), 4),
-        "eval_accuracy":  round(accuracy_score(y_test, y_pred), 4),
-        "eval_recall":    round(recall_score(y_test, y_pred), 4),
-        "eval_f1":        round(f1_score(y_test, y_pred), 4),
-    }
-    mlflow.log_metrics(eval_metrics)
+
+from common import load_params, load_processed_data, registry_disabled, split_data
+from dev_profile import dev_enabled, subsample
+from engines import get_engine
+from importance import log_importance, permutation_importance, print_importance
+from stage_profiler import profile_stage
+from telemetry import Telemetry
+
+# mlflow, matplotlib, sklearn and pandas are imported inside the functions
+# below, so only the code paths that actually plot pay for matplotlib.
+
+MODEL_PATH         = 'models/random_forest.pkl'
+RUN_ID_PATH        = 'metrics/mlflow_run_id.txt'
+EVAL_METRICS_PATH  = 'metrics/eval_metrics.json'
+EVAL_TRACE_PATH    = 'metrics/eval_trace.json'
+
+
+def load_model(path: str = MODEL_PATH):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def read_run_id(path: str = RUN_ID_PATH) -> str:
+    if not os.path.exists(path):
+        raise RuntimeError(
+            "metrics/mlflow_run_id.txt not found. "
+            "Run train.py before evaluate.py."
+        )
+    with open(path) as f:
+        return f.read().strip()
+
+
+def log_plots(engine, X_test, y_test, y_pred, y_prob, roc_auc: float):
+    """Log confusion matrix, ROC curve and feature importance plots to the active run."""
+    import mlflow
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import ConfusionMatrixDisplay, RocCurveDisplay
 
     # ── Confusion matrix ───────────────────────────────────────────────────────
     fig, ax = plt.subplots(figsize=(6, 5))
@@ -72,7 +48,7 @@ with mlflow.start_run(run_id=run_id):
         display_labels=["Stay", "Churn"],
         cmap="Blues"
     )
-    ax.set_title(f"Confusion Matrix (ROC AUC: {eval_metrics['eval_roc_auc']:.3f})")
+    ax.set_title(f"Confusion Matrix (ROC AUC: {roc_auc:.3f})")
     plt.tight_layout()
     fig.savefig("confusion_matrix.png", dpi=120)
     mlflow.log_artifact("confusion_matrix.png")
@@ -81,7 +57,7 @@ with mlflow.start_run(run_id=run_id):
 
     # ── ROC curve ─────────────────────────────────────────────────────────────
     fig, ax = plt.subplots(figsize=(6, 5))
-    RocCurveDisplay.from_predictions(y_test, y_prob, ax=ax, name="RF v1")
+    RocCurveDisplay.from_predictions(y_test, y_prob, ax=ax, name=engine.name)
     ax.set_title("ROC Curve")
     ax.plot([0, 1], [0, 1], "k--", label="Random baseline")
     ax.legend()
@@ -92,10 +68,10 @@ with mlflow.start_run(run_id=run_id):
     plt.close()
 
     # ── Feature importance plot ────────────────────────────────────────────────
-    feature_importance = pd.Series(
-        model.feature_importances_,
-        index=X_test.columns
-    ).sort_values(ascending=False).head(15)
+    importances = engine.feature_importances(X_test.columns)
+    if not importances:
+        return
+    feature_importance = pd.Series(importances).sort_values(ascending=False).head(15)
 
     fig, ax = plt.subplots(figsize=(8, 6))
     feature_importance.plot(kind="barh", ax=ax, color="steelblue")
@@ -108,76 +84,191 @@ with mlflow.start_run(run_id=run_id):
     os.remove("feature_importance.png")
     plt.close()
 
-    # ── Classification report ──────────────────────────────────────────────────
-    report = classification_report(y_test, y_pred, target_names=["Stay", "Churn"])
-    mlflow.log_text(report, "classification_report.txt")
 
-    # Save eval metrics for Dvc
-    Path('metrics').mkdir(exist_ok=True)
-    with open('metrics/eval_metrics.json', 'w') as f:
-              json.dump(eval_metrics, f, indent=2)
+def promote_if_better(mlflow_params: dict, new_roc: float, run_id: str):
+    """
+    Champion challenger decision for the version registered by train.py.
+
+    The challenger is the version whose run is `run_id` — the run this
+    evaluation scored — not the newest version number: anything else
+    registered since (another training run) must not be promoted on this
+    run's AUC.
+    """
+    import mlflow
+    from mlflow import MlflowClient
 
-    # Champion challenger decision
     client = MlflowClient()
     MODEL_NAME = mlflow_params["model_registry_name"]
     THRESHOLD = mlflow_params["promotion_threshold"]
-    new_roc = eval_metrics["eval_roc_auc"]
+
+    versions = client.search_model_versions(f"name='{MODEL_NAME}' and run_id='{run_id}'")
+    if not versions:
+        raise RuntimeError(
+            f"Run {run_id} has no version of '{MODEL_NAME}'. "
+            f"Was train.py run with the registry disabled?"
+        )
+    version = max(int(v.version) for v in versions)
 
     # Get current champion ROC if one exists
     try:
         champion_info = client.get_model_version_by_alias(MODEL_NAME, alias='champion')
-        champion_run  = client.get_run(champion_info.run_id)
-        # Try eval roc_auc first then fall to train roc auc
-        champion_roc = champion_run.data.metrics.get(
-             'eval_roc_auc',
-             champion_run.data.metrics.get('roc_auc', 0)
+    except mlflow.exceptions.MlflowException:
+        # No champion exists yet — first run, crown it automatically
+        client.set_registered_model_alias(MODEL_NAME, "champion", str(version))
+        mlflow.set_tag("promotion_decision", "first_champion")
+        print(f"\n👑 FIRST CHAMPION: v{version} crowned as @champion (no previous champion)")
+        return
+
+    champion_run  = client.get_run(champion_info.run_id)
+    # Try eval roc_auc first then fall to train roc auc
+    champion_roc = champion_run.data.metrics.get(
+         'eval_roc_auc',
+         champion_run.data.metrics.get('roc_auc', 0)
+    )
+
+    improvement = new_roc - champion_roc
+    print(f"\nChampion (v{champion_info.version}) ROC AUC: {champion_roc:.4f}")
+    print(f"This run ROC AUC:                     {new_roc:.4f}")
+    print(f"Improvement:                          {improvement:+.4f}")
+
+    if improvement >= THRESHOLD:
+        client.set_registered_model_alias(MODEL_NAME, alias='champion', version=str(version))
+        client.update_model_version(
+             name=MODEL_NAME,
+             version=str(version),
+             description=(
+                f"Promoted to champion. ROC AUC: {new_roc:.4f} "
+                f"(+{improvement:.4f} vs previous champion v{champion_info.version})"
+            )
+        )
+        mlflow.set_tag("promotion_decision", "promoted_to_champion")
+        print(f"\n✅ PROMOTED: v{version} is new @champion")
+
+    else:
+        client.set_model_version_tag(
+            MODEL_NAME, str(version),
+            "promotion_decision",
+            f"rejected — delta {improvement:.4f} below threshold {THRESHOLD}"
         )
+        mlflow.set_tag("promotion_decision", f"rejected_delta_{improvement:.4f}")
+        print(f"\n❌ NOT PROMOTED: improvement {improvement:.4f} < threshold {THRESHOLD}")
+        print(f"   Champion remains v{champion_info.version}")
+
+
+def evaluate(params: dict, model=None, X_test=None, y_test=None, run_id: str = None) -> dict:
+    """
+    Evaluate the trained model and run the champion/challenger decision.
 
-        improvement = new_roc - champion_roc
-        print(f"\nChampion (v{champion_info.version}) ROC AUC: {champion_roc:.4f}")
-        print(f"This run ROC AUC:                     {new_roc:.4f}")
-        print(f"Improvement:                          {improvement:+.4f}")
-
-        if improvement >= THRESHOLD:
-             # Get the version that was just registered in train.py
-            versions = client.search_model_versions(f"name='{MODEL_NAME}'")
-            latest_version = max(int(v.version) for v in versions)
-
-            client.set_registered_model_alias(MODEL_NAME,alias='champion', version=str(latest_version))
-            client.update_model_version(
-                 name=MODEL_NAME,
-                 version=latest_version,
-                 description=(
-                    f"Promoted to champion. ROC AUC: {new_roc:.4f} "
-                    f"(+{improvement:.4f} vs previous champion v{champion_info.version})"
+    WHAT: Score the test split, log plots + metrics to the training run
+    WHY: Callable so the pipeline can hand over the model and split in memory
+    WHEN: Any argument left as None is loaded from the DVC outputs on disk
+    """
+    import mlflow
+    from sklearn.metrics import (
+        roc_auc_score, accuracy_score, recall_score,
+        f1_score, classification_report
+    )
+
+    tel = Telemetry('eval')
+
+    mlflow_params = params['mlflow']
+    data_params   = params['data']
+
+    # load model and data
+    with tel.span('load'):
+        if model is None:
+            model = load_model()
+        if X_test is None or y_test is None:
+            data = load_processed_data(data_params)
+    # The engine is taken from the model's class, not from params.yaml
+    engine = get_engine(params['model'], model=model)
+
+    # dev profile: the same cached subsample train.py split (dev_profile.py)
+    dev = dev_enabled(params)
+    if X_test is None or y_test is None:
+        with tel.span('split'):
+            if dev:
+                from fingerprint import fingerprint
+                data = subsample(data, data_params['target_column'], params['dev'],
+                                 fingerprint(data_params['data_path']))
+            _, X_test, _, y_test = split_data(data, data_params)
+
+    if run_id is None:
+        run_id = read_run_id()
+
+    print(f"resuming mlflow run : {run_id}")
+
+    # mlflow.start_run with existing run_id resumes the existing run
+    # Appends to the existing one instead of creating a new one
+    with mlflow.start_run(run_id=run_id):
+
+        with tel.span('predict'):
+            y_pred = engine.predict(X_test)
+            y_prob = engine.predict_proba(X_test)
+
+        eval_metrics = {
+            "eval_roc_auc":   round(roc_auc_score(y_test, y_prob), 4),
+            "eval_accuracy":  round(accuracy_score(y_test, y_pred), 4),
+            "eval_recall":    round(recall_score(y_test, y_pred), 4),
+            "eval_f1":        round(f1_score(y_test, y_pred), 4),
+        }
+        mlflow.log_metrics(eval_metrics)
+
+        with tel.span('plots'):
+            log_plots(engine, X_test, y_test, y_pred, y_prob, eval_metrics['eval_roc_auc'])
+
+        # ── Permutation importance ─────────────────────────────────────────────────
+        imp_params = params.get('importance', {})
+        if imp_params.get('n_repeats'):
+            with tel.span('permutation_importance'):
+                importance = permutation_importance(
+                    engine, X_test, y_test,
+                    n_repeats=imp_params['n_repeats'],
+                    sample_size=imp_params.get('sample_size'),
+                    n_jobs=imp_params.get('n_jobs'),
+                    random_state=imp_params.get('random_state', 42),
                 )
-            )
-            mlflow.set_tag("promotion_decision", "promoted_to_champion")
-            print(f"\n✅ PROMOTED: v{latest_version} is new @champion")
+                log_importance(importance)
+            print_importance(importance)
 
+        # ── Classification report ──────────────────────────────────────────────────
+        report = classification_report(y_test, y_pred, target_names=["Stay", "Churn"])
+        mlflow.log_text(report, "classification_report.txt")
+
+        # Save eval metrics for Dvc
+        Path('metrics').mkdir(exist_ok=True)
+        with open(EVAL_METRICS_PATH, 'w') as f:
+                  json.dump(eval_metrics, f, indent=2)
+
+        if dev:
+            mlflow.set_tag("promotion_decision", "skipped_dev_profile")
+            print("\n🧪 dev profile: not registered, champion/challenger skipped")
+        elif registry_disabled():
+            mlflow.set_tag("promotion_decision", "skipped_no_registry")
+            print("\n⏭️  Model registry disabled: champion/challenger skipped")
         else:
-            versions = client.search_model_versions(f"name='{MODEL_NAME}'")
-            latest_version = max(int(v.version) for v in versions)
-            client.set_model_version_tag(
-                MODEL_NAME, str(latest_version),
-                "promotion_decision",
-                f"rejected — delta {improvement:.4f} below threshold {THRESHOLD}"
-            )
-            mlflow.set_tag("promotion_decision", f"rejected_delta_{improvement:.4f}")
-            print(f"\n❌ NOT PROMOTED: improvement {improvement:.4f} < threshold {THRESHOLD}")
-            print(f"   Champion remains v{champion_info.version}")
+            with tel.span('promotion'):
+                promote_if_better(mlflow_params, eval_metrics["eval_roc_auc"], run_id)
 
-    except mlflow.exceptions.MlflowException:
-        # No champion exists yet — first run, crown it automatically
-        versions = client.search_model_versions(f"name='{MODEL_NAME}'")
-        latest_version = max(int(v.version) for v in versions)
-        client.set_registered_model_alias(MODEL_NAME, "champion", str(latest_version))
-        mlflow.set_tag("promotion_decision", "first_champion")
-        print(f"\n👑 FIRST CHAMPION: v{latest_version} crowned as @champion (no previous champion)")
-
-    print(f"\n{'='*55}")
-    print(f"EVALUATION COMPLETE")
-    print(f"{'='*55}")
-    for k, v in eval_metrics.items():
-        print(f"  {k:<20} {v:.4f}")
-    print(f"{'='*55}")
\ No newline at end of file
+        # Where this stage's time went: span metrics + metrics/eval_trace.json
+        tel.log(EVAL_TRACE_PATH)
+        tel.print_summary()
+
+        print(f"\n{'='*55}")
+        print(f"EVALUATION COMPLETE")
+        print(f"{'='*55}")
+        for k, v in eval_metrics.items():
+            print(f"  {k:<20} {v:.4f}")
+        print(f"{'='*55}")
+
+    return eval_metrics
+
+
+def main():
+    params = load_params()
+    with profile_stage('evaluate', params.get('profiling')):
+        evaluate(params)
+
+
+if __name__ == "__main__":
+    main()
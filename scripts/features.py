@@ -0,0 +1,161 @@
+"""
+Declarative registry of derived features.
+
+WHAT: Each derived feature declares its input columns and a vectorized
+      function. compute_features() adds them to a DataFrame.
+WHY: One definition shared by preprocessing and serving, and each column
+     is cached on disk so only new or changed features are recomputed
+WHEN: preprocess.py (cached) and scoring code (use_cache=False)
+WHEN NOT: Cleaning steps that change rows (dedupe, fill) — those stay in
+          preprocess.py
+ALTERNATIVE: Inline df['x'] = ... assignments (recomputed every run)
+
+Cache layout: .cache/features/<feature>-<key>.npy where key hashes the
+feature's code, its input column names and the input column contents.
+
+Adding a feature:
+
+    @feature('charges_per_product', inputs=['monthly_charges', 'num_products'])
+    def charges_per_product(monthly_charges, num_products):
+        return monthly_charges / num_products
+
+Remember to declare its dtype in schema.FEATURE_SCHEMA.
+"""
+
+import hashlib
+from pathlib import Path
+
+CACHE_DIR = Path('.cache/features')
+
+# name -> {'inputs': tuple of column names, 'func': callable}
+# Registration order is the output column order.
+FEATURES = {}
+
+
+def feature(name: str, inputs: list):
+    """Register a derived feature computed from `inputs` (passed positionally as Series)."""
+    def register(func):
+        FEATURES[name] = {'inputs': tuple(inputs), 'func': func}
+        return func
+    return register
+
+
+# ── Feature definitions ────────────────────────────────────────────────────────
+
+# Average monthly charges
+@feature('avg_monthly_charge', inputs=['total_charges', 'tenure_months'])
+def avg_monthly_charge(total_charges, tenure_months):
+    return total_charges / (tenure_months + 1)
+
+
+# Customer lifetime value estimate
+@feature('estimated_lifetime_value', inputs=['monthly_charges', 'tenure_months'])
+def estimated_lifetime_value(monthly_charges, tenure_months):
+    return monthly_charges * tenure_months
+
+
+# Product usage intensity
+@feature('products_per_tenure_month', inputs=['num_products', 'tenure_months'])
+def products_per_tenure_month(num_products, tenure_months):
+    return num_products / (tenure_months + 1)
+
+
+# ── Hashing helpers ────────────────────────────────────────────────────────────
+
+def _code_digest(code) -> bytes:
+    """
+    Hash a function's bytecode, constants and names.
+
+    WHY: Unlike marshal/getsource this ignores line numbers and comments,
+         so moving a function around does not invalidate its cache.
+    """
+    h = hashlib.blake2b(code.co_code, digest_size=16)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            h.update(_code_digest(const))
+        else:
+            h.update(repr(const).encode())
+    h.update(repr(code.co_names).encode())
+    return h.digest()
+
+
+def _column_digest(series) -> bytes:
+    import numpy as np
+    import pandas as pd
+
+    values = series.to_numpy()
+    if values.dtype == object:
+        values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    values = np.ascontiguousarray(values)
+    h = hashlib.blake2b(str(values.dtype).encode(), digest_size=16)
+    h.update(memoryview(values).cast('B'))
+    return h.digest()
+
+
+def feature_key(name: str, column_digests: dict) -> str:
+    """Cache key for one feature given digests of its input columns."""
+    spec = FEATURES[name]
+    h = hashlib.blake2b(name.encode(), digest_size=16)
+    h.update(_code_digest(spec['func'].__code__))
+    for col in spec['inputs']:
+        h.update(col.encode())
+        h.update(column_digests[col])
+    return h.hexdigest()
+
+
+# ── Public API ─────────────────────────────────────────────────────────────────
+
+def compute_features(df, names: list = None, use_cache: bool = True,
+                     cache_dir: Path = CACHE_DIR):
+    """
+    Add registered features to `df` (in place) and return it.
+
+    WHAT: For each feature, load its column from cache if the key matches,
+          otherwise compute it and store it
+    WHY: Only features whose code or inputs changed are recomputed
+    WHEN: use_cache=False at serving time (small frames, no disk access)
+    """
+    import numpy as np
+
+    names = list(FEATURES) if names is None else names
+    cache_dir = Path(cache_dir)
+    if use_cache:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    column_digests = {}
+    computed, cached = [], []
+
+    for name in names:
+        spec = FEATURES[name]
+        missing = [c for c in spec['inputs'] if c not in df.columns]
+        if missing:
+            raise KeyError(f"Feature '{name}' needs missing columns: {missing}")
+
+        if not use_cache:
+            df[name] = spec['func'](*(df[c] for c in spec['inputs']))
+            computed.append(name)
+            continue
+
+        for col in spec['inputs']:
+            if col not in column_digests:
+                column_digests[col] = _column_digest(df[col])
+
+        key = feature_key(name, column_digests)
+        cache_path = cache_dir / f"{name}-{key}.npy"
+
+        if cache_path.exists():
+            df[name] = np.load(cache_path)
+            cached.append(name)
+            continue
+
+        df[name] = spec['func'](*(df[c] for c in spec['inputs']))
+        # Drop stale entries for this feature before writing the new one
+        for stale in cache_dir.glob(f"{name}-*.npy"):
+            stale.unlink()
+        np.save(cache_path, df[name].to_numpy())
+        computed.append(name)
+
+    if use_cache:
+        print(f"   Features computed: {computed or 'none'}")
+        print(f"   Features from cache: {cached or 'none'}")
+    return df
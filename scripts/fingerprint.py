@@ -0,0 +1,88 @@
+"""
+Fast cached content fingerprints of data files.
+
+WHAT: blake2b over fixed-size chunks hashed in parallel, combined into
+      one digest; cached by (path, size, mtime_ns, inode)
+WHY: Every MLflow run should carry the exact identity of the data it was
+     trained on. dvc.lock is not always there (ad hoc scripts, in-process
+     runs) and re-hashing a large file per run is wasted time
+WHEN: Tagging runs (data_fingerprint), cache keys for derived data
+WHEN NOT: Comparing with DVC's own md5 — this is a different hash
+ALTERNATIVE: hashlib.md5 over the whole file (single core, every run)
+
+Fingerprint = blake2b(size || digest(chunk 0) || digest(chunk 1) ...),
+so the value depends only on the file's bytes and CHUNK_SIZE. hashlib
+releases the GIL while hashing, so a thread pool keeps every core busy.
+
+A file whose size, mtime_ns and inode are unchanged is assumed to be
+unchanged and is never re-read; the cache is .cache/fingerprints.json.
+"""
+
+import json
+import os
+from pathlib import Path
+
+CACHE_PATH = Path('.cache/fingerprints.json')
+CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def _hash_chunk(path: str, offset: int, length: int) -> bytes:
+    import hashlib
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return hashlib.blake2b(f.read(length), digest_size=32).digest()
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE, n_workers: int = None) -> str:
+    """Parallel chunked blake2b of a file (no caching)."""
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    size = os.path.getsize(path)
+    offsets = range(0, size, chunk_size) or [0]
+    n_workers = min(len(offsets), n_workers or os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        digests = pool.map(lambda off: _hash_chunk(path, off, chunk_size), offsets)
+        combined = hashlib.blake2b(size.to_bytes(8, 'little'), digest_size=16)
+        for digest in digests:
+            combined.update(digest)
+    return combined.hexdigest()
+
+
+def fingerprint(path: str, cache_path: Path = CACHE_PATH) -> str:
+    """Content fingerprint of `path`, re-hashed only when the file changed."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino}
+
+    cache = {}
+    if cache_path.exists():
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+        except json.JSONDecodeError:
+            cache = {}
+
+    entry = cache.get(path)
+    if entry and all(entry.get(k) == v for k, v in key.items()):
+        return entry['fingerprint']
+
+    value = hash_file(path)
+    cache[path] = {**key, 'fingerprint': value}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, cache_path)
+    return value
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    for file_path in sys.argv[1:] or ['data/processed/customers_cleaned.csv']:
+        start = time.perf_counter()
+        print(f"{fingerprint(file_path)}  {file_path}  ({(time.perf_counter() - start) * 1000:.1f} ms)")
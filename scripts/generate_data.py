@@ -1,28 +1,40 @@
 import pandas as pd
 import numpy as np
 
-np.random.seed(42)
-n_samples = 10000
 
-data = {
-    'customer_id': range(1, n_samples + 1),
-    'age': np.random.randint(18, 80, n_samples),
-    'tenure_months': np.random.randint(0, 120, n_samples),
-    'monthly_charges': np.random.uniform(20, 150, n_samples),
-    'total_charges': np.random.uniform(100, 10000, n_samples),
-    'num_products': np.random.randint(1, 5, n_samples),
-    'has_phone': np.random.choice([0, 1], n_samples),
-    'has_internet': np.random.choice([0, 1], n_samples),
-    'contract_type': np.random.choice(['month', 'year', 'two_year'], n_samples),
-    'payment_method': np.random.choice(['credit', 'debit', 'bank', 'mail'], n_samples),
-    'churn': np.random.binomial(1, 0.3, n_samples)  # 30% churn rate
-}
+def generate_customers(n_samples: int, seed: int = 42, churn_rate: float = 0.3,
+                       start_id: int = 1, max_age: int = 80) -> pd.DataFrame:
+    """
+    Generate synthetic raw customer records.
 
-df = pd.DataFrame(data)
-output_path = 'data/raw/customers.csv'
-df.to_csv(output_path, index=False)
+    WHAT: Same columns and distributions as data/raw/customers.csv
+    WHY: Reused by the benchmarks to build datasets of any size
+    RandomState(seed) draws the same sequence as np.random.seed(seed),
+    so generate_customers(10000) reproduces the original dataset.
+    """
+    rng = np.random.RandomState(seed)
+    data = {
+        'customer_id': range(start_id, start_id + n_samples),
+        'age': rng.randint(18, max_age, n_samples),
+        'tenure_months': rng.randint(0, 120, n_samples),
+        'monthly_charges': rng.uniform(20, 150, n_samples),
+        'total_charges': rng.uniform(100, 10000, n_samples),
+        'num_products': rng.randint(1, 5, n_samples),
+        'has_phone': rng.choice([0, 1], n_samples),
+        'has_internet': rng.choice([0, 1], n_samples),
+        'contract_type': rng.choice(['month', 'year', 'two_year'], n_samples),
+        'payment_method': rng.choice(['credit', 'debit', 'bank', 'mail'], n_samples),
+        'churn': rng.binomial(1, churn_rate, n_samples)  # 30% churn rate by default
+    }
+    return pd.DataFrame(data)
 
-print(f"✅ Generated {len(df)} customer records")
-print(f"📁 Saved to: {output_path}")
-print(f"📊 File size: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-print(f"📈 Churn rate: {df['churn'].mean():.1%}")
\ No newline at end of file
+
+if __name__ == "__main__":
+    df = generate_customers(10000)
+    output_path = 'data/raw/customers.csv'
+    df.to_csv(output_path, index=False)
+
+    print(f"✅ Generated {len(df)} customer records")
+    print(f"📁 Saved to: {output_path}")
+    print(f"📊 File size: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    print(f"📈 Churn rate: {df['churn'].mean():.1%}")
@@ -0,0 +1,153 @@
+"""
+Batched reads of git history and objects.
+
+WHAT: A file's history from ONE `git log --raw` call, many objects
+      (blob ids or rev:path specs) from ONE `git cat-file --batch`
+      process, and .dvc file parsing cached by blob id
+WHY: One `git show` subprocess per commit costs a process start and a
+     full object lookup each time — slow once a data file has thousands
+     of versions
+WHEN: Any script that walks versions of tracked files
+      (show_data_history.py, compare_versions.py, ...)
+WHEN NOT: A single lookup at HEAD — plain `git show` is simpler
+ALTERNATIVE: GitPython / pygit2 (extra dependency for the same two calls)
+
+A blob id names its content forever, so parsed .dvc entries are cached
+in .cache/dvc_entries.json and never need invalidating.
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+DVC_ENTRY_CACHE = Path('.cache/dvc_entries.json')
+NULL_BLOB = '0' * 40
+
+
+def file_history(path: str, follow: bool = True, since: str = None, until: str = None) -> list:
+    """
+    Commits that changed `path`, newest first.
+
+    Returns [{'commit', 'date', 'message', 'path', 'blob'}]; 'blob' is the
+    file's blob id after the commit (deletions are skipped).
+    """
+    cmd = ['git', 'log', '--raw', '--no-abbrev', '--pretty=format:%x1e%H%x1f%aI%x1f%s']
+    if follow:
+        cmd.append('--follow')
+    if since:
+        cmd.append(f'--since={since}')
+    if until:
+        cmd.append(f'--until={until}')
+    cmd += ['--', path]
+
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+
+    history = []
+    for record in out.split('\x1e'):
+        if not record.strip():
+            continue
+        header, *raw_lines = record.split('\n')
+        commit, date, message = header.split('\x1f', 2)
+        for line in raw_lines:
+            # :<old mode> <new mode> <old blob> <new blob> <status>\t<path>[\t<new path>]
+            if not line.startswith(':'):
+                continue
+            meta, *paths = line.split('\t')
+            new_blob = meta.split()[3]
+            if new_blob == NULL_BLOB:
+                break
+            history.append({'commit': commit, 'date': date, 'message': message,
+                            'path': paths[-1], 'blob': new_blob})
+            break
+    return history
+
+
+def object_ids(specs: list) -> dict:
+    """
+    Object ids for many specs through a single `git cat-file --batch-check`.
+
+    specs: '<rev>:<path>' strings (or ids). Returns {spec: id}; missing
+    objects map to None. Resolving first lets callers read each distinct
+    blob once, however many commits share it.
+    """
+    if not specs:
+        return {}
+
+    specs = list(dict.fromkeys(specs))
+    out = subprocess.run(
+        ['git', 'cat-file', '--batch-check'],
+        input=''.join(f'{s}\n' for s in specs),
+        capture_output=True, text=True, check=True
+    ).stdout
+
+    ids = {}
+    for spec, line in zip(specs, out.splitlines()):
+        parts = line.split()
+        ids[spec] = parts[0] if len(parts) == 3 and parts[-1] != 'missing' else None
+    return ids
+
+
+def read_objects(specs: list) -> dict:
+    """
+    Contents of many git objects through a single `git cat-file --batch`.
+
+    specs: blob ids or '<rev>:<path>' strings.
+    Returns {spec: bytes}; missing objects map to None.
+    """
+    if not specs:
+        return {}
+
+    specs = list(dict.fromkeys(specs))
+    out = subprocess.run(
+        ['git', 'cat-file', '--batch'],
+        input=''.join(f'{s}\n' for s in specs).encode(),
+        capture_output=True, check=True
+    ).stdout
+
+    objects, pos = {}, 0
+    for spec in specs:
+        end = out.index(b'\n', pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if header[-1] == b'missing' or len(header) != 3:
+            objects[spec] = None
+            continue
+        size = int(header[2])
+        objects[spec] = out[pos:pos + size]
+        pos += size + 1                     # content is followed by a newline
+    return objects
+
+
+def parse_dvc_entry(content: bytes) -> dict:
+    """First output of a .dvc file: {'md5', 'size', 'nfiles', 'path'}."""
+    import yaml
+
+    out = yaml.safe_load(content)['outs'][0]
+    return {
+        'md5': out.get('md5'),
+        'size': out.get('size'),
+        'nfiles': out.get('nfiles'),
+        'path': out.get('path'),
+    }
+
+
+def dvc_entries(blobs: list, cache_path: Path = DVC_ENTRY_CACHE) -> dict:
+    """
+    Parsed .dvc entries for many blob ids.
+
+    Only blobs not yet in the cache are read (one batch) and parsed.
+    """
+    cache = {}
+    if cache_path.exists():
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    missing = [b for b in dict.fromkeys(blobs) if b not in cache]
+    if missing:
+        for blob, content in read_objects(missing).items():
+            cache[blob] = parse_dvc_entry(content) if content is not None else None
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f)
+
+    return {b: cache[b] for b in blobs}
@@ -2,6 +2,7 @@
 import mlflow.sklearn
 import pandas as pd
 import numpy as np
+from schema import read_processed
 
 MODEL_NAME = "customer-churn-classifier"
 
@@ -20,7 +21,7 @@ print(f"Loaded model from URI: {model_uri}")
 print(f"Model type: {type(model).__name__}")
 
 # Simulate inference on new data
-sample_data = pd.read_csv("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv").drop("churn", axis=1).head(5)
+sample_data = read_processed("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv").drop("churn", axis=1).head(5)
 predictions = model.predict(sample_data)
 probabilities = model.predict_proba(sample_data)[:, 1]
 
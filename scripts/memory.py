@@ -0,0 +1,113 @@
+"""
+Memory budgeting for forest training.
+
+WHAT: Turn `model.memory_budget` (params.yaml) into a worker count and
+      a bootstrap sample size (max_samples), and measure the process's
+      peak resident memory
+WHY: n_jobs=-1 with full bootstrap samples multiplies per-tree working
+     memory by the core count; on large data that is what pushes the
+     host out of memory, not the model itself
+WHEN: memory_budget is set (e.g. 4096, "4GB", "512MB")
+WHEN NOT: Small data on a big machine — leave memory_budget null
+ALTERNATIVE: Hand-tune n_jobs until the OOM killer stops firing
+
+The estimate is deliberately simple and conservative:
+    resident = interpreter + libraries              (BASELINE_MB)
+             + training matrix as float32           (n * f * 4)
+             + finished trees kept in the forest    (n_estimators * tree)
+             + per busy worker: bootstrap weights, sample index, feature
+               buffer and the tree under construction
+The training frame keeps the schema's compact dtypes (int8 codes, int32
+ids — casting it up front would be an extra full copy and would round
+customer_id above 2**24); the float32 term is the one matrix sklearn
+converts it to at fit time.
+"""
+
+import re
+
+BASELINE_MB    = 400       # python + numpy/pandas/sklearn/mlflow imported
+NODE_BYTES     = 64 + 16   # sklearn Node struct + 2-class value row
+PER_ROW_BYTES  = 8 + 8 + 4 + 8   # sample weight, sample index, feature buffer, sort scratch
+
+
+def parse_memory_budget(value) -> float:
+    """Return the budget in MB. Accepts numbers (MB) or strings like '4GB'."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?)B?\s*', str(value).upper())
+    if not match:
+        raise ValueError(f"Cannot parse memory_budget '{value}' (use e.g. 4096, '4GB', '512MB')")
+    number, unit = float(match.group(1)), match.group(2) or 'M'
+    return number * {'K': 1 / 1024, 'M': 1, 'G': 1024, 'T': 1024**2}[unit]
+
+
+def estimate_tree_bytes(n_samples: int, max_depth, min_samples_leaf: int) -> float:
+    """Upper bound on one fitted tree's size (nodes are bounded by depth and by leaf size)."""
+    # A bootstrap sample holds ~63.2% distinct rows
+    by_samples = 2 * 0.632 * n_samples / max(1, min_samples_leaf)
+    by_depth = 2 ** (max_depth + 1) if max_depth else by_samples
+    return min(by_samples, by_depth) * NODE_BYTES
+
+
+def plan_training(memory_budget, n_samples: int, n_features: int,
+                  model_params: dict, n_cpus: int = None) -> dict:
+    """
+    Fit the training job into `memory_budget`.
+
+    Returns {'n_jobs', 'max_samples', 'estimated_peak_mb', 'budget_mb'}.
+    max_samples is None (full bootstrap) or a fraction in (0, 1].
+    Raises MemoryError if even one worker on a 1% sample cannot fit.
+    """
+    import os
+
+    budget_mb = parse_memory_budget(memory_budget)
+    n_cpus = n_cpus or os.cpu_count() or 1
+    mb = 1024**2
+
+    data_mb = n_samples * n_features * 4 / mb
+
+    def cost(fraction: float) -> tuple:
+        rows = int(n_samples * fraction)
+        tree_mb = estimate_tree_bytes(rows, model_params.get('max_depth'),
+                                      model_params.get('min_sample_leaf', 1)) / mb
+        forest_mb = model_params['n_estimators'] * tree_mb
+        worker_mb = (rows * PER_ROW_BYTES) / mb + tree_mb
+        return BASELINE_MB + data_mb + forest_mb, worker_mb, forest_mb
+
+    fraction = 1.0
+    while True:
+        fixed_mb, worker_mb, forest_mb = cost(fraction)
+        if fixed_mb + worker_mb <= budget_mb:
+            break
+        if fraction / 2 < 0.01:
+            raise MemoryError(
+                f"memory_budget {budget_mb:.0f} MB is too small even with a "
+                f"{fraction:.0%} bootstrap sample: data ~{data_mb:.0f} MB, "
+                f"forest ~{forest_mb:.0f} MB. Lower n_estimators / max_depth "
+                f"or raise the budget."
+            )
+        fraction /= 2
+
+    n_jobs = int(max(1, min(n_cpus, (budget_mb - fixed_mb) // worker_mb)))
+    return {
+        'n_jobs': n_jobs,
+        'max_samples': None if fraction == 1.0 else fraction,
+        'estimated_peak_mb': round(fixed_mb + n_jobs * worker_mb, 1),
+        'budget_mb': budget_mb,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (0.0 without `resource`, i.e. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    import sys
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
@@ -0,0 +1,342 @@
+"""
+Indexed history of metrics and params across git commits.
+
+WHAT: A local sqlite index of every numeric value in the committed metrics
+      files and every params.yaml key, per commit, with trend and
+      regression queries over any key
+WHY: Seeing how AUC moved over the last few hundred commits otherwise
+     means one `git show` (or a checkout) per revision and per file
+WHEN: "When did eval_roc_auc drop, and which params changed with it?"
+WHEN NOT: Comparing uncommitted experiments (uv run dvc exp show) or runs
+          that never reached git (the MLflow UI)
+ALTERNATIVE: uv run dvc metrics diff <rev> (two revisions at a time)
+
+The index lives in .cache/metrics_history.sqlite and is updated before
+every query: one `git log` lists the reachable commits; only commits not
+yet indexed are read, with ONE `git cat-file --batch-check` to resolve
+<commit>:<file> to blob ids and ONE `git cat-file --batch` for the
+distinct blobs (git_objects.py) — a file that did not change is parsed
+once, however many commits share it. Commits that are no longer reachable
+(rebased away) are dropped.
+
+Nested JSON is flattened with dots (bench.json: rows_10000.train.wall_s);
+booleans count as 0/1 and lists are skipped. Params are stored as JSON text.
+
+Usage:
+    uv run python scripts/metrics_history.py keys
+    uv run python scripts/metrics_history.py trend eval_roc_auc --changes
+    uv run python scripts/metrics_history.py trend model.n_estimators --params
+    uv run python scripts/metrics_history.py regressions eval_roc_auc --threshold 0.005
+    uv run python scripts/metrics_history.py regressions span_train_fit_s --lower-is-better
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DB_PATH      = Path('.cache/metrics_history.sqlite')
+METRIC_FILES = [
+    'metrics/train_metrics.json',
+    'metrics/eval_metrics.json',
+    'metrics/train_trace.json',
+    'metrics/eval_trace.json',
+    'metrics/bench.json',
+    'metrics/drift.json',
+    'metrics/validation.json',
+]
+PARAMS_FILE  = 'params.yaml'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    commit_id TEXT PRIMARY KEY,
+    ts        INTEGER NOT NULL,
+    seq       INTEGER NOT NULL,   -- git log order; breaks ties between equal timestamps
+    subject   TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    commit_id TEXT NOT NULL,
+    source    TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    value     REAL NOT NULL,
+    PRIMARY KEY (commit_id, source, key)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_key ON metrics (key, source);
+CREATE TABLE IF NOT EXISTS params (
+    commit_id TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    value     TEXT,
+    PRIMARY KEY (commit_id, key)
+);
+CREATE INDEX IF NOT EXISTS params_by_key ON params (key);
+"""
+
+
+def connect(path: Path = DB_PATH):
+    import sqlite3
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def flatten(value, prefix: str = '') -> dict:
+    """{'a': {'b': 1}} -> {'a.b': 1}; lists are kept as leaves."""
+    if not isinstance(value, dict):
+        return {prefix: value}
+    flat = {}
+    for key, sub in value.items():
+        flat.update(flatten(sub, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def _numeric(flat: dict) -> dict:
+    return {k: float(v) for k, v in flat.items()
+            if isinstance(v, (int, float)) and v == v}       # v == v drops NaN
+
+
+def reachable_commits() -> list:
+    """[(commit, committer timestamp, subject)] reachable from HEAD, newest first."""
+    out = subprocess.run(
+        ['git', 'log', '--pretty=format:%H%x1f%ct%x1f%s', 'HEAD'],
+        capture_output=True, text=True, check=True
+    ).stdout
+    commits = []
+    for line in out.splitlines():
+        commit, ts, subject = line.split('\x1f', 2)
+        commits.append((commit, int(ts), subject))
+    return commits
+
+
+def update_index(conn, metric_files: list = METRIC_FILES, params_file: str = PARAMS_FILE) -> dict:
+    """Index commits not seen yet and drop unreachable ones. Returns counts."""
+    import yaml
+    from git_objects import object_ids, read_objects
+
+    commits = reachable_commits()
+    reachable = {c for c, _, _ in commits}
+    known = {row[0] for row in conn.execute('SELECT commit_id FROM commits')}
+
+    stale = [(c,) for c in known - reachable]
+    new = [c for c in commits if c[0] not in known]
+
+    if new:
+        paths = metric_files + [params_file]
+        ids = object_ids([f"{c}:{p}" for c, _, _ in new for p in paths])
+        blobs = read_objects(sorted({b for b in ids.values() if b}))
+
+        parsed = {}
+        for blob, content in blobs.items():
+            try:
+                parsed[blob] = json.loads(content) if content[:1] in (b'{', b'[') \
+                    else yaml.safe_load(content)
+            except (ValueError, yaml.YAMLError):
+                parsed[blob] = None
+
+        metric_rows, param_rows = [], []
+        for commit, _, _ in new:
+            for path in metric_files:
+                data = parsed.get(ids[f"{commit}:{path}"])
+                if isinstance(data, dict):
+                    source = Path(path).stem
+                    metric_rows += [(commit, source, k, v)
+                                    for k, v in _numeric(flatten(data)).items()]
+            data = parsed.get(ids[f"{commit}:{params_file}"])
+            if isinstance(data, dict):
+                param_rows += [(commit, k, json.dumps(v))
+                               for k, v in flatten(data).items()]
+
+    with conn:
+        for table in ('metrics', 'params', 'commits'):
+            conn.executemany(f'DELETE FROM {table} WHERE commit_id = ?', stale)
+        if new:
+            top = conn.execute('SELECT COALESCE(MAX(seq), 0) FROM commits').fetchone()[0]
+            conn.executemany('INSERT INTO commits VALUES (?, ?, ?, ?)',
+                             [(c, ts, top + len(new) - i, s) for i, (c, ts, s) in enumerate(new)])
+            conn.executemany('INSERT INTO metrics VALUES (?, ?, ?, ?)', metric_rows)
+            conn.executemany('INSERT INTO params VALUES (?, ?, ?)', param_rows)
+
+    return {'new': len(new), 'dropped': len(stale), 'total': len(reachable)}
+
+
+# ── Queries ────────────────────────────────────────────────────────────────────
+
+def keys(conn) -> dict:
+    """{'metrics': [(source, key, n commits)], 'params': [(key, n commits)]}"""
+    return {
+        'metrics': conn.execute(
+            'SELECT source, key, COUNT(*) FROM metrics GROUP BY source, key ORDER BY source, key'
+        ).fetchall(),
+        'params': conn.execute(
+            'SELECT key, COUNT(*) FROM params GROUP BY key ORDER BY key'
+        ).fetchall(),
+    }
+
+
+def trend(conn, key: str, source: str = None, params: bool = False,
+          limit: int = None, changes_only: bool = False) -> list:
+    """
+    Values of `key` per commit, oldest first.
+
+    Returns [{'commit', 'ts', 'subject', 'source', 'value'}]. With
+    changes_only, only commits where the value differs from the previous one.
+    """
+    if params:
+        sql = ('SELECT c.commit_id, c.ts, c.subject, NULL, p.value FROM params p '
+               'JOIN commits c USING (commit_id) WHERE p.key = ?')
+        args = [key]
+    else:
+        sql = ('SELECT c.commit_id, c.ts, c.subject, m.source, m.value FROM metrics m '
+               'JOIN commits c USING (commit_id) WHERE m.key = ?')
+        args = [key]
+        if source:
+            sql += ' AND m.source = ?'
+            args.append(source)
+    sql += ' ORDER BY c.ts, c.seq'
+
+    rows = [{'commit': c, 'ts': ts, 'subject': s, 'source': src,
+             'value': json.loads(v) if params else v}
+            for c, ts, s, src, v in conn.execute(sql, args)]
+
+    sources = {r['source'] for r in rows}
+    if len(sources) > 1:
+        raise ValueError(f"'{key}' is in several metrics files {sorted(sources)}; pass --source")
+
+    if changes_only:
+        rows = [r for i, r in enumerate(rows) if i == 0 or r['value'] != rows[i - 1]['value']]
+    return rows[-limit:] if limit else rows
+
+
+def params_diff(conn, before: str, after: str) -> dict:
+    """{param key: (before, after)} for params that differ between two commits."""
+    def load(commit):
+        return dict(conn.execute('SELECT key, value FROM params WHERE commit_id = ?', (commit,)))
+
+    a, b = load(before), load(after)
+    return {k: (json.loads(a[k]) if k in a else None, json.loads(b[k]) if k in b else None)
+            for k in sorted(set(a) | set(b)) if a.get(k) != b.get(k)}
+
+
+def regressions(conn, key: str, threshold: float = 0.0, source: str = None,
+                lower_is_better: bool = False) -> list:
+    """
+    Commits where `key` got worse than at the previous commit that had it.
+
+    Returns [{'commit', 'subject', 'before_commit', 'before', 'after',
+    'delta', 'params_changed'}], oldest first.
+    """
+    series = trend(conn, key, source=source, changes_only=True)
+    found = []
+    for prev, cur in zip(series, series[1:]):
+        delta = cur['value'] - prev['value']
+        worse = delta > threshold if lower_is_better else -delta > threshold
+        if worse:
+            found.append({
+                'commit': cur['commit'],
+                'subject': cur['subject'],
+                'before_commit': prev['commit'],
+                'before': prev['value'],
+                'after': cur['value'],
+                'delta': delta,
+                'params_changed': params_diff(conn, prev['commit'], cur['commit']),
+            })
+    return found
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+
+def _date(ts: int) -> str:
+    return time.strftime('%Y-%m-%d', time.localtime(ts))
+
+
+def print_trend(key: str, rows: list):
+    print(f"\n{'='*80}")
+    print(f"TREND: {key} ({len(rows)} commits)")
+    print(f"{'='*80}")
+    for r in rows:
+        print(f"  {r['commit'][:8]}  {_date(r['ts'])}  {str(r['value']):>14}  {r['subject'][:40]}")
+    print(f"{'='*80}")
+
+
+def print_regressions(key: str, found: list, threshold: float):
+    print(f"\n{'='*80}")
+    print(f"REGRESSIONS: {key} (worse by more than {threshold})")
+    print(f"{'='*80}")
+    if not found:
+        print("✅ None")
+    for r in found:
+        print(f"  ⚠️  {r['commit'][:8]}  {r['before']:g} → {r['after']:g} ({r['delta']:+g})  "
+              f"{r['subject'][:40]}")
+        for param, (before, after) in r['params_changed'].items():
+            print(f"        {param}: {before} → {after}")
+    print(f"{'='*80}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics and params history across commits")
+    parser.add_argument('--no-update', action='store_true', help='Query without indexing new commits')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('update', help='Index new commits')
+    sub.add_parser('keys', help='List indexed metrics and params keys')
+
+    trend_parser = sub.add_parser('trend', help='Value of a key per commit')
+    trend_parser.add_argument('key')
+    trend_parser.add_argument('--source', help='Metrics file stem, e.g. eval_metrics')
+    trend_parser.add_argument('--params', action='store_true', help='KEY is a params.yaml key')
+    trend_parser.add_argument('--limit', type=int, help='Only the last N commits')
+    trend_parser.add_argument('--changes', action='store_true', help='Only commits that changed it')
+
+    reg_parser = sub.add_parser('regressions', help='Commits where a metric got worse')
+    reg_parser.add_argument('key')
+    reg_parser.add_argument('--source')
+    reg_parser.add_argument('--threshold', type=float, default=0.0)
+    reg_parser.add_argument('--lower-is-better', action='store_true',
+                            help='e.g. timings and memory; default is higher-is-better')
+
+    args = parser.parse_args()
+    conn = connect()
+
+    if not args.no_update:
+        start = time.perf_counter()
+        counts = update_index(conn)
+        if counts['new'] or counts['dropped'] or args.command == 'update':
+            print(f"🗂️  Indexed {counts['new']} new commit(s), dropped {counts['dropped']} "
+                  f"({counts['total']} reachable) in {time.perf_counter() - start:.2f}s",
+                  file=sys.stderr if args.json else sys.stdout)
+
+    try:
+        if args.command == 'keys':
+            result = keys(conn)
+            if not args.json:
+                print("\n📈 Metrics:")
+                for source, key, n in result['metrics']:
+                    print(f"  {source:<16} {key:<40} {n:>5} commits")
+                print("\n⚙️  Params:")
+                for key, n in result['params']:
+                    print(f"  {key:<57} {n:>5} commits")
+        elif args.command == 'trend':
+            result = trend(conn, args.key, source=args.source, params=args.params,
+                           limit=args.limit, changes_only=args.changes)
+            if not args.json:
+                print_trend(args.key, result)
+        elif args.command == 'regressions':
+            result = regressions(conn, args.key, threshold=args.threshold, source=args.source,
+                                 lower_is_better=args.lower_is_better)
+            if not args.json:
+                print_regressions(args.key, result, args.threshold)
+        else:
+            result = None
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+
+    if args.json and result is not None:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
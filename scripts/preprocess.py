@@ -1,17 +1,73 @@
-import pandas as pd
-import numpy as np
 from pathlib import Path
 
+from categorical import encode_categories, fit_vocabulary, save_vocabulary, VOCAB_PATH
+from features import FEATURES, compute_features
+from schema import apply_schema
+from stage_profiler import profile_stage
+
 INPUT_PATH  = 'data/raw/customers.csv'
 OUTPUT_PATH = 'data/processed/customers_cleaned.csv'
+FILL_VALUES_PATH = 'data/processed/fill_values.json'
 
-def preprocess_data(input_path: str, output_path: str):
-    df = pd.read_csv(input_path)
 
-    initial_count = len(df)
-    print("Dropping duplicate values")
-    df = df.drop_duplicates(subset=['customer_id'])
-    print(f"Removed duplicate values : {initial_count - len(df)}")
+def fit_fill_values(df) -> dict:
+    """
+    Median of every numeric raw column, the value missing entries get.
+
+    WHAT: Fitted once on the training data and saved next to the vocabulary
+    WHY: Scoring must fill gaps the way training did — a chunk's own median
+         depends on which rows share the chunk (and is NaN for an all-NaN column)
+    Integer columns of FEATURE_SCHEMA get a rounded median, so the filled
+    column still fits its integer dtype.
+    """
+    import numpy as np
+    from schema import FEATURE_SCHEMA
+
+    fill_values = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        median = float(df[col].median())
+        if np.dtype(FEATURE_SCHEMA.get(col, 'float64')).kind in 'iu':
+            median = float(round(median))
+        fill_values[col] = median
+    return fill_values
+
+
+def save_fill_values(fill_values: dict, path: str = FILL_VALUES_PATH):
+    import json
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(fill_values, f, indent=2)
+
+
+def load_fill_values(path: str = FILL_VALUES_PATH) -> dict:
+    import json
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def clean_data(df, vocab: dict = None, use_feature_cache: bool = True,
+               drop_duplicates: bool = True, fill_values: dict = None):
+    """
+    Clean raw customer data and add derived features.
+
+    WHAT: Dedupe, fill missing numerics, encode categories, drop other
+          strings, derive features
+    WHY: Pure DataFrame -> DataFrame step (pass use_feature_cache=False
+         to keep it off disk entirely)
+    WHEN NOT: drop_duplicates=False when scoring — every input row needs
+              its own prediction, in order
+    fill_values: {column: value} for missing numerics (the saved training
+    medians when scoring); columns not in it use df's own median.
+    """
+    import numpy as np
+
+    if drop_duplicates:
+        initial_count = len(df)
+        print("Dropping duplicate values")
+        df = df.drop_duplicates(subset=['customer_id']).reset_index(drop=True)
+        print(f"Removed duplicate values : {initial_count - len(df)}")
 
     # Missing values
     missing_before = df.isnull().sum().sum()
@@ -19,13 +75,22 @@ def preprocess_data(input_path: str, output_path: str):
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     for col in numeric_cols:
         if df[col].isnull().any():
-            median_val = df[col].median()
-            df[col].fillna(median_val, inplace=True)
+            median_val = (fill_values or {}).get(col, df[col].median())
+            df[col] = df[col].fillna(median_val)
             print(f"   Filled {col} missing values with median: {median_val:.2f}")
     
     missing_after = df.isnull().sum().sum()
     print(f"\n🔧 Handled {missing_before - missing_after} missing values")
-    string_cols = df.select_dtypes(include=['object']).columns
+
+    # WHAT: Encode categorical columns as small integer codes
+    # WHY: Keep the category information without a one-hot blow-up
+    # WHEN: vocab is None while fitting; pass the saved vocab when scoring
+    if vocab is None:
+        vocab = fit_vocabulary(df)
+    df = encode_categories(df, vocab)
+    print(f"   Encoded {len(vocab)} categorical columns: {list(vocab)}")
+
+    string_cols = df.select_dtypes(include=['object', 'string']).columns
     df.drop(columns=string_cols, inplace=True)
     print(f"   Dropped {len(string_cols)} string columns")
     print(f"Now any string or object dtype columns? : {df.select_dtypes(include=['object']).columns}")
@@ -35,18 +100,30 @@ def preprocess_data(input_path: str, output_path: str):
     # WHEN NOT: If baseline model only
     # ALTERNATIVE: Create during training (couples code)
     print(f"\n✨ Creating derived features")
-    
-    # Average monthly charges
-    df['avg_monthly_charge'] = df['total_charges'] / (df['tenure_months'] + 1)
-    
-    # Customer lifetime value estimate
-    df['estimated_lifetime_value'] = df['monthly_charges'] * df['tenure_months']
-    
-    # Product usage intensity
-    df['products_per_tenure_month'] = df['num_products'] / (df['tenure_months'] + 1)
-    
-    print(f"   Created 3 new features")
-    
+    # Definitions live in features.py; unchanged columns come from the cache
+    df = compute_features(df, use_cache=use_feature_cache)
+    print(f"   Created {len(FEATURES)} new features")
+    return df
+
+def preprocess_data(input_path: str, output_path: str):
+    import pandas as pd
+
+    df = pd.read_csv(input_path)
+    vocab = fit_vocabulary(df)
+    save_vocabulary(vocab, VOCAB_PATH)
+    print(f"💾 Saved category vocabulary to: {VOCAB_PATH}")
+
+    # Medians of the de-duplicated training rows; batch scoring reuses them
+    fill_values = fit_fill_values(df.drop_duplicates(subset=['customer_id']))
+    save_fill_values(fill_values, FILL_VALUES_PATH)
+    print(f"💾 Saved fill values to: {FILL_VALUES_PATH}")
+
+    df = clean_data(df, vocab, fill_values=fill_values)
+
+    # WHAT: Downcast to the declared feature schema
+    # WHY: int8/float32 columns instead of int64/float64 for every consumer
+    df = apply_schema(df)
+
     # WHAT: Ensure output directory exists
     # WHY: Prevent file not found errors
     # WHEN: Before saving
@@ -64,8 +141,12 @@ def preprocess_data(input_path: str, output_path: str):
     print(f"   Final records: {len(df):,}")
     print(f"   Final columns: {len(df.columns)}")
     print("="*60)
+    return df
 
 if __name__ == "__main__":
-    preprocess_data(INPUT_PATH, OUTPUT_PATH)
+    from common import load_params
+
+    with profile_stage('preprocess', load_params().get('profiling')):
+        preprocess_data(INPUT_PATH, OUTPUT_PATH)
 
 
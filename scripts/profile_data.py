@@ -0,0 +1,201 @@
+"""
+Per-version dataset profiles keyed by md5.
+
+WHAT: One compact JSON profile per data version in data/profiles/<md5>.json:
+      row count and, per column, count / nulls / min / max / mean,
+      quantiles and the mergeable sketch (sketches.py) behind them
+WHY: show_data_history.py, compare_versions.py, update_data_v2.py and
+     drift.py need summary stats of data versions; with profiles they
+     answer in O(columns) instead of re-reading every version
+WHEN: The `profile` DVC stage profiles each new data/raw/customers.csv;
+      older versions are profiled on demand from the DVC cache
+WHEN NOT: Row-level questions (which customers changed) — use the data
+ALTERNATIVE: pandas describe() on every read (full scan each time)
+
+The md5 is the DVC 3 hash of the data file (plain md5 of its bytes), so
+the profile of a version is found from its .dvc entry alone. The
+workspace file's md5 (data_md5) is cached in .cache/data_md5.json by
+(path, size, mtime_ns, inode), as fingerprint.py does: any write to the
+file changes the key, so an edit that keeps the size is still re-hashed. Profiles
+are written once and never change: the same md5 is the same data.
+
+Usage:
+    uv run python scripts/profile_data.py                   # workspace data file
+    uv run python scripts/profile_data.py --rev HEAD~1 HEAD   # versions from the DVC cache
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+DATA_PATH   = 'data/raw/customers.csv'
+PROFILE_DIR = 'data/profiles'
+CHUNKSIZE   = 200_000
+MD5_CACHE   = Path('.cache/data_md5.json')
+
+
+def file_md5(path: str, block_size: int = 1 << 20) -> str:
+    import hashlib
+
+    h = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _md5_key(path: str) -> tuple:
+    import os
+
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return path, {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino}
+
+
+def _load_md5_cache(cache_path: Path) -> dict:
+    if cache_path.exists():
+        try:
+            with open(cache_path) as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    return {}
+
+
+def remember_md5(path: str, md5: str, cache_path: Path = MD5_CACHE):
+    """Record the md5 of `path` as it is on disk now (a writer that hashed its own bytes)."""
+    import os
+
+    path, key = _md5_key(path)
+    cache = _load_md5_cache(cache_path)
+    cache[path] = {**key, 'md5': md5}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, cache_path)
+
+
+def data_md5(path: str, cache_path: Path = MD5_CACHE) -> str:
+    """md5 of `path`, re-hashed only when its size, mtime_ns or inode changed."""
+    abs_path, key = _md5_key(path)
+    entry = _load_md5_cache(cache_path).get(abs_path)
+    if entry and all(entry.get(k) == v for k, v in key.items()):
+        return entry['md5']
+
+    md5 = file_md5(path)
+    remember_md5(path, md5, cache_path)
+    return md5
+
+
+def profile_chunks(chunks) -> dict:
+    """Fold DataFrame chunks into one profile (one pass, bounded memory)."""
+    from sketches import sketch_for
+
+    sketches, rows = {}, 0
+    for chunk in chunks:
+        rows += len(chunk)
+        for col in chunk.columns:
+            if col not in sketches:
+                sketches[col] = sketch_for(chunk[col])
+            sketches[col].update(chunk[col])
+
+    return {
+        'rows': rows,
+        'columns': {col: sketch.to_dict() for col, sketch in sketches.items()},
+    }
+
+
+def profile_csv(path: str, chunksize: int = CHUNKSIZE) -> dict:
+    import pandas as pd
+
+    return profile_chunks(pd.read_csv(path, chunksize=chunksize))
+
+
+def profile_frame(df) -> dict:
+    return profile_chunks([df])
+
+
+def profile_path(md5: str, profile_dir: str = PROFILE_DIR) -> Path:
+    return Path(profile_dir) / f'{md5}.json'
+
+
+def load_profile(md5: str, profile_dir: str = PROFILE_DIR) -> dict:
+    """The stored profile of a data version, or None."""
+    path = profile_path(md5, profile_dir)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_profile(profile: dict, md5: str, profile_dir: str = PROFILE_DIR) -> Path:
+    path = profile_path(md5, profile_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'md5': md5, **profile}, f, indent=1)
+    return path
+
+
+def ensure_profile(md5: str, data_path: str, profile_dir: str = PROFILE_DIR) -> dict:
+    """Load the profile of `md5`, computing it from `data_path` the first time."""
+    profile = load_profile(md5, profile_dir)
+    if profile is None:
+        profile = profile_csv(data_path)
+        save_profile(profile, md5, profile_dir)
+        profile = {'md5': md5, **profile}
+    return profile
+
+
+def summarize(profile: dict) -> dict:
+    """The headline numbers the history / comparison tools print."""
+    columns = profile['columns']
+    churn = columns.get('churn', {})
+    age = columns.get('age', {})
+    return {
+        'records': profile['rows'],
+        'columns': list(columns),
+        'churn_rate': churn.get('mean'),
+        'age_min': age.get('min'),
+        'age_max': age.get('max'),
+    }
+
+
+def main():
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Profile data versions")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--rev', nargs='+', help='Profile these git revisions from the DVC cache')
+    parser.add_argument('--profile-dir', default=PROFILE_DIR)
+    args = parser.parse_args()
+
+    if args.rev:
+        from compare_versions import cache_path_for_md5, resolve_versions
+
+        targets = {v['md5']: v['path'] or str(cache_path_for_md5(v['md5']))
+                   for v in resolve_versions(args.rev, f'{args.data}.dvc')}
+    else:
+        targets = {data_md5(args.data): args.data}
+
+    todo = {md5: path for md5, path in targets.items()
+            if not profile_path(md5, args.profile_dir).exists()}
+    profiles = {}
+    if todo:
+        n_workers = min(len(todo), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            profiles = dict(zip(todo, pool.map(profile_csv, todo.values())))
+
+    for md5 in targets:
+        if md5 in profiles:
+            save_profile(profiles[md5], md5, args.profile_dir)
+            print(f"✅ Profiled {md5[:8]}: {profiles[md5]['rows']:,} rows, "
+                  f"{len(profiles[md5]['columns'])} columns")
+        else:
+            print(f"   {md5[:8]}: profile already exists")
+        print(f"   → {profile_path(md5, args.profile_dir)}")
+
+
+if __name__ == "__main__":
+    main()
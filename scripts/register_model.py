@@ -4,9 +4,14 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import roc_auc_score, accuracy_score, recall_score
+from artifact_store import ArtifactStore
+from fingerprint import fingerprint
+from schema import read_processed
 
 # ── Load data ──────────────────────────────────────────────────────────────────
-data = pd.read_csv("data/processed/customers_cleaned.csv")
+DATA_PATH = "data/processed/customers_cleaned.csv"
+data = read_processed(DATA_PATH)
+data_fingerprint = fingerprint(DATA_PATH)
 X = data.drop("churn", axis=1)
 y = data["churn"]
 X_train, X_test, y_train, y_test = train_test_split(
@@ -21,7 +26,8 @@ with mlflow.start_run(run_name="rf_registry_candidate") as run:
         "model_type": "random-forest",
         "data_version": "v1",
         "purpose": "registry_Candidate",
-        "engineer": "Muhammad Dawood"    
+        "engineer": "Muhammad Dawood",
+        "data_fingerprint": data_fingerprint,
     })
 
     params = {
@@ -48,12 +54,10 @@ with mlflow.start_run(run_name="rf_registry_candidate") as run:
 
     mlflow.log_metrics(metrics)
 
-    mlflow.sklearn.log_model(
-        sk_model=model,
-        artifact_path='model',
-        registered_model_name="customer-churn-classifier"
-    )
-    print(f"Model registered as 'customer-churn-classifier'")
+    store = ArtifactStore()
+    logged = store.log_model(model, registered_model_name="customer-churn-classifier")
+    print(f"Model registered as 'customer-churn-classifier' v{logged['version']}"
+          f"{' (deduplicated)' if logged['deduplicated'] else ''}")
     print(f"ROC AUC: {metrics['roc_auc']:.3f}")
     print(f"Run ID: {run.info.run_id}")
     
\ No newline at end of file
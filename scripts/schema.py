@@ -0,0 +1,148 @@
+"""
+Declared dtype schema for the processed feature table.
+
+WHAT: One dtype per processed column, downcast to the smallest safe type
+WHY: pandas defaults every integer to int64 and every float to float64.
+     Flags like has_phone need 1 byte, not 8. The trees split on float32
+     internally anyway, so float32 charges give the exact same model.
+WHEN: Enforced when preprocess.py writes the CSV and whenever a script
+      reads it back (read_processed)
+WHEN NOT: Raw data — it still has string columns and may contain NaN
+ALTERNATIVE: df.convert_dtypes() (nullable extension types, not smaller)
+
+Check that the compact schema leaves model output unchanged:
+    uv run python scripts/schema.py --check
+"""
+
+FEATURE_SCHEMA = {
+    'customer_id':               'int32',
+    'age':                       'int16',
+    'tenure_months':             'int16',
+    'monthly_charges':           'float32',
+    'total_charges':             'float32',
+    'num_products':              'int8',
+    'has_phone':                 'uint8',
+    'has_internet':              'uint8',
+    'contract_type':             'int8',    # categorical.py codes
+    'payment_method':            'int8',    # categorical.py codes
+    'churn':                     'uint8',
+    'avg_monthly_charge':        'float32',
+    'estimated_lifetime_value':  'float32',
+    'products_per_tenure_month': 'float32',
+}
+
+
+def apply_schema(df, schema: dict = FEATURE_SCHEMA):
+    """
+    Downcast a DataFrame to the declared schema.
+
+    WHAT: Check columns, check every value fits, then cast
+    WHY: A silent overflow (e.g. 300 into int8) corrupts features
+    Raises ValueError if the columns don't match the schema or a value
+    does not fit its declared type.
+    """
+    import numpy as np
+
+    missing = [c for c in schema if c not in df.columns]
+    extra   = [c for c in df.columns if c not in schema]
+    if missing or extra:
+        raise ValueError(
+            f"Processed columns do not match FEATURE_SCHEMA "
+            f"(missing: {missing}, undeclared: {extra})"
+        )
+
+    casts = {}
+    for col, dtype in schema.items():
+        if df[col].dtype == dtype:
+            continue
+        values = df[col].to_numpy()
+        target = np.dtype(dtype)
+
+        if target.kind in 'iu':
+            info = np.iinfo(target)
+            if values.dtype.kind == 'f':
+                if np.isnan(values).any():
+                    raise ValueError(f"Column '{col}' has missing values; cannot store as {dtype}")
+                if not np.array_equal(values, np.round(values)):
+                    raise ValueError(f"Column '{col}' has non-integer values; cannot store as {dtype}")
+            if len(values) and (values.min() < info.min or values.max() > info.max):
+                raise ValueError(
+                    f"Column '{col}' range [{values.min()}, {values.max()}] "
+                    f"does not fit {dtype}"
+                )
+        elif target.kind == 'f':
+            finite = values[np.isfinite(values)]
+            if len(finite) and np.abs(finite).max() > np.finfo(target).max:
+                raise ValueError(f"Column '{col}' overflows {dtype}")
+
+        casts[col] = dtype
+
+    return df.astype(casts) if casts else df
+
+
+def read_processed(path: str, schema: dict = FEATURE_SCHEMA):
+    """Read the processed CSV straight into the compact dtypes."""
+    import pandas as pd
+
+    return apply_schema(pd.read_csv(path, dtype=schema), schema)
+
+
+def check_model_equivalence(raw_path: str, n_estimators: int = 50) -> bool:
+    """
+    Train the same forest on default and compact dtypes and compare.
+
+    WHAT: Identical predict_proba on both frames == schema is safe
+    WHY: Downcasting must only save memory, never change predictions
+    The default-dtype frame is rebuilt from the raw CSV with preprocess's
+    own cleaning, before apply_schema: the processed CSV already holds
+    float32-rounded values, so reading it back would compare the compact
+    values with themselves.
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from categorical import fit_vocabulary
+    from preprocess import clean_data, fit_fill_values
+
+    raw = pd.read_csv(raw_path)
+    fill_values = fit_fill_values(raw.drop_duplicates(subset=['customer_id']))
+    wide = clean_data(raw, fit_vocabulary(raw), use_feature_cache=False,
+                      fill_values=fill_values)
+    compact = apply_schema(wide)
+
+    wide_mb    = wide.memory_usage(deep=True).sum() / 1024**2
+    compact_mb = compact.memory_usage(deep=True).sum() / 1024**2
+    print(f"   Default dtypes: {wide_mb:.2f} MB")
+    print(f"   Schema dtypes:  {compact_mb:.2f} MB ({wide_mb / compact_mb:.1f}x smaller)")
+
+    probas = []
+    for frame in (wide, compact):
+        X = frame.drop('churn', axis=1)
+        y = frame['churn']
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=42, n_jobs=-1)
+        model.fit(X, y)
+        probas.append(model.predict_proba(X)[:, 1])
+
+    identical = np.array_equal(probas[0], probas[1])
+    print(f"   Identical model output: {'✅' if identical else '❌'}")
+    return identical
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Feature schema tools")
+    parser.add_argument('--check', action='store_true',
+                        help='Verify compact dtypes give identical model output')
+    parser.add_argument('--raw', default='data/raw/customers.csv',
+                        help='Raw CSV the check re-cleans (processed data is already compact)')
+    args = parser.parse_args()
+
+    if args.check:
+        print("🔍 Checking FEATURE_SCHEMA against default dtypes")
+        if not check_model_equivalence(args.raw):
+            sys.exit(1)
+    else:
+        for col, dtype in FEATURE_SCHEMA.items():
+            print(f"  {col:<28} {dtype}")
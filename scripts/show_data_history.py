@@ -6,89 +6,115 @@ WHY: Track data evolution over time
 WHEN: Auditing data changes
 WHEN NOT: Single version only
 ALTERNATIVE: Manual git log inspection
+
+Built from one `git log --raw` and one `git cat-file --batch` call
+(git_objects.py), whatever the number of versions. Parsed .dvc files
+are cached by blob id in .cache/. Row counts and churn rates come from
+the version profiles in data/profiles/ (profile_data.py) when present —
+no data is read.
+
+Usage:
+    uv run python scripts/show_data_history.py
+    uv run python scripts/show_data_history.py --since 2024-01-01 --min-size 0.5
+    uv run python scripts/show_data_history.py --json
 """
 
-import subprocess
+import argparse
 import json
 
-def get_data_versions(dvc_file):
+from git_objects import dvc_entries, file_history
+from profile_data import load_profile
+
+DVC_FILE = 'data/raw/customers.csv.dvc'
+
+
+def get_data_versions(dvc_file, since=None, until=None, min_size_mb=None, max_size_mb=None):
     """
     Get all versions of a DVC-tracked file.
-    
+
     WHAT: Parse Git history for .dvc file changes
     WHY: See all data versions
     WHEN: Understanding data evolution
     WHEN NOT: N/A
     ALTERNATIVE: git log --follow
+    Returns versions oldest first; since/until are anything `git log` accepts.
     """
-    # Get git log for .dvc file
-    cmd = [
-        'git', 'log',
-        '--pretty=format:%H|%ai|%s',  # hash|date|message
-        '--follow',  # Follow file renames
-        dvc_file
-    ]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    
+    history = file_history(dvc_file, since=since, until=until)
+    entries = dvc_entries([h['blob'] for h in history])
+
     versions = []
-    for line in result.stdout.strip().split('\n'):
-        if not line:
+    for h in reversed(history):
+        entry = entries[h['blob']]
+        if entry is None or entry['size'] is None:
+            continue
+
+        size_mb = entry['size'] / (1024 * 1024)
+        if min_size_mb is not None and size_mb < min_size_mb:
             continue
-        
-        commit_hash, date, message = line.split('|', 2)
-        
-        # Get .dvc file content at this commit
-        dvc_content = subprocess.run(
-            ['git', 'show', f'{commit_hash}:{dvc_file}'],
-            capture_output=True, text=True, check=True
-        ).stdout
-        
-        # Parse MD5 and size from .dvc file
-        import yaml
-        dvc_data = yaml.safe_load(dvc_content)
-        md5 = dvc_data['outs'][0]['md5']
-        size = dvc_data['outs'][0]['size']
-        
+        if max_size_mb is not None and size_mb > max_size_mb:
+            continue
+
+        profile = load_profile(entry['md5'])
         versions.append({
-            'commit': commit_hash[:8],
-            'date': date.split()[0],  # Just date, not time
-            'message': message,
-            'md5': md5[:16] + '...',  # Truncate for display
-            'size_mb': size / (1024 * 1024)
+            'commit': h['commit'][:8],
+            'date': h['date'][:10],  # Just date, not time
+            'message': h['message'],
+            'md5': entry['md5'],
+            'size_mb': size_mb,
+            'rows': profile['rows'] if profile else None,
+            'churn_rate': profile['columns'].get('churn', {}).get('mean') if profile else None,
         })
-    
+
     return versions
 
-def print_version_history(versions):
+def print_version_history(versions, dvc_file=DVC_FILE):
     """
     Print version history table.
-    
+
     WHAT: Format and display versions
     WHY: Human-readable history
     WHEN: After getting versions
     WHEN NOT: N/A
-    ALTERNATIVE: JSON output
+    ALTERNATIVE: JSON output (--json)
     """
+    data_file = dvc_file[:-len('.dvc')]
     print("\n" + "="*80)
-    print("DATA VERSION HISTORY: data/raw/customers.csv")
+    print(f"DATA VERSION HISTORY: {data_file}")
     print("="*80)
-    
+
     # Header
-    print(f"\n{'Ver':<4} {'Commit':<10} {'Date':<12} {'Size (MB)':<12} {'MD5 (truncated)'}")
+    print(f"\n{'Ver':<4} {'Commit':<10} {'Date':<12} {'Size (MB)':<10} {'Rows':>10} {'Churn':>7}  {'MD5 (truncated)'}")
     print("-" * 80)
-    
-    # Versions (reverse order - newest first)
+
+    # Versions (reverse order - newest first); '-' = no profile for that version yet
     for idx, v in enumerate(reversed(versions), 1):
-        print(f"{idx:<4} {v['commit']:<10} {v['date']:<12} {v['size_mb']:<12.2f} {v['md5']}")
-    
+        rows = f"{v['rows']:,}" if v['rows'] is not None else '-'
+        churn = f"{v['churn_rate']:.1%}" if v['churn_rate'] is not None else '-'
+        print(f"{idx:<4} {v['commit']:<10} {v['date']:<12} {v['size_mb']:<10.2f} {rows:>10} {churn:>7}  {v['md5'][:16] + '...'}")
+
     print("\n" + "="*80)
     print(f"Total versions: {len(versions)}")
     print("\nTo checkout a specific version:")
-    print("  git checkout <commit> data/raw/customers.csv.dvc")
-    print("  uv run dvc checkout data/raw/customers.csv.dvc")
+    print(f"  git checkout <commit> {dvc_file}")
+    print(f"  uv run dvc checkout {dvc_file}")
     print("="*80 + "\n")
 
+def main():
+    parser = argparse.ArgumentParser(description="Show the version history of a DVC-tracked file")
+    parser.add_argument('--file', default=DVC_FILE, help='.dvc file to inspect')
+    parser.add_argument('--since', help='Only versions committed after this date (e.g. 2024-01-01)')
+    parser.add_argument('--until', help='Only versions committed before this date')
+    parser.add_argument('--min-size', type=float, help='Minimum data size in MB')
+    parser.add_argument('--max-size', type=float, help='Maximum data size in MB')
+    parser.add_argument('--json', action='store_true', help='Print versions as JSON')
+    args = parser.parse_args()
+
+    versions = get_data_versions(args.file, since=args.since, until=args.until,
+                                 min_size_mb=args.min_size, max_size_mb=args.max_size)
+    if args.json:
+        print(json.dumps(versions, indent=2))
+    else:
+        print_version_history(versions, args.file)
+
 if __name__ == "__main__":
-    versions = get_data_versions('data/raw/customers.csv.dvc')
-    print_version_history(versions)
\ No newline at end of file
+    main()
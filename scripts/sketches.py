@@ -0,0 +1,222 @@
+"""
+Mergeable streaming sketches for column profiles.
+
+WHAT: Fixed-size summaries of a column that are updated chunk by chunk
+      and can be merged, so a profile of any file size takes one pass
+      and bounded memory
+WHY: Row counts, ranges, quantiles and histograms of a data version are
+     needed by several tools; none of them should re-read the data
+WHEN: profile_data.py builds one profile per data version from these
+WHEN NOT: Exact quantiles on small data — numpy is simpler
+ALTERNATIVE: t-digest / KLL (not mergeable with fixed bucket edges)
+
+NumericSketch keeps count, nulls, min, max and sum, plus a DDSketch-style
+quantile sketch: value x > 0 goes to bucket ceil(log_gamma(x)) with
+gamma = (1 + alpha) / (1 - alpha), negatives to a mirrored store, zeros
+to their own counter. Any quantile is then within relative error alpha.
+The bucket edges depend only on alpha, never on the data, so the buckets
+double as a fixed-bin (log-spaced) histogram: sketches of two versions
+line up bin for bin, which is what the drift statistics compare.
+
+CategoricalSketch keeps exact value counts up to `max_values` distinct
+values; the rest are counted under OTHER.
+"""
+
+import math
+
+DEFAULT_ALPHA = 0.01
+OTHER = '__other__'
+
+
+class NumericSketch:
+    kind = 'numeric'
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.count = 0          # non-null values
+        self.nulls = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self.zeros = 0
+        self.positive = {}      # bucket index -> count
+        self.negative = {}
+
+    def update(self, values):
+        """Add an array / Series of values (NaN counts as null)."""
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        null_mask = np.isnan(values)
+        self.nulls += int(null_mask.sum())
+        values = values[~null_mask]
+        if not len(values):
+            return self
+
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sum += float(values.sum())
+        self.zeros += int((values == 0).sum())
+
+        for store, part in ((self.positive, values[values > 0]),
+                            (self.negative, -values[values < 0])):
+            if not len(part):
+                continue
+            keys, counts = np.unique(np.ceil(np.log(part) / self.log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                store[key] = store.get(key, 0) + n
+        return self
+
+    def merge(self, other: 'NumericSketch'):
+        if other.alpha != self.alpha:
+            raise ValueError(f"Cannot merge sketches with alpha {self.alpha} and {other.alpha}")
+        self.count += other.count
+        self.nulls += other.nulls
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.zeros += other.zeros
+        for store, other_store in ((self.positive, other.positive),
+                                   (self.negative, other.negative)):
+            for key, n in other_store.items():
+                store[key] = store.get(key, 0) + n
+        return self
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def _bucket_value(self, key: int) -> float:
+        """Representative value of a positive bucket (relative error <= alpha)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def bins(self) -> list:
+        """[(value, count)] for every non-empty bucket, ascending by value."""
+        bins = [(-self._bucket_value(k), self.negative[k]) for k in sorted(self.negative, reverse=True)]
+        if self.zeros:
+            bins.append((0.0, self.zeros))
+        bins += [(self._bucket_value(k), self.positive[k]) for k in sorted(self.positive)]
+        return bins
+
+    def bin_counts(self) -> dict:
+        """{bucket key: count} with keys comparable across sketches of the same alpha."""
+        counts = {f'-{k}': n for k, n in self.negative.items()}
+        if self.zeros:
+            counts['0'] = self.zeros
+        counts.update({f'+{k}': n for k, n in self.positive.items()})
+        return counts
+
+    def quantile(self, q: float):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for value, n in self.bins():
+            seen += n
+            if seen > rank:
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'count': self.count,
+            'nulls': self.nulls,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'mean': self.mean,
+            'quantiles': {f'p{int(q * 100):02d}': self.quantile(q)
+                          for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)},
+            'sketch': {
+                'alpha': self.alpha,
+                'sum': self.sum,
+                'zeros': self.zeros,
+                'positive': {str(k): n for k, n in sorted(self.positive.items())},
+                'negative': {str(k): n for k, n in sorted(self.negative.items())},
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NumericSketch':
+        sketch_data = data['sketch']
+        sketch = cls(sketch_data['alpha'])
+        sketch.count = data['count']
+        sketch.nulls = data['nulls']
+        sketch.min = data['min'] if data['min'] is not None else math.inf
+        sketch.max = data['max'] if data['max'] is not None else -math.inf
+        sketch.sum = sketch_data['sum']
+        sketch.zeros = sketch_data['zeros']
+        sketch.positive = {int(k): n for k, n in sketch_data['positive'].items()}
+        sketch.negative = {int(k): n for k, n in sketch_data['negative'].items()}
+        return sketch
+
+
+class CategoricalSketch:
+    kind = 'categorical'
+
+    def __init__(self, max_values: int = 1000):
+        self.max_values = max_values
+        self.count = 0
+        self.nulls = 0
+        self.values = {}        # value -> count, OTHER collects the overflow
+
+    def _add(self, value: str, n: int):
+        if value in self.values or len(self.values) < self.max_values:
+            self.values[value] = self.values.get(value, 0) + n
+        else:
+            self.values[OTHER] = self.values.get(OTHER, 0) + n
+
+    def update(self, values):
+        import pandas as pd
+
+        values = pd.Series(values)
+        self.nulls += int(values.isna().sum())
+        counts = values.dropna().astype(str).value_counts()
+        self.count += int(counts.sum())
+        for value, n in counts.items():
+            self._add(value, int(n))
+        return self
+
+    def merge(self, other: 'CategoricalSketch'):
+        self.count += other.count
+        self.nulls += other.nulls
+        for value, n in other.values.items():
+            self._add(value, n)
+        return self
+
+    def bin_counts(self) -> dict:
+        return dict(self.values)
+
+    def to_dict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'count': self.count,
+            'nulls': self.nulls,
+            'distinct': len(self.values),
+            'values': dict(sorted(self.values.items(), key=lambda kv: -kv[1])),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CategoricalSketch':
+        sketch = cls()
+        sketch.count = data['count']
+        sketch.nulls = data['nulls']
+        sketch.values = dict(data['values'])
+        return sketch
+
+
+def sketch_for(series, alpha: float = DEFAULT_ALPHA):
+    """The right empty sketch for a column's dtype."""
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return NumericSketch(alpha)
+    return CategoricalSketch()
+
+
+def sketch_from_dict(data: dict):
+    return {'numeric': NumericSketch, 'categorical': CategoricalSketch}[data['kind']].from_dict(data)
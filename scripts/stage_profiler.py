@@ -0,0 +1,138 @@
+"""
+Opt-in profiling hooks for pipeline stages.
+
+WHAT: `with profile_stage('train', params.get('profiling')):` runs the
+      block under a CPU profiler plus tracemalloc and writes a sorted
+      hot-function report and an allocation top-list
+WHY: When a stage gets slow the answer should be one switch away, not
+     ad hoc prints added to the stage and forgotten there
+WHEN: CHURN_PROFILE=1 (every stage) or CHURN_PROFILE=train,evaluate in
+      the environment, or profiling.enabled: true in params.yaml
+WHEN NOT: Timing comparisons — profilers slow the stage down; use
+          bench_pipeline.py for numbers
+ALTERNATIVE: python -m cProfile scripts/train.py (no allocations, no MLflow)
+
+Profiler: pyinstrument (sampling, low overhead) when it is installed and
+profiling.engine is 'auto' or 'pyinstrument', otherwise cProfile.
+
+Reports are written to .cache/profiling/<stage>-<timestamp>/ and logged
+under profiling/ on the MLflow run still active when the block exits.
+Without one they stay local: metrics/mlflow_run_id.txt is not a fallback,
+since a stage that raised before writing it would leave the previous
+run's id there and the reports would land on an unrelated run.
+
+When the switch is off profile_stage() returns contextlib.nullcontext(),
+so the wrapped stage runs exactly as before.
+"""
+
+import contextlib
+import os
+import time
+from pathlib import Path
+
+ENV_VAR     = 'CHURN_PROFILE'
+REPORT_DIR  = Path('.cache/profiling')
+
+
+def profiling_enabled(stage: str, profiling_params: dict = None) -> bool:
+    env = os.environ.get(ENV_VAR, '').strip().lower()
+    if env:
+        if env in ('0', 'false', 'no', 'off'):
+            return False
+        return env in ('1', 'true', 'yes', 'on', 'all') or stage in env.split(',')
+    return bool(profiling_params and profiling_params.get('enabled'))
+
+
+def profile_stage(stage: str, profiling_params: dict = None):
+    """Context manager profiling `stage` when switched on, else a no-op."""
+    if not profiling_enabled(stage, profiling_params):
+        return contextlib.nullcontext()
+    return StageProfiler(stage, profiling_params or {})
+
+
+class StageProfiler:
+    def __init__(self, stage: str, profiling_params: dict):
+        self.stage = stage
+        self.engine = profiling_params.get('engine', 'auto')
+        self.top_n = profiling_params.get('top_n', 40)
+        self.profiler = None
+
+    def _start_cpu_profiler(self):
+        if self.engine in ('auto', 'pyinstrument'):
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                if self.engine == 'pyinstrument':
+                    print("⚠️  pyinstrument is not installed, falling back to cProfile")
+            else:
+                self.engine = 'pyinstrument'
+                self.profiler = Profiler()
+                self.profiler.start()
+                return
+
+        import cProfile
+
+        self.engine = 'cprofile'
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def __enter__(self):
+        import tracemalloc
+
+        tracemalloc.start()
+        self._start_cpu_profiler()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import tracemalloc
+
+        seconds = time.perf_counter() - self.start
+        if self.engine == 'pyinstrument':
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        out_dir = REPORT_DIR / f"{self.stage}-{time.strftime('%Y%m%d-%H%M%S')}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        hot_path = out_dir / f'{self.stage}_hot_functions.txt'
+        alloc_path = out_dir / f'{self.stage}_allocations.txt'
+
+        with open(hot_path, 'w') as f:
+            f.write(f"{self.stage}: {seconds:.2f}s ({self.engine})\n\n")
+            f.write(self._hot_report())
+        with open(alloc_path, 'w') as f:
+            f.write(f"{self.stage}: traced peak {peak / 1024**2:.1f} MB\n\n")
+            for i, stat in enumerate(snapshot.statistics('lineno')[:self.top_n], 1):
+                f.write(f"{i:>3}. {stat}\n")
+
+        logged_to = self._log_artifacts(out_dir)
+        print(f"\n🔬 Profiled {self.stage} ({self.engine}, {seconds:.1f}s) → {out_dir}"
+              + (f" (logged to run {logged_to})" if logged_to else ""))
+        return False
+
+    def _hot_report(self) -> str:
+        if self.engine == 'pyinstrument':
+            return self.profiler.output_text(unicode=True, color=False)
+
+        import io
+        import pstats
+
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats('cumulative').print_stats(self.top_n)
+        return stream.getvalue()
+
+    def _log_artifacts(self, out_dir: Path) -> str:
+        """Log the reports to the active run; returns its id, or None (reports stay local)."""
+        import mlflow
+        from mlflow import MlflowClient
+
+        run = mlflow.active_run()
+        if run is None:
+            return None
+
+        MlflowClient().log_artifacts(run.info.run_id, str(out_dir), artifact_path='profiling')
+        return run.info.run_id
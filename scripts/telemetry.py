@@ -0,0 +1,88 @@
+"""
+Lightweight stage telemetry: named timing spans.
+
+WHAT: `with tel.span('fit'):` records how long each step of a stage
+      took; the spans plus peak RSS are logged as MLflow metrics and
+      written as a JSON trace
+WHY: Every run should show where its time went (and the leaderboard can
+     rank configs by cost as well as AUC) without turning on a profiler
+WHEN: Always on — a span is two perf_counter() calls
+WHEN NOT: Function-level detail (use stage_profiler.py)
+ALTERNATIVE: OpenTelemetry (a collector to run for a handful of numbers)
+
+Metric names: span_<stage>_<span>_s (spans of the same name add up),
+span_<stage>_total_s and <stage>_peak_rss_mb. The trace keeps every span
+in order with its offset from the start of the stage.
+"""
+
+import contextlib
+import json
+import time
+from pathlib import Path
+
+
+class Telemetry:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append({
+                'name': name,
+                'offset_s': round(start - self._t0, 4),
+                'seconds': round(time.perf_counter() - start, 4),
+            })
+
+    def totals(self) -> dict:
+        """{span name: total seconds}, in first-seen order."""
+        totals = {}
+        for s in self.spans:
+            totals[s['name']] = totals.get(s['name'], 0.0) + s['seconds']
+        return totals
+
+    def metrics(self) -> dict:
+        from memory import peak_rss_mb
+
+        metrics = {f"span_{self.stage}_{name}_s": round(seconds, 4)
+                   for name, seconds in self.totals().items()}
+        metrics[f"span_{self.stage}_total_s"] = round(time.perf_counter() - self._t0, 4)
+        metrics[f"{self.stage}_peak_rss_mb"] = round(peak_rss_mb(), 1)
+        return metrics
+
+    def trace(self) -> dict:
+        return {
+            'stage': self.stage,
+            'started_at': self.started_at,
+            'spans': self.spans,
+            'metrics': self.metrics(),
+        }
+
+    def write_trace(self, path: str) -> dict:
+        trace = self.trace()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(trace, f, indent=2)
+        return trace
+
+    def log(self, trace_path: str):
+        """Write the trace and log it plus the span metrics to the active MLflow run."""
+        import mlflow
+
+        trace = self.write_trace(trace_path)
+        mlflow.log_metrics(trace['metrics'])
+        mlflow.log_artifact(trace_path, artifact_path='telemetry')
+        return trace
+
+    def print_summary(self):
+        totals = self.totals()
+        overall = sum(totals.values()) or 1.0
+        print(f"\n⏱️  {self.stage} spans:")
+        for name, seconds in totals.items():
+            print(f"   {name:<14} {seconds:>8.2f}s  {seconds / overall:>6.1%}")
@@ -1,156 +1,376 @@
-import mlflow
-import mlflow.sklearn
-import pandas as pd
-import numpy as np
+import argparse
 import pickle
-import yaml
 import json
-import os
+import time
 from pathlib import Path
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import (
-    accuracy_score, recall_score, precision_score,
-    roc_auc_score, f1_score
-)
-
-# load parameters from params.yaml
-# read hyperparameters from shared file
-#
-# DVC watches this file for changes then re-runs this stage if any changes happen
-with open('params.yaml') as f:
-    params = yaml.safe_load(f)
-    
-model_params  = params['model']
-data_params   = params['data']
-mlflow_params = params['mlflow']
-
-data = pd.read_csv("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv")
-target = data_params["target_column"]
-X = data.drop(target, axis=1)
-y = data[target]
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y,
-    test_size=data_params["test_size"],
-    random_state=data_params["random_state"],
-    stratify=y
-)
-print("I work here")
-
-
-# Set up mlflow experiment
-
-mlflow.set_experiment(mlflow_params['experiment_name'])
-
-# Get DVC data version info to attach to the mlflow run
-dvc_data_hash = "unknown"
-
-try:
-    with open('dvc.lock') as f:
-        dvc_lock = yaml.safe_load(f)
+
+from common import (SPLIT_METHOD, compute_metrics, load_params, load_processed_data,
+                    registry_disabled, split_data)
+from dev_profile import dev_enabled, dev_model_params, subsample
+from engines import get_engine
+from fingerprint import fingerprint
+from memory import peak_rss_mb, plan_training
+from stage_profiler import profile_stage
+from telemetry import Telemetry
+
+# mlflow, sklearn and pandas are imported inside the functions below.
+# WHY: importing this module (e.g. from main.py or a test harness) should
+#      not pay for the full MLflow client before any work starts.
+
+MODEL_PATH         = 'models/random_forest.pkl'
+RUN_ID_PATH        = 'metrics/mlflow_run_id.txt'
+TRAIN_METRICS_PATH = 'metrics/train_metrics.json'
+TRAIN_TRACE_PATH   = 'metrics/train_trace.json'
+
+
+def get_dvc_data_hash(lock_path: str = 'dvc.lock') -> str:
+    """Get DVC data version info to attach to the mlflow run."""
+    import yaml
+
+    try:
+        with open(lock_path) as f:
+            dvc_lock = yaml.safe_load(f)
+    except FileNotFoundError:
+        return "unknown"
+
     # Navigate to the preprocessor stage output hash
     preprocess_outs = dvc_lock.get("stages", {}).get('preprocess', {}).get('outs', [])
     if preprocess_outs:
-        dvc_data_hash = preprocess_outs[0].get('md5')
-
-except FileNotFoundError:
-    pass
-
-# NOw Train inside the MLFLOW run
-with mlflow.start_run(run_name=f"dvc-pipeline-rf") as run:
-    # Log everything that identifies this run. Data, Code, environment
-    # to reproduce this exact workflow
-    mlflow.set_tags({
-        "model_type": "random_forest",
-        "pipeline":"dvc",
-        "data_hash": dvc_data_hash,
-        "data_version": "v1",
-        "engineer": "Dawood",
-        "framework": 'sklearn'
-    })
-
-    # Log all hyper parameters from params.yaml
-    mlflow.log_params({
-        **model_params,
-        "test_size": data_params['test_size'],
-        "n_train_samples": len(X_train),
-        "n_test_samples": len(X_test),
-        "n_features": X_train.shape[1],
-        "class_ratio": float(y_train.mean()) # Fraction of positive classes
-    })
-    # Train
-    model = RandomForestClassifier(
-        n_estimators= model_params['n_estimators'],
-        max_depth= model_params['max_depth'],
-        min_samples_split=model_params['min_sample_split'],
-        min_samples_leaf=model_params['min_sample_leaf'],
-        class_weight=model_params['class_weight'],
-        random_state=model_params['random_state'],
-        n_jobs=-1
-    )
-    model.fit(X_train,y_train)
-
-    y_pred = model.predict(X_test)
-    y_prob = model.predict_proba(X_test)[:, 1]
-
-    metrics = {
-        "accuracy":  round(accuracy_score(y_test, y_pred), 4),
-        "precision": round(precision_score(y_test, y_pred), 4),
-        "recall":    round(recall_score(y_test, y_pred), 4),
-        "f1":        round(f1_score(y_test, y_pred), 4),
-        "roc_auc":   round(roc_auc_score(y_test, y_prob), 4),
+        return preprocess_outs[0].get('md5')
+    return "unknown"
+
+
+def load_champion(mlflow_params: dict) -> dict:
+    """
+    Load the current @champion model and the facts recorded on its run.
+
+    Returns {'model', 'version', 'run_id', 'split', 'max_customer_id',
+    'full_refit_seconds'}; the last three are None if the champion's run
+    predates them. full_refit_seconds is the champion's fit time when it
+    was a full fit, else the full-refit time its incremental run logged.
+    """
+    import mlflow.sklearn
+    from mlflow import MlflowClient
+
+    client = MlflowClient()
+    name = mlflow_params['model_registry_name']
+    version = client.get_model_version_by_alias(name, alias='champion')
+    run = client.get_run(version.run_id)
+
+    max_id = run.data.tags.get('max_customer_id')
+    # An incremental champion's fit_seconds is the time to grow it, not a refit
+    if run.data.tags.get('training_mode', 'full') == 'full':
+        full_refit_seconds = run.data.metrics.get('fit_seconds')
+    else:
+        full_refit_seconds = run.data.metrics.get('full_refit_seconds')
+    return {
+        'model': mlflow.sklearn.load_model(f"models:/{name}@champion"),
+        'version': version.version,
+        'run_id': version.run_id,
+        'split': run.data.tags.get('split'),
+        'max_customer_id': int(max_id) if max_id is not None else None,
+        'full_refit_seconds': full_refit_seconds,
     }
 
-    mlflow.log_metrics(metrics=metrics)
-
-    # Log feature importances as a custom metric series
-    feature_importances = dict(zip(X_train.columns,
-                                   model.feature_importances_))
-    top_features  = sorted(feature_importances.items(), key=lambda x: x[1], reverse=True)[:10]
-    for feat_name, importance in top_features:
-        mlflow.log_metric(f"Importances_{feat_name}", round(float(importance), 4))
-
-    # Log model to mlflow
-    # to define model signature, Input schema + output schema
-    # MLFLOW will use this to validate inputs at serving time,
-    #       catches schema mismatch before they cause failures in production
-    from mlflow.models.signature import infer_signature
-    signature = infer_signature(model_input=X_train,
-                                model_output=model.predict(X_train))
-    mlflow.sklearn.log_model(
-        sk_model=model,
-        name="model",
-        signature=signature,
-        input_example=X_train.head(3),
-        registered_model_name=mlflow_params['model_registry_name']
-    )
-
-    # Save run id for evaluation
-    Path('metrics').mkdir(exist_ok=True)
-    with open("metrics/mlflow_run_id.txt", "w") as f:
-        f.write(run.info.run_id)
-    
-    # Save metrics for DVC (DVC reads JSON not MLFLOW)
-    #  MLflow metrics are for the UI. DVC metrics are for CLI comparison.
-    #  Both systems get fed the same numbers.
-
-    with open('metrics/train_metrics.json', 'w') as f:
-        json.dump(metrics, f, indent=2)
-
-    # SAve model as pickle for DVC pipeline
-    # Save model on disk so evaluation file can load it
-    Path('models').mkdir(exist_ok=True)
-    with open('models/random_forest.pkl', 'wb') as f:
-        pickle.dump(model, f)
+
+def select_incremental_rows(X_train, y_train, max_seen_id, inc_params: dict):
+    """
+    Pick the rows the new trees are fitted on.
+
+    WHAT: source 'new'       -> only customers the champion never saw
+          source 'reservoir' -> those plus a uniform sample of old rows,
+                                up to reservoir_size rows in total
+    WHY: Trees fitted only on a small batch over-react to it; mixing in old
+         rows keeps the new trees representative of the whole population
+    Returns (X_fit, y_fit, n_new_rows).
+    """
+    if max_seen_id is None:
+        print("⚠️  Champion run has no max_customer_id tag — treating all rows as old")
+        is_new = X_train['customer_id'] < X_train['customer_id'].min()
+    else:
+        is_new = X_train['customer_id'] > max_seen_id
+    n_new = int(is_new.sum())
+
+    if inc_params['source'] == 'new':
+        if n_new == 0:
+            raise RuntimeError("No new customers since the champion was trained")
+        return X_train[is_new], y_train[is_new], n_new
+
+    n_old = max(0, inc_params['reservoir_size'] - n_new)
+    old_idx = X_train.index[~is_new]
+    old_sample = X_train.loc[old_idx].sample(
+        n=min(n_old, len(old_idx)), random_state=inc_params.get('random_state', 42)
+    ).index
+    keep = X_train.index[is_new].append(old_sample)
+    return X_train.loc[keep], y_train.loc[keep], n_new
+
+
+def train(params: dict, data=None) -> dict:
+    """
+    Train the model, log it to MLflow and write the DVC outputs.
+
+    WHAT: split -> fit -> log -> save pickle + metrics
+    WHY: Callable so the pipeline can run in one process
+    WHEN: `data` is the processed DataFrame; read from disk if omitted
+    Returns a dict with the fitted model/engine, run id, metrics and the split.
+    """
+    import mlflow
+    import mlflow.sklearn
+
+    tel = Telemetry('train')
+
+    model_params  = params['model']
+    data_params   = params['data']
+    mlflow_params = params['mlflow']
+
+    if data is None:
+        with tel.span('load'):
+            data = load_processed_data(data_params)
+
+    data_fingerprint = fingerprint(data_params['data_path'])
+
+    # dev profile: stratified subsample and a capped model (dev_profile.py)
+    dev = dev_enabled(params)
+    if dev:
+        with tel.span('subsample'):
+            data = subsample(data, data_params['target_column'], params['dev'], data_fingerprint)
+        model_params = dev_model_params(model_params, params['dev'])
+        print(f"🧪 dev profile: {len(data):,} rows, {model_params['n_estimators']} trees, "
+              f"max_depth {model_params['max_depth']}")
+
+    with tel.span('split'):
+        X_train, X_test, y_train, y_test = split_data(data, data_params)
+
+    # Fit workers and bootstrap size into model.memory_budget (dtypes stay as the schema declares)
+    memory_plan = None
+    if model_params.get('memory_budget'):
+        memory_plan = plan_training(
+            model_params['memory_budget'], len(X_train), X_train.shape[1], model_params
+        )
+        model_params = {
+            **model_params,
+            'n_jobs': memory_plan['n_jobs'],
+            'max_samples': memory_plan['max_samples'],
+        }
+        print(f"🧮 Memory plan: n_jobs={memory_plan['n_jobs']}, "
+              f"max_samples={memory_plan['max_samples']}, "
+              f"estimated peak {memory_plan['estimated_peak_mb']:.0f} MB "
+              f"of {memory_plan['budget_mb']:.0f} MB")
+
+    # Set up mlflow experiment
+    mlflow.set_experiment(mlflow_params['experiment_name'])
+
+    dvc_data_hash = get_dvc_data_hash()
+
+    # model.engine in params.yaml picks the model family (engines.py)
+    engine = get_engine(model_params)
+
+    # Incremental mode grows the current champion instead of refitting
+    inc_params  = params.get('incremental', {})
+    incremental = inc_params.get('enabled', False)
+    champion = load_champion(mlflow_params) if incremental else None
+    if incremental and champion['split'] != SPLIT_METHOD:
+        # Its training rows are scattered over today's test split: scores would leak
+        raise RuntimeError(
+            f"Champion v{champion['version']} was not trained on the '{SPLIT_METHOD}' split; "
+            f"train a full model once before running incrementally"
+        )
+
+    # NOw Train inside the MLFLOW run
+    run_name = f"{'dev' if dev else 'dvc-pipeline'}-{engine.name}"
+    with mlflow.start_run(run_name=run_name) as run:
+        # Log everything that identifies this run. Data, Code, environment
+        # to reproduce this exact workflow
+        mlflow.set_tags({
+            "model_type": engine.model_type,
+            "pipeline":"dvc",
+            "data_hash": dvc_data_hash,
+            "data_fingerprint": data_fingerprint,
+            "data_version": "v1",
+            "engineer": "Dawood",
+            "framework": 'sklearn',
+            "training_mode": "incremental" if incremental else "full",
+            "split": SPLIT_METHOD,
+            # dev runs never get registered or promoted
+            "profile": "dev" if dev else "full",
+            # Lets a later incremental run tell new customers from seen ones
+            "max_customer_id": str(int(X_train['customer_id'].max())),
+        })
+        if incremental:
+            mlflow.set_tags({
+                "base_model_version": champion['version'],
+                "base_run_id": champion['run_id'],
+            })
+
+        # Log all hyper parameters from params.yaml
+        mlflow.log_params({
+            **engine.log_params(),
+            "test_size": data_params['test_size'],
+            "n_train_samples": len(X_train),
+            "n_test_samples": len(X_test),
+            "n_features": X_train.shape[1],
+            "class_ratio": float(y_train.mean()) # Fraction of positive classes
+        })
+        if dev:
+            mlflow.log_params({f"dev_{k}": v for k, v in params['dev'].items() if k != 'enabled'})
+        # Train
+        start = time.perf_counter()
+        with tel.span('fit'):
+            if incremental:
+                X_fit, y_fit, n_new_rows = select_incremental_rows(
+                    X_train, y_train, champion['max_customer_id'], inc_params
+                )
+                print(f"🌱 Incremental: {inc_params['n_new_trees']} new trees on "
+                      f"{len(X_fit):,} rows ({n_new_rows:,} new customers)")
+                engine.extend(
+                    champion['model'], X_fit, y_fit,
+                    n_new_trees=inc_params['n_new_trees'],
+                    retire_oldest=inc_params.get('retire_oldest', 0),
+                )
+                mlflow.log_params({
+                    **{f"incremental_{k}": v for k, v in inc_params.items()},
+                    "n_incremental_rows": len(X_fit),
+                    "n_new_customers": n_new_rows,
+                })
+            else:
+                engine.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        model = engine.model
+        mlflow.log_metric("fit_seconds", round(fit_seconds, 3))
+
+        if incremental:
+            # Compare against the cost of refitting everything from scratch
+            full_refit_seconds = champion['full_refit_seconds']
+            if inc_params.get('compare_full_refit'):
+                start = time.perf_counter()
+                get_engine(model_params).fit(X_train, y_train)
+                full_refit_seconds = time.perf_counter() - start
+            if full_refit_seconds:
+                mlflow.log_metrics({
+                    "full_refit_seconds": round(full_refit_seconds, 3),
+                    "incremental_speedup": round(full_refit_seconds / fit_seconds, 2),
+                })
+                print(f"   Fit: {fit_seconds:.1f}s vs full refit {full_refit_seconds:.1f}s "
+                      f"({full_refit_seconds / fit_seconds:.1f}x faster)")
+
+        with tel.span('predict'):
+            y_pred = engine.predict(X_test)
+            y_prob = engine.predict_proba(X_test)
+
+        metrics = compute_metrics(y_test, y_pred, y_prob)
+
+        mlflow.log_metrics(metrics=metrics)
+
+        # Optional k-fold CV on the full processed data (cross_validate.py)
+        cv_params = params.get('cv', {})
+        if cv_params.get('folds', 0) > 1:
+            from cross_validate import cross_validate, log_cv_results, print_cv_results
+
+            target = data_params['target_column']
+            with tel.span('cross_validate'):
+                cv_results = cross_validate(
+                    data.drop(target, axis=1), data[target], model_params,
+                    n_folds=cv_params['folds'],
+                    n_workers=cv_params.get('n_workers'),
+                    random_state=cv_params.get('random_state', 42),
+                )
+            log_cv_results(cv_results, run.info.run_id)
+            print_cv_results(cv_results)
+
+        # Peak resident memory of the whole run so far (load + split + fit)
+        peak_mb = peak_rss_mb()
+        mlflow.log_metric("peak_rss_mb", round(peak_mb, 1))
+        if memory_plan:
+            mlflow.log_metric("estimated_peak_mb", memory_plan['estimated_peak_mb'])
+            if peak_mb > memory_plan['budget_mb']:
+                print(f"⚠️  Peak RSS {peak_mb:.0f} MB exceeded memory_budget "
+                      f"{memory_plan['budget_mb']:.0f} MB")
+
+        # Log feature importances as a custom metric series
+        # (empty for engines without native importances)
+        feature_importances = engine.feature_importances(X_train.columns)
+        top_features  = sorted(feature_importances.items(), key=lambda x: x[1], reverse=True)[:10]
+        for feat_name, importance in top_features:
+            mlflow.log_metric(f"Importances_{feat_name}", round(float(importance), 4))
+
+        # Log model to mlflow
+        # to define model signature, Input schema + output schema
+        # MLFLOW will use this to validate inputs at serving time,
+        #       catches schema mismatch before they cause failures in production
+        with tel.span('signature'):
+            signature = engine.signature(X_train)
+        with tel.span('log_model'):
+            engine.log_model(
+                X_train,
+                registered_model_name=(None if dev or registry_disabled()
+                                       else mlflow_params['model_registry_name']),
+                signature=signature,
+            )
+
+        # Save run id for evaluation
+        Path('metrics').mkdir(exist_ok=True)
+        with open(RUN_ID_PATH, "w") as f:
+            f.write(run.info.run_id)
+
+        # Save metrics for DVC (DVC reads JSON not MLFLOW)
+        #  MLflow metrics are for the UI. DVC metrics are for CLI comparison.
+        #  Both systems get fed the same numbers.
+
+        with open(TRAIN_METRICS_PATH, 'w') as f:
+            json.dump(metrics, f, indent=2)
+
+        # SAve model as pickle for DVC pipeline
+        # Save model on disk so evaluation file can load it
+        Path('models').mkdir(exist_ok=True)
+        with tel.span('pickle_dump'), open(MODEL_PATH, 'wb') as f:
+            pickle.dump(model, f)
+
+        # Where this run's time went: span metrics + metrics/train_trace.json
+        tel.log(TRAIN_TRACE_PATH)
+        tel.print_summary()
 
         print(f"\n{'='*55}")
-    print(f"TRAINING COMPLETE")
-    print(f"{'='*55}")
-    print(f"  Run ID:    {run.info.run_id}")
-    print(f"  Data hash: {dvc_data_hash}")
-    print(f"  ROC AUC:   {metrics['roc_auc']:.4f}")
-    print(f"  Recall:    {metrics['recall']:.4f}")
-    print(f"  F1:        {metrics['f1']:.4f}")
-    print(f"{'='*55}")
+        print(f"TRAINING COMPLETE")
+        print(f"{'='*55}")
+        print(f"  Run ID:    {run.info.run_id}")
+        print(f"  Data hash: {dvc_data_hash}")
+        print(f"  Data fingerprint: {data_fingerprint}")
+        print(f"  ROC AUC:   {metrics['roc_auc']:.4f}")
+        print(f"  Recall:    {metrics['recall']:.4f}")
+        print(f"  F1:        {metrics['f1']:.4f}")
+        print(f"  Peak RSS:  {peak_mb:.0f} MB")
+        print(f"{'='*55}")
+
+    return {
+        "model": model,
+        "engine": engine,
+        "run_id": run.info.run_id,
+        "metrics": metrics,
+        "X_test": X_test,
+        "y_test": y_test,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the churn model")
+    parser.add_argument('--incremental', action='store_true',
+                        help='Grow the @champion with new trees instead of a full refit')
+    parser.add_argument('--compare-full-refit', action='store_true',
+                        help='In incremental mode, also time a full refit for comparison')
+    args = parser.parse_args()
+
+    # load parameters from params.yaml
+    # read hyperparameters from shared file
+    #
+    # DVC watches this file for changes then re-runs this stage if any changes happen
+    params = load_params()
+    if args.incremental:
+        params.setdefault('incremental', {})['enabled'] = True
+    if args.compare_full_refit:
+        params.setdefault('incremental', {})['compare_full_refit'] = True
+    with profile_stage('train', params.get('profiling')):
+        train(params)
+
 
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,13 @@ import mlflow.sklearn
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
+from fingerprint import fingerprint
+from schema import read_processed
 
 
-data = pd.read_csv("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv")
+DATA_PATH = "/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv"
+data = read_processed(DATA_PATH)
+data_fingerprint = fingerprint(DATA_PATH)
 X = data.drop("churn", axis=1)
 y = data["churn"]
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
@@ -14,6 +18,7 @@ mlflow.set_experiment("churn-model-experiment-latest_autolooging")
 mlflow.sklearn.autolog()
 
 with mlflow.start_run(run_name='rf_auto_log'):
+    mlflow.set_tag("data_fingerprint", data_fingerprint)
     model = RandomForestClassifier(
         n_estimators=100,
         max_depth=10,
@@ -4,14 +4,20 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import roc_auc_score
+from artifact_store import ArtifactStore
+from fingerprint import fingerprint
+from schema import read_processed
 
-data = pd.read_csv("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv")
+DATA_PATH = "/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv"
+data = read_processed(DATA_PATH)
+data_fingerprint = fingerprint(DATA_PATH)
 X = data.drop("churn", axis=1)
 y = data["churn"]
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
 
 mlflow.set_experiment("customer_churn_prediction")
+store = ArtifactStore()
 
 
 # Run 1 : Random Forest
@@ -20,7 +26,8 @@ with mlflow.start_run(run_name="rf-prediction-candidate"):
         "model_type":"random forest",
         "data_version": "v1",
         "purpose":"production_candidate",
-        "engineer": "dawood"
+        "engineer": "dawood",
+        "data_fingerprint": data_fingerprint,
     })
 
     params = {
@@ -37,7 +44,7 @@ with mlflow.start_run(run_name="rf-prediction-candidate"):
     roc = roc_auc_score(y_test, y_prob)
 
     mlflow.log_metric('roc_auc', roc)
-    mlflow.sklearn.log_model(model, "model")
+    store.log_model(model)
     print(f"RF ROC AUC: {roc:.3f}")
 
 # --- Run 2: Gradient Boosting (challenger) ---
@@ -47,7 +54,8 @@ with mlflow.start_run(run_name="gb-challenger"):
             "model_type":'gradient_boosting',
             "data_version":"V1",
             "purpose": "challenger",
-            "engineer":"dawood"
+            "engineer":"dawood",
+            "data_fingerprint": data_fingerprint,
         }
     )
 
@@ -65,7 +73,7 @@ with mlflow.start_run(run_name="gb-challenger"):
     roc = roc_auc_score(y_test, y_prob)
 
     mlflow.log_metric('roc_auc', roc)
-    mlflow.sklearn.log_model(model, "model")
+    store.log_model(model)
     print(f"GB ROC AUC: {roc:.3f}")
 
-
+store.print_summary()
@@ -9,19 +9,26 @@ from sklearn.metrics import (
     RocCurveDisplay, classification_report
 )
 import os
+from artifact_store import ArtifactStore
+from fingerprint import fingerprint
+from schema import read_processed
 
 
 
-data = pd.read_csv("/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv")
+DATA_PATH = "/home/dawood-ml/DataVersionControl/data/processed/customers_cleaned.csv"
+data = read_processed(DATA_PATH)
+data_fingerprint = fingerprint(DATA_PATH)
 X = data.drop("churn", axis=1)
 y = data["churn"]
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
 
 mlflow.set_experiment("customer_churn_prediction")
+store = ArtifactStore()
 
 
 with mlflow.start_run(run_name="rf_with_artifacts"):
+    mlflow.set_tag("data_fingerprint", data_fingerprint)
     params = {"n_estimators": 100, "max_depth": 10, "class_weight": "balanced", "random_state": 42}
     mlflow.log_params(params)
     model = RandomForestClassifier(**params)
@@ -71,5 +78,7 @@ with mlflow.start_run(run_name="rf_with_artifacts"):
     # Cleaner way to log text directly (no temp file):
     mlflow.log_text(report, "classification_report_v2.txt")
 
-    mlflow.sklearn.log_model(model, "model")
+    store.log_model(model)
     print(f"ROC AUC: {roc:.3f} — artifacts logged")
+
+store.print_summary()
@@ -1,15 +1,29 @@
 import pandas as pd
 import numpy as np
+import hashlib
+from profile_data import data_md5, load_profile, remember_md5, profile_frame, save_profile, summarize
 
-df = pd.read_csv('data/raw/customers.csv')
+DATA_PATH = 'data/raw/customers.csv'
+
+df = pd.read_csv(DATA_PATH)
+
+# WHAT: Stats from the version profile (data/profiles/<md5>.json)
+# WHY: Each data version is profiled once; profile it now if it never was.
+#      The md5 is cached by file stat — no second pass over an unchanged file
+v1_md5 = data_md5(DATA_PATH)
+v1_profile = load_profile(v1_md5)
+if v1_profile is None:
+    v1_profile = profile_frame(df)
+    save_profile(v1_profile, v1_md5)
+v1 = summarize(v1_profile)
 
 print("="*60)
 print("DATASET UPDATE: V1 → V2")
 print("="*60)
 print(f"\n📊 V1 Stats:")
-print(f"   Records: {len(df)}")
-print(f"   Churn rate: {df['churn'].mean():.1%}")
-print(f"   Age range: {df['age'].min()}-{df['age'].max()}")
+print(f"   Records: {v1['records']}")
+print(f"   Churn rate: {v1['churn_rate']:.1%}")
+print(f"   Age range: {v1['age_min']:.0f}-{v1['age_max']:.0f}")
 
 # WHAT: Remove outliers (extreme ages)
 # WHY: Clean data for better model performance
@@ -45,12 +59,23 @@ df = pd.concat([df, df_new], ignore_index=True)
 # WHEN: Dataset update complete
 # WHEN NOT: If want to keep both versions separately
 # ALTERNATIVE: Save as customers_v2.csv (bad practice)
-df.to_csv('data/raw/customers.csv', index=False)
+# Hash the bytes on the way out: the md5 `dvc add` will record, without re-reading
+payload = df.to_csv(index=False).encode()
+with open(DATA_PATH, 'wb') as f:
+    f.write(payload)
+
+# Profile V2 while it is in memory; the profile stage reuses the cached md5
+v2_md5 = hashlib.md5(payload).hexdigest()
+remember_md5(DATA_PATH, v2_md5)
+save_profile(profile_frame(df), v2_md5)
+v2 = summarize(load_profile(v2_md5))
 
 print(f"\n📊 V2 Stats:")
-print(f"   Records: {len(df)}")
-print(f"   Churn rate: {df['churn'].mean():.1%}")
-print(f"   Age range: {df['age'].min()}-{df['age'].max()}")
+print(f"   Records: {v2['records']}")
+print(f"   Churn rate: {v2['churn_rate']:.1%}")
+print(f"   Age range: {v2['age_min']:.0f}-{v2['age_max']:.0f}")
 
 print(f"\n✅ Dataset updated and saved to: data/raw/customers.csv")
+print(f"\nTo grow the current champion instead of refitting it:")
+print(f"   uv run dvc repro preprocess && uv run scripts/train.py --incremental")
 print("="*60)
\ No newline at end of file
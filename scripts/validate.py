@@ -0,0 +1,210 @@
+"""
+Fail-fast validation of the processed data before training.
+
+WHAT: Checks the processed CSV against FEATURE_SCHEMA plus the rules in
+      params.yaml (validation:) — value ranges, null ratios, customer_id
+      uniqueness, the target's values and rate — and writes a JSON report
+WHY: Bad data (negative tenure, impossible ages, a collapsed churn rate,
+     a renamed column) otherwise only shows up after minutes of training,
+     as a crash or a quietly worse model
+WHEN: The `validate` DVC stage between preprocess and train; train depends
+      on its report, so a failure (exit 1) stops `dvc repro` right here
+WHEN NOT: Raw data — it still has strings and NaN; preprocess.py handles those
+ALTERNATIVE: great_expectations / pandera (a dependency and a config
+             format for a dozen checks)
+
+The file is read in chunks of validation.chunk_size rows. Each chunk is
+turned into one float64 matrix and every per-column statistic (nulls,
+infinities, min, max, non-integers, target values) is a single numpy
+reduction over it, so the cost is one streaming pass. Only customer_id
+is kept across chunks, for the uniqueness check.
+
+A header that does not match the schema fails at once, without reading
+any rows.
+
+Usage:
+    uv run python scripts/validate.py
+    uv run python scripts/validate.py --data some/other.csv
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from common import load_params
+
+DATA_PATH   = 'data/processed/customers_cleaned.csv'
+REPORT_PATH = 'metrics/validation.json'
+
+
+def _check(results: list, name: str, column, passed: bool, detail: str = ''):
+    results.append({'check': name, 'column': column, 'passed': bool(passed), 'detail': detail})
+
+
+def scan(path: str, columns: list, target: str, chunk_size: int) -> dict:
+    """One chunked pass: per-column statistics plus every customer_id."""
+    import numpy as np
+    import pandas as pd
+
+    n_cols = len(columns)
+    stats = {
+        'rows': 0,
+        'nulls': np.zeros(n_cols, dtype=np.int64),
+        'infinite': np.zeros(n_cols, dtype=np.int64),
+        'non_integer': np.zeros(n_cols, dtype=np.int64),
+        'min': np.full(n_cols, np.inf),
+        'max': np.full(n_cols, -np.inf),
+        'target_invalid': 0,
+        'target_positive': 0,
+        'non_numeric': [],
+    }
+    ids = []
+    target_idx = columns.index(target)
+
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        non_numeric = [c for c in columns if chunk[c].dtype.kind not in 'biuf']
+        if non_numeric:
+            stats['non_numeric'] = non_numeric
+            break
+
+        values = chunk[columns].to_numpy(dtype=np.float64)
+        nan = np.isnan(values)
+        finite = np.isfinite(values)
+
+        stats['rows'] += len(values)
+        stats['nulls'] += nan.sum(axis=0)
+        stats['infinite'] += (~nan & ~finite).sum(axis=0)
+        stats['non_integer'] += (finite & (values != np.round(values))).sum(axis=0)
+        stats['min'] = np.minimum(stats['min'], np.where(finite, values, np.inf).min(axis=0))
+        stats['max'] = np.maximum(stats['max'], np.where(finite, values, -np.inf).max(axis=0))
+
+        y = values[:, target_idx]
+        stats['target_invalid'] += int(((y != 0) & (y != 1)).sum())
+        stats['target_positive'] += int((y == 1).sum())
+
+        if 'customer_id' in columns:
+            ids.append(chunk['customer_id'].to_numpy())
+
+    stats['ids'] = np.concatenate(ids) if ids else np.empty(0)
+    return stats
+
+
+def validate(path: str, rules: dict, target: str, schema: dict = None) -> dict:
+    """Run every check on `path`; returns the report (report['passed'] is the verdict)."""
+    import numpy as np
+    import pandas as pd
+    from schema import FEATURE_SCHEMA
+
+    schema = schema or FEATURE_SCHEMA
+    results = []
+    rows = 0
+
+    header = list(pd.read_csv(path, nrows=0).columns)
+    missing = [c for c in schema if c not in header]
+    extra = [c for c in header if c not in schema]
+    _check(results, 'schema_columns', None, not missing and not extra,
+           f"missing: {missing}, undeclared: {extra}" if missing or extra else '')
+
+    if not missing and not extra:
+        columns = list(schema)
+        stats = scan(path, columns, target, rules.get('chunk_size') or 200_000)
+        rows = stats['rows']
+
+        _check(results, 'schema_numeric', None, not stats['non_numeric'],
+               f"non-numeric: {stats['non_numeric']}" if stats['non_numeric'] else '')
+        _check(results, 'min_rows', None, rows >= rules.get('min_rows', 1),
+               f"{rows:,} rows (minimum {rules.get('min_rows', 1):,})")
+
+        if not stats['non_numeric']:
+            max_null_ratio = rules.get('max_null_ratio', 0.0)
+            for i, col in enumerate(columns):
+                null_ratio = stats['nulls'][i] / rows if rows else 0.0
+                if null_ratio > max_null_ratio:
+                    _check(results, 'null_ratio', col, False,
+                           f"{null_ratio:.2%} null (maximum {max_null_ratio:.2%})")
+                if stats['infinite'][i]:
+                    _check(results, 'finite', col, False, f"{stats['infinite'][i]:,} infinite values")
+
+                dtype = np.dtype(schema[col])
+                if dtype.kind in 'iu' and rows:
+                    info = np.iinfo(dtype)
+                    fits = (stats['non_integer'][i] == 0
+                            and stats['min'][i] >= info.min and stats['max'][i] <= info.max)
+                    if not fits:
+                        _check(results, 'schema_dtype', col, False,
+                               f"{stats['non_integer'][i]:,} non-integers, range "
+                               f"[{stats['min'][i]:g}, {stats['max'][i]:g}] vs {dtype}")
+
+            for col, (low, high) in (rules.get('ranges') or {}).items():
+                if col not in columns:
+                    continue
+                i = columns.index(col)
+                _check(results, 'range', col,
+                       rows and low <= stats['min'][i] and stats['max'][i] <= high,
+                       f"[{stats['min'][i]:g}, {stats['max'][i]:g}] (allowed [{low}, {high}])")
+
+            ids = stats['ids']
+            duplicates = int(ids.size - np.unique(ids).size)
+            _check(results, 'unique', 'customer_id', duplicates == 0, f"{duplicates:,} duplicate ids")
+
+            low, high = rules.get('target_rate', [0.0, 1.0])
+            rate = stats['target_positive'] / rows if rows else 0.0
+            _check(results, 'target_values', target, stats['target_invalid'] == 0,
+                   f"{stats['target_invalid']:,} values other than 0/1")
+            _check(results, 'target_rate', target, low <= rate <= high,
+                   f"{rate:.2%} positive (allowed {low:.0%}-{high:.0%})")
+
+    failed = [r for r in results if not r['passed']]
+    return {
+        'passed': not failed,
+        'path': path,
+        'rows': rows,
+        'n_checks': len(results),
+        'n_failed': len(failed),
+        'checks': results,
+    }
+
+
+def print_report(report: dict, seconds: float):
+    print(f"\n{'='*60}")
+    print(f"DATA VALIDATION: {report['path']}")
+    print(f"{'='*60}")
+    for r in report['checks']:
+        column = f" [{r['column']}]" if r['column'] else ''
+        print(f"  {'✅' if r['passed'] else '❌'} {r['check']}{column} {r['detail']}")
+    print(f"{'='*60}")
+    verdict = "✅ Passed" if report['passed'] else f"❌ {report['n_failed']} check(s) failed"
+    print(f"{verdict}: {report['rows']:,} rows in {seconds:.2f}s")
+
+
+def run_validation(params: dict, data_path: str = DATA_PATH,
+                   report_path: str = REPORT_PATH) -> dict:
+    """Validate, print and save the report (the stage body, shared with main.py)."""
+    # The timing is printed, not saved: the report is train's dependency and
+    # must only change when the data or the rules do
+    start = time.perf_counter()
+    report = validate(data_path, params['validation'], params['data']['target_column'])
+    print_report(report, time.perf_counter() - start)
+
+    Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Saved report to: {report_path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the processed data before training")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--report', default=REPORT_PATH)
+    args = parser.parse_args()
+
+    report = run_validation(load_params(), args.data, args.report)
+    if not report['passed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()